@@ -0,0 +1,169 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the Clock class.
+
+A Clock is a bool signal that is toggled by the simulation kernel itself,
+without a generator, a delay object or a waiter per half period.
+
+"""
+from __future__ import absolute_import
+
+from myhdl._compat import integer_types
+from myhdl._Signal import _Signal
+from myhdl._Waiter import _Waiter
+from myhdl._simulator import _local
+
+class _error:
+    pass
+_error.Period = "Clock period should be an integer larger than 1"
+_error.Duty = "Clock duty cycle should result in non-zero high and low times"
+_error.Phase = "Clock phase should be a natural integer"
+
+
+class Clock(_Signal):
+
+    """ Clock signal driven by the simulation kernel.
+
+    The clock is low until time 'phase'. From then on, it is high for
+    'period * duty' time units and low for the rest of each period.
+    A clock is driven by the Simulation of a design that uses it, from the
+    first time step in which a process waits on it.
+
+    """
+
+    __slots__ = ('_period', '_high', '_low', '_phase')
+
+    def __init__(self, period, duty=0.5, phase=0):
+        """ Construct a clock.
+
+        period -- clock period, an integer larger than 1
+        duty -- fraction of the period during which the clock is high
+        phase -- time of the first rising edge
+
+        """
+        if not isinstance(period, integer_types) or period < 2:
+            raise ValueError(_error.Period)
+        # round half up, as round() differs between Python 2 and 3
+        high = int(period * duty + 0.5)
+        if not 0 < high < period:
+            raise ValueError(_error.Duty)
+        if not isinstance(phase, integer_types) or phase < 0:
+            raise ValueError(_error.Phase)
+        _Signal.__init__(self, bool(0))
+        self._period = period
+        self._high = high
+        self._low = period - high
+        self._phase = phase
+
+    # the kernel is the only driver
+    next = property(_Signal._get_next, None, None, "'next' access methods")
+
+    # read-only attributes
+    def _get_period(self):
+        return self._period
+    period = property(_get_period, None)
+    def _get_phase(self):
+        return self._phase
+    phase = property(_get_phase, None)
+
+    def toVerilog(self):
+        lines = ["initial begin: %s_CLOCKGEN" % self._name.upper(),
+                 "    %s <= 1'b0;" % self._name]
+        if self._phase:
+            lines.append("    # %s;" % self._phase)
+        lines += ["    forever begin",
+                  "        %s <= 1'b1;" % self._name,
+                  "        # %s;" % self._high,
+                  "        %s <= 1'b0;" % self._name,
+                  "        # %s;" % self._low,
+                  "    end",
+                  "end",
+                  ""]
+        return "\n".join(lines)
+
+    def toVHDL(self):
+        label = "%s_CLOCKGEN" % self._name.upper()
+        lines = ["%s: process is" % label,
+                 "begin",
+                 "    %s <= '0';" % self._name]
+        if self._phase:
+            lines.append("    wait for %s ns;" % self._phase)
+        lines += ["    loop",
+                  "        %s <= '1';" % self._name,
+                  "        wait for %s ns;" % self._high,
+                  "        %s <= '0';" % self._name,
+                  "        wait for %s ns;" % self._low,
+                  "    end loop;",
+                  "end process %s;" % label,
+                  ""]
+        return "\n".join(lines)
+
+
+class _ClockDriver(_Waiter):
+
+    """ Waiter that toggles a clock and reschedules itself.
+
+    It runs in the same delta cycle as a generator waking up from a delay,
+    so clock edges are seen exactly as those of a hand-written clock
+    generator.
+
+    """
+
+    __slots__ = ('clock',)
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def start(self, t):
+        """ Start the clock at time t, in phase with a clock that has run
+        from time 0. An edge at time t itself is still to come.
+
+        """
+        clock = self.clock
+        phase, high = clock._phase, clock._high
+        if t <= phase:
+            level, t = False, phase
+        else:
+            k = (t - phase) % clock._period
+            if k == 0:
+                level = False
+            elif k <= high:
+                level, t = True, t + high - k
+            else:
+                level, t = False, t + clock._period - k
+        if clock._val != level and clock._tracing == 1:
+            # written with its final value at the end of the timestep
+            clock._tracing = 2
+            clock._context.tf.changed.append(clock)
+        clock._val = clock._next = level
+        _local.context.schedule(t, self)
+
+    def next(self, waiters, actives, exc):
+        clock = self.clock
+        context = _local.context
+        if clock._val:
+            clock._next = False
+            context.schedule(context.time + clock._low, self)
+        else:
+            clock._next = True
+            context.schedule(context.time + clock._high, self)
+        if not clock._pending:
+            clock._pending = True
+            context.siglist.append(clock)
@@ -47,9 +47,10 @@ class Cosimulation(object):
         
         """ Construct a cosimulation object. """
         
-        if _simulator._cosim:
+        self._context = _simulator._pending()
+        if self._context.cosim:
             raise CosimulationError(_error.MultipleCosim)
-        _simulator._cosim = 1
+        self._context.cosim = 1
         
         self._rt, self._wt = rt, wt = os.pipe()
         self._rf, self._wf = rf, wf = os.pipe()
@@ -176,4 +177,4 @@ class Cosimulation(object):
             
     def __del__(self):
         """ Clear flag when this object destroyed - to suite unittest. """
-        _simulator._cosim = 0
+        self._context.cosim = 0
@@ -0,0 +1,225 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the Memory class.
+
+A Memory models a list of intbv signals, such as a RAM, without a signal
+object per element. The element values are stored in a flat array, and
+a single event fires when any of them changes.
+
+"""
+from __future__ import absolute_import
+
+import operator
+from array import array
+from copy import copy
+
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._Signal import _Signal, _WaiterList
+from myhdl._simulator import _local, _pending
+
+class _error:
+    pass
+_error.ElementType = "Memory element should be an intbv with a bit width"
+_error.Depth = "Memory depth should be a positive integer"
+
+
+def _typecode(min, max):
+    """ Return the code of the smallest array type for a range, or None """
+    for code in ('B', 'b', 'H', 'h', 'I', 'i', 'L', 'l', 'Q', 'q'):
+        try:
+            bits = 8 * array(code).itemsize
+        except ValueError: # no 'q' and 'Q' in Python 2
+            continue
+        if code.isupper():
+            lo, hi = 0, 2**bits
+        else:
+            lo, hi = -2**(bits-1), 2**(bits-1)
+        if lo <= min and max <= hi:
+            return code
+    return None
+
+
+def _makeVals(init, depth):
+    """ Return a flat array of depth values, all equal to init """
+    code = _typecode(init._min, init._max)
+    if code is None:
+        return [init._val] * depth
+    return array(code, [init._val]) * depth
+
+
+class _MemoryWord(intbv):
+
+    """ Value of a Memory element, that is written through 'next' """
+
+    __slots__ = ('_mem', '_index')
+
+    def __copy__(self):
+        return intbv(self)
+
+    def __deepcopy__(self, visit):
+        return intbv(self)
+
+    # support for the 'val' attribute, as on a signal
+    def _get_val(self):
+        return self
+    val = property(_get_val, None, None, "'val' access methods")
+
+    # support for the 'next' attribute
+    def _get_next(self):
+        return self._mem._getNext(self._index)
+    def _set_next(self, val):
+        self._mem._setNext(self._index, val)
+    next = property(_get_next, _set_next, None, "'next' access methods")
+
+
+class Memory(object):
+
+    """ Memory with the element values in a flat array.
+
+    A Memory can be used instead of a list of signals, such as
+    [Signal(intbv(0)[8:]) for i in range(depth)], in always_comb and
+    always_seq blocks. Indexing returns the value of an element, and
+    an element is written through its 'next' attribute, as in
+    mem[addr].next = data. All writes are applied when signals are
+    updated. A change of any element fires a single event, and the
+    'dirty' attribute holds the indices of the changed elements.
+
+    """
+
+    __slots__ = ('_init', '_vals', '_writes', '_dirty', '_eventWaiters',
+                 '_pending', '_context', '_driven', '_read', '__weakref__')
+
+    def __init__(self, val, depth):
+        """ Construct a Memory.
+
+        val -- initial value of the elements, an intbv with a bit width
+        depth -- number of elements
+
+        """
+        if not isinstance(val, intbv) or val._min is None or \
+           val._max is None:
+            raise TypeError(_error.ElementType)
+        if not isinstance(depth, integer_types) or depth < 1:
+            raise ValueError(_error.Depth)
+        self._init = copy(val)
+        self._vals = _makeVals(val, depth)
+        self._writes = {}
+        self._dirty = ()
+        self._eventWaiters = _WaiterList()
+        self._pending = False
+        self._driven = self._read = None
+        # register with the simulation being elaborated
+        _pending().register(self)
+
+    def _clear(self):
+        del self._eventWaiters[:]
+        self._eventWaiters.unsubscribe()
+        self._vals = _makeVals(self._init, len(self._vals))
+        self._writes = {}
+        self._dirty = ()
+        self._driven = self._read = None
+        self._pending = False
+
+    def __len__(self):
+        return len(self._vals)
+
+    def __getitem__(self, index):
+        index = operator.index(index)
+        val = self._vals[index]
+        if index < 0:
+            index += len(self._vals)
+        init = self._init
+        word = _MemoryWord.__new__(_MemoryWord)
+        word._val = val
+        word._min = init._min
+        word._max = init._max
+        word._nrbits = init._nrbits
+        word._mem = self
+        word._index = index
+        return word
+
+    def __iter__(self):
+        for i in range(len(self._vals)):
+            yield self[i]
+
+    def __repr__(self):
+        return "Memory(%r, %s)" % (intbv(self._init), len(self._vals))
+
+    # support for the 'dirty' attribute
+    def _get_dirty(self):
+        return self._dirty
+    dirty = property(_get_dirty, None, None, "'dirty' access methods")
+
+    def _item(self, val):
+        """ Return an object of the element type with value val """
+        item = copy(self._init)
+        item._val = val
+        item._handleBounds()
+        return item
+
+    def _schedule(self, index, item):
+        self._writes[index] = item
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
+
+    def _getNext(self, index):
+        item = self._writes.get(index)
+        if item is None:
+            item = self._item(self._vals[index])
+            self._schedule(index, item)
+        return item
+
+    def _setNext(self, index, val):
+        if isinstance(val, _Signal):
+            val = val._val
+        if isinstance(val, intbv):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        self._schedule(index, self._item(val))
+
+    def _reset(self):
+        """ Write the initial value to all elements """
+        init = self._init._val
+        writes = self._writes
+        for i, val in enumerate(self._vals):
+            if val != init or i in writes:
+                self._schedule(i, self._item(init))
+
+    def _update(self):
+        vals = self._vals
+        dirty = []
+        for index, item in self._writes.items():
+            val = item._val
+            if vals[index] != val:
+                vals[index] = val
+                dirty.append(index)
+        self._writes = {}
+        if dirty:
+            dirty.sort()
+            self._dirty = tuple(dirty)
+            return self._eventWaiters.fire()
+        return []
+
+    def _signals(self):
+        """ Return a list of signals with the element values """
+        return [_Signal(self._item(val)) for val in self._vals]
@@ -29,7 +29,7 @@ from copy import deepcopy
 from myhdl._Signal import _Signal
 from myhdl._Waiter import _SignalWaiter, _SignalTupleWaiter
 from myhdl._intbv import intbv
-from myhdl._simulator import _siglist
+from myhdl._simulator import _local
 
 # shadow signals
         
@@ -49,36 +49,26 @@ class _ShadowSignal(_Signal):
         
 class _SliceSignal(_ShadowSignal):
 
-    __slots__ = ('_sig', '_left', '_right')
+    __slots__ = ('_sig', '_left', '_right', '_shift', '_mask')
 
     def __init__(self, sig, left, right=None):
         ### XXX error checks
         if right is None:
             _ShadowSignal.__init__(self, sig[left])
+            self._shift, self._mask = left, 1
         else:
             _ShadowSignal.__init__(self, sig[left:right])
+            self._shift = right
+            if left is None:
+                self._mask = -1
+            else:
+                self._mask = (1 << (left - right)) - 1
         self._sig = sig
         self._left = left
         self._right = right
-        if right is None:
-            gen = self._genfuncIndex()
-        else:
-            gen = self._genfuncSlice()
-        self._waiter = _SignalWaiter(gen)
-
-    def _genfuncIndex(self):
-        sig, index = self._sig, self._left
-        set_next = _ShadowSignal._set_next
-        while 1:
-            set_next(self, sig[index])
-            yield sig
-
-    def _genfuncSlice(self):
-        sig, left, right = self._sig, self._left, self._right
-        set_next = _Signal._set_next
-        while 1:
-            set_next(self, sig[left:right])
-            yield sig
+        # the first slice shadow of a signal updates all of them
+        if not sig._slicesigs:
+            self._waiter = _SignalWaiter(_sliceFanout(sig))
 
     def _setName(self, hdl):
         if self._right is None:       
@@ -115,6 +105,34 @@ class _SliceSignal(_ShadowSignal):
 
 
 
+def _sliceFanout(sig):
+    """ Update the slice shadows of a signal, when it changes.
+
+    The shadows are updated in one pass, and only those with a new
+    value are scheduled for an update.
+
+    """
+    shadows = sig._slicesigs
+    while 1:
+        val = sig._val._val
+        siglist = _local.context.siglist
+        for s in shadows:
+            new = (val >> s._shift) & s._mask
+            if s._right is None:
+                new = bool(new)
+                if new == s._next:
+                    continue
+                s._next = new
+            else:
+                if new == s._next._val:
+                    continue
+                s._next._val = new
+            if not s._pending:
+                s._pending = True
+                siglist.append(s)
+        yield sig
+
+
 class ConcatSignal(_ShadowSignal):
 
     __slots__ = ('_args',)
@@ -137,17 +155,31 @@ class ConcatSignal(_ShadowSignal):
         self._waiter = _SignalTupleWaiter(gen)
 
     def genfunc(self):
-        set_next = _ShadowSignal._set_next
+        fields = []
+        hi = self._nrbits
+        for a in self._args:
+            lo = hi - len(a)
+            mask = (1 << (hi - lo)) - 1
+            fields.append((a, lo, mask, ~(mask << lo)))
+            hi = lo
+        vals = [None] * len(fields)
+        newval = 0
         args = self._args
-        nrbits = self._nrbits
-        newval = intbv(0)[nrbits:]
         while 1:
-            hi = nrbits
-            for a in args:
-                lo = hi - len(a)
-                newval[hi:lo] = a
-                hi = lo
-            set_next(self, newval)
+            # patch the fields that changed
+            for i, (a, lo, mask, clear) in enumerate(fields):
+                val = a._val
+                if isinstance(val, intbv):
+                    val = val._val
+                val &= mask
+                if val != vals[i]:
+                    vals[i] = val
+                    newval = (newval & clear) | (val << lo)
+            if newval != self._next._val:
+                self._next._val = newval
+                if not self._pending:
+                    self._pending = True
+                    _local.context.siglist.append(self)
             yield args
 
     def _markRead(self):
@@ -239,7 +271,9 @@ class _TristateSignal(_ShadowSignal):
                     res = None
                     break
             self._next = res
-            _siglist.append(self)
+            if not self._pending:
+                self._pending = True
+                _local.context.siglist.append(self)
 
 
     def toVerilog(self):
@@ -277,7 +311,9 @@ class _TristateDriver(_Signal):
             # restore original value to cater for intbv handler
             self._next = self._sig._orival
             self._setNextVal(val)
-        _siglist.append(self)   
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
          
     # redefine property because standard inheritance doesn't work for setter/getter functions
     next = property(_Signal._get_next, _set_next, None, "'next' access methods")
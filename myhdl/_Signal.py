@@ -33,16 +33,12 @@ from inspect import currentframe, getouterframes
 from copy import copy, deepcopy
 import operator
 
-from myhdl._compat import integer_types, long
-from myhdl import _simulator as sim
-from myhdl._simulator import _signals, _siglist, _futureEvents, now
+from myhdl._compat import integer_types, string_types, long
+from myhdl._simulator import _local, _pending, _schedule, now
 from myhdl._intbv import intbv
-from myhdl._bin import bin
 
 # from myhdl._enum import EnumItemType
 
-_schedule = _futureEvents.append
-
    
 def _isListOfSigs(obj):
     """ Check if obj is a non-empty list of signals. """
@@ -57,10 +53,32 @@ def _isListOfSigs(obj):
        
 class _WaiterList(list):
 
+    subscribers = ()
+
     def purge(self):
         if self:
             self[:] = [w for w in self if not w.hasRun]
 
+    def subscribe(self, waiter):
+        if not self.subscribers:
+            self.subscribers = []
+        self.subscribers.append(waiter)
+
+    def unsubscribe(self):
+        for w in self.subscribers:
+            w.subscribed = w.triggered = False
+        self.subscribers = ()
+
+    def fire(self):
+        """ Return the waiters to run on an event, and clear the list. """
+        waiters = self[:]
+        del self[:]
+        for w in self.subscribers:
+            if not w.triggered:
+                w.triggered = True
+                waiters.append(w)
+        return waiters
+
 
 class _PosedgeWaiterList(_WaiterList):
     def __init__(self, sig):
@@ -97,6 +115,15 @@ def Signal(val=None, delay=None):
     else:
         return _Signal(val)
     
+_waiterLists = frozenset(['_eventWaiters', '_posedgeWaiters',
+                          '_negedgeWaiters'])
+
+def _isImmutable(val):
+    """ Check if a signal value is never modified in place. """
+    return val is None or \
+           isinstance(val, (bool, EnumItemType) + integer_types + string_types)
+
+
 class _Signal(object):
 
     """ _Signal class.
@@ -110,10 +137,10 @@ class _Signal(object):
     __slots__ = ('_next', '_val', '_min', '_max', '_type', '_init',
                  '_eventWaiters', '_posedgeWaiters', '_negedgeWaiters',
                  '_code', '_tracing', '_nrbits', '_checkVal', 
-                 '_setNextVal', '_copyVal2Next', '_printVcd', 
+                 '_setNextVal', '_copyVal2Next', '_formatVcd', 
                  '_driven' ,'_read', '_name', '_used', '_inList',
-                 '_waiter', 'toVHDL', 'toVerilog', '_slicesigs',
-                 '_numeric'
+                 '_waiter', 'toVHDL', 'toVerilog', '_slicesigs', '_context',
+                 '_numeric', '_pending', '_watched', '__weakref__'
                 )
 
 
@@ -123,20 +150,23 @@ class _Signal(object):
         val -- initial value
         
         """
-        self._init = deepcopy(val)
-        self._val = deepcopy(val)
-        self._next = deepcopy(val)
+        if _isImmutable(val):
+            self._init = self._val = self._next = val
+        else:
+            self._init = deepcopy(val)
+            self._val = deepcopy(val)
+            self._next = deepcopy(val)
         self._min = self._max = None
         self._name = self._read = self._driven = None
         self._used = False
         self._inList = False
         self._nrbits = 0
         self._numeric = True
-        self._printVcd = self._printVcdStr
+        self._formatVcd = self._formatVcdStr
         if isinstance(val, bool):
             self._type = bool
             self._setNextVal = self._setNextBool
-            self._printVcd = self._printVcdBit
+            self._formatVcd = self._formatVcdBit
             self._nrbits = 1
         elif isinstance(val, integer_types):
             self._type = integer_types
@@ -148,9 +178,9 @@ class _Signal(object):
             self._nrbits = val._nrbits
             self._setNextVal = self._setNextIntbv
             if self._nrbits:
-                self._printVcd = self._printVcdVec
+                self._formatVcd = self._formatVcdVec
             else:
-                self._printVcd = self._printVcdHex
+                self._formatVcd = self._formatVcdHex
         else:
             self._type = type(val)
             if isinstance(val, EnumItemType):
@@ -159,36 +189,51 @@ class _Signal(object):
                 self._setNextVal = self._setNextMutable
             if hasattr(val, '_nrbits'):
                 self._nrbits = val._nrbits
+        # the waiter lists are allocated on first use, by __getattr__
+        self._watched = False
+        self._code = ""
+        self._slicesigs = ()
+        self._tracing = 0
+        self._pending = False
+        # register with the simulation being elaborated
+        _pending().register(self)
+
+    def _watch(self):
+        """ Allocate the waiter lists """
         self._eventWaiters = _WaiterList()
         self._posedgeWaiters = _PosedgeWaiterList(self)
         self._negedgeWaiters = _NegedgeWaiterList(self)
-        self._code = ""
-        self._slicesigs = []
-        self._tracing = 0
-        _signals.append(self)
+        self._watched = True
 
     def _clear(self):
-        del self._eventWaiters[:]
-        del self._posedgeWaiters[:]
-        del self._negedgeWaiters[:]
-        self._val = deepcopy(self._init)
-        self._next = deepcopy(self._init)
+        if self._watched:
+            for wl in (self._eventWaiters, self._posedgeWaiters,
+                       self._negedgeWaiters):
+                del wl[:]
+                wl.unsubscribe()
+        init = self._init
+        if _isImmutable(init):
+            self._val = self._next = init
+        else:
+            self._val = deepcopy(init)
+            self._next = deepcopy(init)
         self._name = self._read = self._driven = None
         self._numeric = True
+        self._pending = False
         for s in self._slicesigs:
             s._clear()
         
     def _update(self):
         val, next = self._val, self._next
         if val != next:
-            waiters = self._eventWaiters[:]
-            del self._eventWaiters[:]
-            if not val and next:
-                waiters.extend(self._posedgeWaiters[:])
-                del self._posedgeWaiters[:]
-            elif not next and val:
-                waiters.extend(self._negedgeWaiters[:])
-                del self._negedgeWaiters[:]
+            if self._watched:
+                waiters = self._eventWaiters.fire()
+                if not val and next:
+                    waiters.extend(self._posedgeWaiters.fire())
+                elif not next and val:
+                    waiters.extend(self._negedgeWaiters.fire())
+            else:
+                waiters = []
             if next is None:
                 self._val = None
             elif isinstance(val, intbv):
@@ -197,8 +242,10 @@ class _Signal(object):
                 self._val = next
             else:
                 self._val = deepcopy(next)
-            if self._tracing:
-                self._printVcd()
+            if self._tracing == 1:
+                # written with its final value at the end of the timestep
+                self._tracing = 2
+                self._context.tf.changed.append(self)
             return waiters
         else:
             return []
@@ -212,13 +259,21 @@ class _Signal(object):
     def _get_next(self):
 #        if self._next is self._val:
 #            self._next = deepcopy(self._val)
-        _siglist.append(self)
+        if self._pending:
+            _local.context.nrDuplicates += 1
+        else:
+            self._pending = True
+            _local.context.siglist.append(self)
         return self._next
     def _set_next(self, val):
         if isinstance(val, _Signal):
             val = val._val
         self._setNextVal(val)
-        _siglist.append(self)
+        if self._pending:
+            _local.context.nrDuplicates += 1
+        else:
+            self._pending = True
+            _local.context.siglist.append(self)
     next = property(_get_next, _set_next, None, "'next' access methods")
 
     # support for the 'posedge' attribute
@@ -297,22 +352,26 @@ class _Signal(object):
             raise TypeError("Expected %s, got %s" % (self._type, type(val)))
         self._next = deepcopy(val)         
 
-    # vcd print methods
-    def _printVcdStr(self):
-        print("s%s %s" % (str(self._val), self._code), file=sim._tf)
-        
-    def _printVcdHex(self):
-        print("s%s %s" % (hex(self._val), self._code), file=sim._tf)
+    # vcd format methods
+    def _formatVcdStr(self):
+        return "s%s %s\n" % (str(self._val), self._code)
 
-    def _printVcdBit(self):
-        print("%d%s" % (self._val, self._code), file=sim._tf)
+    def _formatVcdHex(self):
+        return "s%s %s\n" % (hex(self._val), self._code)
 
-    def _printVcdVec(self):
-        print("b%s %s" % (bin(self._val, self._nrbits), self._code), file=sim._tf)
+    def _formatVcdBit(self):
+        return "%d%s\n" % (self._val, self._code)
+
+    def _formatVcdVec(self):
+        w = self._nrbits
+        v = format(self._val._val & ((long(1) << w) - 1), 'b')
+        return "b%s %s\n" % (v.zfill(w), self._code)
 
     ### use call interface for shadow signals ###
     def __call__(self, left, right=None):
         s = _SliceSignal(self, left, right)
+        if not self._slicesigs:
+            self._slicesigs = []
         self._slicesigs.append(s)
         return s
 
@@ -488,6 +547,11 @@ class _Signal(object):
 
     # method lookup delegation
     def __getattr__(self, attr):
+        # only called when the attribute is not set, so that the waiter
+        # lists are a plain slot access once they are allocated
+        if attr in _waiterLists:
+            self._watch()
+            return getattr(self, attr)
         return getattr(self._val, attr)
 
     # representation 
@@ -557,27 +621,30 @@ class _DelayedSignal(_Signal):
         self._timeStamp = 0
 
     def _update(self):
+        time = _local.context.time
         if self._next != self._nextZ:
-            self._timeStamp = sim._time
+            self._timeStamp = time
         self._nextZ = self._next
-        t = sim._time + self._delay
-        _schedule((t, _SignalWrap(self, self._next, self._timeStamp)))
+        t = time + self._delay
+        _schedule(t, _SignalWrap(self, self._next, self._timeStamp))
         return []
 
     def _apply(self, next, timeStamp):
         val = self._val
         if timeStamp == self._timeStamp and val != next:
-            waiters = self._eventWaiters[:]
-            del self._eventWaiters[:]
-            if not val and next:
-                waiters.extend(self._posedgeWaiters[:])
-                del self._posedgeWaiters[:]
-            elif not next and val:
-                waiters.extend(self._negedgeWaiters[:])
-                del self._negedgeWaiters[:]
+            if self._watched:
+                waiters = self._eventWaiters.fire()
+                if not val and next:
+                    waiters.extend(self._posedgeWaiters.fire())
+                elif not next and val:
+                    waiters.extend(self._negedgeWaiters.fire())
+            else:
+                waiters = []
             self._val = copy(next)
-            if self._tracing:
-                self._printVcd()
+            if self._tracing == 1:
+                # written with its final value at the end of the timestep
+                self._tracing = 2
+                self._context.tf.changed.append(self)
             return waiters            
         else:
             return []
@@ -24,27 +24,33 @@ from __future__ import print_function
 
 import sys
 import os
-from operator import itemgetter
+from heapq import heappop
 from warnings import warn
 from types import GeneratorType
 
 from myhdl import Cosimulation, StopSimulation, _SuspendSimulation
-from myhdl import _simulator, SimulationError
-from myhdl._simulator import _signals, _siglist, _futureEvents
+from myhdl import SimulationError
+from myhdl._simulator import _claim, _activate, _pending
 from myhdl._Waiter import _Waiter, _inferWaiter, _SignalWaiter,_SignalTupleWaiter
 from myhdl._util import _flatten, _printExcInfo
 from myhdl._instance import _Instantiator
-from myhdl._ShadowSignal import _ShadowSignal
+from myhdl._Clock import Clock, _ClockDriver
+from myhdl._levelize import _levelize, _evaluate
+from myhdl._cycle import _CycleEngine
+from myhdl._compiled import _compileBlocks
+from myhdl._profile import _Profile
 
 
 
-schedule = _futureEvents.append
-
 class _error:
     pass
 _error.ArgType = "Inappriopriate argument type"
 _error.MultipleCosim = "Only a single cosimulator argument allowed"
 _error.DuplicatedArg = "Duplicated argument"
+_error.Mode = "Simulation mode should be 'event' or 'cycle'"
+_error.KwArg = "Unexpected keyword argument"
+_error.Backend = "Simulation backend should be 'python', 'compiled' or 'check'"
+_error.Profile = "Profiling is only supported in event mode"
             
 class Simulation(object):
 
@@ -53,41 +59,111 @@ class Simulation(object):
     Methods:
     run -- run a simulation for some duration
 
+    Attributes:
+    profile -- the profile of the simulation, or None if it is not profiled
+
     """
 
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         """ Construct a simulation object.
 
         *args -- list of arguments. Each argument is a generator or
                  a nested sequence of generators.
+        mode -- 'event' (default) for event-driven simulation, or 'cycle'
+                for cycle-based simulation of a single-clock design
+        backend -- 'python' (default) to run the functions of always_comb
+                   and always_seq blocks as written, 'compiled' to run
+                   generated fast-path functions instead, or 'check' to
+                   run both and compare their results
+        profile -- if True, count the activations and the run time of the
+                   processes and the updates of the signals
 
         """
-        _simulator._time = 0
+        mode = kwargs.pop('mode', 'event')
+        backend = kwargs.pop('backend', 'python')
+        profile = kwargs.pop('profile', False)
+        if kwargs:
+            raise SimulationError(_error.KwArg, ", ".join(kwargs))
+        if mode not in ('event', 'cycle'):
+            raise SimulationError(_error.Mode, repr(mode))
+        if backend not in ('python', 'compiled', 'check'):
+            raise SimulationError(_error.Backend, repr(backend))
+        if profile and mode != 'event':
+            raise SimulationError(_error.Profile)
+        self._finished = False
         arglist = _flatten(*args)
-        self._waiters, self._cosim = _makeWaiters(arglist)
-        if not self._cosim and _simulator._cosim:
+        scopes = _scopes(arglist)
+        # the clocks elaborated with the design, as opposed to those that
+        # are left from earlier designs
+        clocks = [s for c in scopes for s in c.owned()
+                  if isinstance(s, Clock)]
+        # claim the signals of the design, and its clocks and traces
+        context = self._context = _claim(self, scopes)
+        signals = context.owned()
+        # drop the updates requested before this simulation, but leave
+        # those of other simulations alone
+        for s in context.siglist:
+            s._pending = False
+        del context.siglist[:]
+        self._compiled = []
+        if backend != 'python':
+            self._compiled = _compileBlocks(arglist, backend == 'check')
+        self._waiters, self._cosim = _makeWaiters(arglist, signals)
+        _levelize(arglist, self._waiters)
+        if not self._cosim and context.cosim:
             warn("Cosimulation not registered as Simulation argument")
-        self._finished = False
-        del _futureEvents[:]
-        del _siglist[:]
+        self._clocks = [s for s in signals if isinstance(s, Clock)]
+        for clock in self._clocks:
+            context.clocks.append(clock)
+        # clocks that no process has waited on yet
+        self._stopped = list(self._clocks)
+        self._engine = None
+        self.profile = None
+        if profile:
+            self.profile = _Profile(context, arglist, self._waiters)
+        if mode == 'cycle':
+            self._engine = _CycleEngine(context, arglist, clocks,
+                                        self._waiters, self._cosim)
         
         
     def _finalize(self):
+        context = self._context
         cosim = self._cosim
         if cosim:
-            _simulator._cosim = 0
+            context.cosim = 0
             os.close(cosim._rt)
             os.close(cosim._wf)
             os.waitpid(cosim._child_pid, 0)
-        if _simulator._tracing:
-            _simulator._tracing = 0
-            _simulator._tf.close()
-        # clean up for potential new run with same signals
-        for s in _signals:
+        if context.tracing:
+            context.tracing = 0
+            context.tf.close()
+        for block, func in self._compiled:
+            block.func = func
+        if self.profile:
+            self.profile._restore()
+        # clean up for potential new run with same signals, but leave
+        # the signals of other live simulations alone
+        for s in context.owned():
             s._clear()
+        # drop the clocks and their pending edges, so that they can go away
+        del context.futureEvents[:]
+        self._clocks = self._stopped = []
         self._finished = True
             
         
+    def deltaStats(self):
+        """ Return the delta cycle counters of this simulation.
+
+        The result is a dict with the number of delta cycles, the number
+        of signal updates, and the number of redundant update requests
+        that were dropped because the signal was already pending.
+
+        """
+        context = self._context
+        return dict(deltas=context.nrDeltas,
+                    updates=context.nrUpdates,
+                    duplicates=context.nrDuplicates)
+
     def runc(self, duration=0, quiet=0):
         simrunc.run(sim=self, duration=duration, quiet=quiet)
 
@@ -105,18 +181,26 @@ class Simulation(object):
         # From this point it will propagate to the caller, that can catch it.
         if self._finished:
             raise StopSimulation("Simulation has already finished")
+        context = self._context
+        _activate(context)
+        if self._engine:
+            return self._engine.run(self, duration, quiet)
         waiters = self._waiters
-        maxTime = None
+        maxTime = stop = None
         if duration:
             stop = _Waiter(None)
             stop.hasRun = 1
-            maxTime = _simulator._time + duration
-            schedule((maxTime, stop))
+            maxTime = context.time + duration
+            context.schedule(maxTime, stop)
         cosim = self._cosim
-        t = _simulator._time
+        t = context.time
         actives = {}
-        tracing = _simulator._tracing
-        tracefile = _simulator._tf
+        tracing = context.tracing
+        tracefile = context.tf
+        _siglist = context.siglist
+        _futureEvents = context.futureEvents
+        _levelQueue = context.levelQueue
+        stopped = self._stopped
         exc = []
         _pop = waiters.pop
         _append = waiters.append
@@ -125,9 +209,13 @@ class Simulation(object):
         while 1:
             try:
 
-                for s in _siglist:
-                    _extend(s._update())
-                del _siglist[:]
+                if _siglist:
+                    context.nrDeltas += 1
+                    context.nrUpdates += len(_siglist)
+                    for s in _siglist:
+                        s._pending = False
+                        _extend(s._update())
+                    del _siglist[:]
 
                 while waiters:
                     waiter = _pop()
@@ -136,6 +224,11 @@ class Simulation(object):
                     except StopIteration:
                         continue
 
+                if _levelQueue:
+                    _evaluate(context, waiters)
+                    if waiters:
+                        continue
+
                 if cosim:
                     cosim._get()
                     if _siglist or cosim._hasChange:
@@ -153,27 +246,30 @@ class Simulation(object):
                 if exc:
                     raise exc[0]
 
+                # a clock runs from the time step in which it is waited on
+                if stopped:
+                    _startClocks(stopped, t)
+
                 # future events
                 if _futureEvents:
                     if t == maxTime:
                         raise _SuspendSimulation(
                             "Simulated %s timesteps" % duration)
-                    _futureEvents.sort(key=itemgetter(0))
-                    t = _simulator._time = _futureEvents[0][0]
+                    # a clock that nothing waits on keeps no simulation alive
+                    if type(_futureEvents[0][2]) is _ClockDriver and \
+                       not cosim and _idle(self._clocks, _futureEvents, stop):
+                        raise StopSimulation("No more events")
+                    t = context.time = _futureEvents[0][0]
                     if tracing:
-                        print("#%s" % t, file=tracefile)
+                        tracefile.timestep(t)
                     if cosim:
                         cosim._put(t)
-                    while _futureEvents:
-                        newt, event = _futureEvents[0]
-                        if newt == t:
-                            if isinstance(event, _Waiter):
-                                _append(event)
-                            else:
-                                _extend(event.apply())
-                            del _futureEvents[0]
+                    while _futureEvents and _futureEvents[0][0] == t:
+                        event = heappop(_futureEvents)[2]
+                        if isinstance(event, _Waiter):
+                            _append(event)
                         else:
-                            break
+                            _extend(event.apply())
                 else:
                     raise StopSimulation("No more events")
 
@@ -193,7 +289,7 @@ class Simulation(object):
 
             except Exception as e:
                 if tracing:
-                    tracefile.flush()
+                    tracefile.abort()
                 # if the exception came from a yield, make sure we can resume
                 if exc and e is exc[0]:
                     pass # don't finalize
@@ -203,7 +299,7 @@ class Simulation(object):
                 raise
                 
 
-def _makeWaiters(arglist):
+def _makeWaiters(arglist, signals):
     waiters = []
     ids = set()
     cosim = None
@@ -227,8 +323,63 @@ def _makeWaiters(arglist):
             raise SimulationError(_error.DuplicatedArg)
         ids.add(id(arg))
     # add waiters for shadow signals
-    for sig in _signals:
+    for sig in signals:
         if hasattr(sig, '_waiter'):
             waiters.append(sig._waiter)
     return waiters, cosim
-        
+
+
+def _scopes(arglist):
+    """ Return the contexts in which the processes in arglist were elaborated
+
+    Processes that were not made with a decorator, such as plain
+    generators, are taken to be elaborated in the pending context of this
+    thread.
+
+    """
+    scopes = []
+    pending = False
+    for arg in arglist:
+        context = getattr(arg, '_context', None)
+        if context is None:
+            pending = True
+        elif context not in scopes:
+            scopes.append(context)
+    if pending or not scopes:
+        context = _pending()
+        if context not in scopes:
+            scopes.append(context)
+    return scopes
+
+
+def _waited(clock):
+    """ Return True if a process waits on the clock """
+    if clock._watched:
+        for wl in (clock._eventWaiters, clock._posedgeWaiters,
+                   clock._negedgeWaiters):
+            if wl or wl.subscribers:
+                return True
+    return False
+
+
+def _startClocks(stopped, t):
+    """ Start the stopped clocks that a process waits on at time t """
+    started = []
+    for clock in stopped:
+        if _waited(clock):
+            _ClockDriver(clock).start(t)
+            started.append(id(clock))
+    if started:
+        # signals compare by value, so remove them by identity
+        stopped[:] = [c for c in stopped if id(c) not in started]
+
+
+def _idle(clocks, events, stop):
+    """ Return True if only clocks that no process waits on are left """
+    for clock in clocks:
+        if _waited(clock):
+            return False
+    for t, seqno, event in events:
+        if type(event) is not _ClockDriver and event is not stop:
+            return False
+    return True
@@ -28,18 +28,15 @@ import inspect
 import re
 
 
-from myhdl._util import _dedent
+from myhdl._util import _getSource
 from myhdl._delay import delay
 from myhdl._join import join
 from myhdl._Signal import _Signal, _WaiterList, posedge, negedge
-from myhdl import _simulator
-from myhdl._simulator import _siglist, _futureEvents
+from myhdl._Memory import Memory
+from myhdl._simulator import _local, _schedule
 from myhdl._enum import enum
 
 
-schedule = _futureEvents.append
-
-
 class _Waiter(object):
 
     __slots__ = ('caller', 'generator', 'hasRun', 'nrTriggers', 'semaphore')
@@ -93,14 +90,13 @@ class _Waiter(object):
                 clause.append(clone)
                 if nr > 1:
                     actives[id(clause)] = clause
-            elif isinstance(clause, _Signal):
+            elif isinstance(clause, (_Signal, Memory)):
                 wl = clause._eventWaiters
                 wl.append(clone)
                 if nr > 1:
                     actives[id(wl)] = wl
             elif isinstance(clause, delay):
-                t = _simulator._time
-                schedule((t + clause._time, clone))
+                _schedule(_local.context.time + clause._time, clone)
             elif isinstance(clause, GeneratorType):
                 waiters.append(_Waiter(clause, clone))
             elif isinstance(clause, _Instantiator):
@@ -127,7 +123,7 @@ class _DelayWaiter(_Waiter):
     
     def next(self, waiters, actives, exc):
         clause = next(self.generator)
-        schedule((_simulator._time + clause._time, self))
+        _schedule(_local.context.time + clause._time, self)
         
 
 class _EdgeWaiter(_Waiter):
@@ -195,6 +191,38 @@ class _SignalTupleWaiter(_Waiter):
             actives[id(wl)] = wl
             
 
+class _StaticWaiter(_Waiter):
+
+    """ Waiter for a generator with a fixed sensitivity list.
+
+    The waiter subscribes once to the waiter lists of its sensitivity
+    list. From then on, an event on any of them simply marks it
+    runnable, without cloning and re-registering on each activation.
+
+    """
+
+    __slots__ = ('generator', 'hasRun', 'subscribed', 'triggered')
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.hasRun = 0
+        self.subscribed = False
+        self.triggered = False
+
+    def next(self, waiters, actives, exc):
+        self.triggered = False
+        clauses = next(self.generator)
+        if self.subscribed:
+            return
+        if isinstance(clauses, (_Signal, _WaiterList, Memory)):
+            clauses = (clauses,)
+        for clause in clauses:
+            if isinstance(clause, (_Signal, Memory)):
+                clause = clause._eventWaiters
+            clause.subscribe(self)
+        self.subscribed = True
+
+
 #_kind = enum("SIGNAL_TUPLE", "EDGE_TUPLE", "SIGNAL", "EDGE", "DELAY", "UNDEFINED")
 class _kind(object):
     SIGNAL_TUPLE = 1
@@ -207,29 +235,67 @@ class _kind(object):
 
 def _inferWaiter(gen):
     f = gen.gi_frame
-    s = inspect.getsource(f)
-    s = _dedent(s)
-    root = ast.parse(s)
-    root.symdict = f.f_globals.copy()
-    root.symdict.update(f.f_locals)
-    # print ast.dump(root)
-    v = _YieldVisitor(root)
-    v.visit(root)
-    if v.kind == _kind.EDGE_TUPLE:
+    src = _getSource(f)
+    # the kind only depends on the names in the yield expressions
+    names = _yieldNames(src)
+    f_locals, f_globals = f.f_locals, f.f_globals
+    pattern = []
+    for n in names:
+        if n in f_locals:
+            pattern.append(_nameKind(f_locals[n]))
+        elif n in f_globals:
+            pattern.append(_nameKind(f_globals[n]))
+        else:
+            pattern.append(_kind.UNDEFINED)
+    key = ('yieldKind', tuple(pattern))
+    if key not in src.results:
+        root = src.parse()
+        root.symdict = f_globals.copy()
+        root.symdict.update(f_locals)
+        # print ast.dump(root)
+        v = _YieldVisitor(root)
+        v.visit(root)
+        src.results[key] = v.kind
+    kind = src.results[key]
+    if kind == _kind.EDGE_TUPLE:
         return _EdgeTupleWaiter(gen)
-    if v.kind == _kind.SIGNAL_TUPLE:
+    if kind == _kind.SIGNAL_TUPLE:
         return _SignalTupleWaiter(gen)
-    if v.kind == _kind.DELAY:
+    if kind == _kind.DELAY:
         return _DelayWaiter(gen)
-    if v.kind == _kind.EDGE:
+    if kind == _kind.EDGE:
         return _EdgeWaiter(gen)
-    if v.kind == _kind.SIGNAL:
+    if kind == _kind.SIGNAL:
         return _SignalWaiter(gen)
     # default
     return _Waiter(gen)
    
 
 
+def _yieldNames(src):
+    """ Return the names in the yield expressions of a source """
+    names = src.results.get('yieldNames')
+    if names is None:
+        names = set()
+        for node in ast.walk(src.parse()):
+            if isinstance(node, ast.Yield) and node.value is not None:
+                for n in ast.walk(node.value):
+                    if isinstance(n, ast.Name):
+                        names.add(n.id)
+        names = src.results['yieldNames'] = tuple(sorted(names))
+    return names
+
+
+def _nameKind(obj):
+    if isinstance(obj, _Signal):
+        return _kind.SIGNAL
+    elif obj is delay:
+        return _kind.DELAY
+    elif obj is posedge or obj is negedge:
+        return _kind.EDGE
+    return _kind.UNDEFINED
+
+
 class _YieldVisitor(ast.NodeVisitor):
 
     def __init__(self, root):
@@ -274,13 +340,7 @@ class _YieldVisitor(ast.NodeVisitor):
         n = node.id
         node.kind = _kind.UNDEFINED
         if n in self.root.symdict:
-            obj = self.root.symdict[n]
-            if isinstance(obj, _Signal):
-                node.kind = _kind.SIGNAL
-            elif obj is delay:
-                node.kind = _kind.DELAY
-            elif obj is posedge or obj is negedge:
-                node.kind = _kind.EDGE
+            node.kind = _nameKind(self.root.symdict[n])
 
     def visit_Attribute(self, node):
         node.kind = _kind.UNDEFINED
@@ -21,18 +21,24 @@
 
 This module provides the following myhdl objects:
 Simulation -- simulation class
+BatchSimulation -- class to simulate a synchronous design on many lanes
 StopStimulation -- exception that stops a simulation
 now -- function that returns the current time
 Signal -- factory function to model hardware signals
 SignalType -- Signal base class
 ConcatSignal --  factory function that models a concatenation shadow signal
 TristateSignal -- factory function that models a tristate shadow signal
+Memory -- memory of intbv elements, with the values in a flat array
+Clock -- bool signal that is toggled by the simulation kernel
 delay -- callable to model delay in a yield statement
 posedge -- callable to model a rising edge on a signal in a yield statement
 negedge -- callable to model a falling edge on a signal in a yield statement
 join -- callable to join clauses in a yield statement
 intbv -- mutable integer class with bit vector facilities
 modbv -- modular bit vector class
+uintbv, sintbv -- unsigned and signed bit vectors with a fixed width
+umodbv, smodbv -- unsigned and signed modular bit vectors with a fixed width
+bitslice -- reusable slice of a bit vector
 downrange -- function that returns a downward range
 bin -- returns a binary string representation.
        The optional width specifies the desired string
@@ -46,6 +52,12 @@ always_seq --
 ResetSignal --
 enum -- function that returns an enumeration type
 traceSignals -- function that enables signal tracing in a VCD file
+start_trace -- function that restarts the signal tracing of a simulation
+stop_trace -- function that stops the signal tracing of a simulation
+dump_trace -- function that writes the signal trace of a simulation
+MwfFile -- reader of a waveform file in the MyHDL waveform format
+mwf2vcd -- function that converts a MyHDL waveform file to a VCD file
+VcdFile -- reader of a VCD file, with an index of the value changes
 toVerilog -- function that converts a design to Verilog
 
 """
@@ -117,21 +129,29 @@ from ._bin import bin
 from ._concat import concat
 from ._intbv import intbv
 from ._modbv import modbv
+from ._fixedbv import uintbv, sintbv, umodbv, smodbv
+from ._bitslice import bitslice
 from ._join import join
 from ._Signal import posedge, negedge, Signal, SignalType
 from ._ShadowSignal import ConcatSignal
 from ._ShadowSignal import TristateSignal
+from ._Memory import Memory
+from ._Clock import Clock
 from ._simulator import now
 from ._delay import delay
 from ._Cosimulation import Cosimulation
 from ._Simulation import Simulation
+from ._batch import BatchSimulation
 from ._misc import instances, downrange
 from ._always_comb import always_comb
 from ._always_seq import always_seq, ResetSignal
 from ._always import always
 from ._instance import instance
 from ._enum import enum, EnumType, EnumItemType
-from ._traceSignals import traceSignals
+from ._traceSignals import traceSignals, start_trace, stop_trace, \
+     dump_trace
+from ._mwf import MwfFile, mwf2vcd
+from ._vcd import VcdFile
 
 from myhdl import conversion
 from .conversion import toVerilog
@@ -144,6 +164,11 @@ __all__ = ["bin",
            "concat",
            "intbv",
            "modbv",
+           "uintbv",
+           "sintbv",
+           "umodbv",
+           "smodbv",
+           "bitslice",
            "join",
            "posedge",
            "negedge",
@@ -151,12 +176,15 @@ __all__ = ["bin",
            "SignalType",
            "ConcatSignal",
            "TristateSignal",
+           "Memory",
+           "Clock",
            "now",
            "delay",
            "downrange",
            "StopSimulation",
            "Cosimulation",
            "Simulation",
+           "BatchSimulation",
            "instances",
            "instance",
            "always_comb",
@@ -167,6 +195,12 @@ __all__ = ["bin",
            "EnumType",
            "EnumItemType",
            "traceSignals",
+           "start_trace",
+           "stop_trace",
+           "dump_trace",
+           "MwfFile",
+           "mwf2vcd",
+           "VcdFile",
            "toVerilog",
            "toVHDL",
            "conversion",
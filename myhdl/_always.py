@@ -27,9 +27,9 @@ from myhdl import AlwaysError
 from myhdl._util import _isGenFunc
 from myhdl._delay import delay
 from myhdl._Signal import _Signal, _WaiterList, posedge, negedge
-from myhdl._Waiter import _Waiter, _SignalWaiter, _SignalTupleWaiter, \
-                          _DelayWaiter, _EdgeWaiter, _EdgeTupleWaiter
+from myhdl._Waiter import _Waiter, _DelayWaiter, _StaticWaiter
 from myhdl._instance import _Instantiator
+from myhdl._simulator import _pending
 
 class _error:
     pass
@@ -64,34 +64,20 @@ class _Always(_Instantiator):
 
     def __init__(self, func, args):
         self.func = func
+        # the scope in which the block is elaborated
+        self._context = _pending()
         self.senslist = tuple(args)
         self.gen = self.genfunc()
         
         # infer appropriate waiter class
-        # first infer base type of arguments
-        for t in (_Signal, _WaiterList, delay):
-            if isinstance(args[0], t):
-                bt = t
-        for arg in args[1:]:
-            if not isinstance(arg, bt):
-                bt = None
-                break
-        # now set waiter class
-
-        W = _Waiter
-        
-        if bt is delay:
+        # without delays, the sensitivity list is static
+        nrDelays = len([arg for arg in args if isinstance(arg, delay)])
+        if nrDelays == 0:
+            W = _StaticWaiter
+        elif nrDelays == len(args):
             W = _DelayWaiter
-        elif len(self.senslist) == 1:
-            if bt is _Signal:
-                W = _SignalWaiter
-            elif bt is _WaiterList:
-                W = _EdgeWaiter
         else:
-            if bt is _Signal:
-                W = _SignalTupleWaiter
-            elif bt is _WaiterList:
-                W = _EdgeTupleWaiter
+            W = _Waiter
 
         self.waiter = W(self.gen)
             
@@ -28,11 +28,14 @@ import ast
 
 from myhdl import AlwaysCombError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._Memory import Memory
 from myhdl._util import _isGenFunc, _dedent
 from myhdl._cell_deref import _cell_deref
-from myhdl._Waiter import _Waiter, _SignalWaiter, _SignalTupleWaiter
+from myhdl._Waiter import _Waiter, _SignalWaiter, _SignalTupleWaiter, \
+                          _StaticWaiter
 from myhdl._instance import _Instantiator
-from myhdl._resolverefs import _AttrRefTransformer
+from myhdl._simulator import _pending
+from myhdl._resolverefs import _inferSigNames
 
 class _error:
     pass
@@ -70,6 +73,10 @@ def always_comb(func):
 INPUT, OUTPUT, INOUT = range(3)
 
 
+def _isSig(obj):
+    return isinstance(obj, (_Signal, Memory)) or _isListOfSigs(obj)
+
+
 
 class _SigNameVisitor(ast.NodeVisitor):
     def __init__(self, symdict):
@@ -108,7 +115,7 @@ class _SigNameVisitor(ast.NodeVisitor):
         if id not in self.symdict:
             return
         s = self.symdict[id]
-        if isinstance(s, _Signal) or _isListOfSigs(s):
+        if _isSig(s):
             if self.context == INPUT:
                 self.inputs.add(id)
             elif self.context == OUTPUT:
@@ -193,21 +200,16 @@ class _AlwaysComb(_Instantiator):
 
     def __init__(self, func, symdict):
         self.func = func
+        # the scope in which the block is elaborated
+        self._context = _pending()
         self.symdict = symdict
-        s = inspect.getsource(func)
-        s = _dedent(s)
-        tree = ast.parse(s)
-        # print ast.dump(tree)
-        v = _AttrRefTransformer(self)
-        v.visit(tree)
-        v = _SigNameVisitor(self.symdict)
-        v.visit(tree)
-        self.inputs = v.inputs
-        self.outputs = v.outputs
+        self.inputs, self.outputs = _inferSigNames(self, _SigNameVisitor,
+                                                   _isSig)
         senslist = []
         for n in self.inputs:
             s = self.symdict[n]
-            if isinstance(s, _Signal):
+            if isinstance(s, (_Signal, Memory)):
+                # a single event for all elements of a Memory
                 senslist.append(s)
             else: # list of sigs
                 senslist.extend(s)
@@ -215,11 +217,7 @@ class _AlwaysComb(_Instantiator):
         self.gen = self.genfunc()
         if len(self.senslist) == 0:
             raise AlwaysCombError(_error.EmptySensitivityList)
-        if len(self.senslist) == 1:
-            W = _SignalWaiter
-        else:
-            W = _SignalTupleWaiter
-        self.waiter = W(self.gen)
+        self.waiter = _StaticWaiter(self.gen)
 
 
 
@@ -227,9 +225,10 @@ class _AlwaysComb(_Instantiator):
         senslist = self.senslist
         if len(senslist) == 1:
             senslist = senslist[0]
-        func = self.func
+        # the function is looked up on each activation, as a simulation
+        # backend may replace it
         while 1:
-            func()
+            self.func()
             yield senslist
 
 
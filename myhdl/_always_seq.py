@@ -31,9 +31,11 @@ from myhdl._util import _isGenFunc, _dedent
 from myhdl._cell_deref import _cell_deref
 from myhdl._delay import delay
 from myhdl._Signal import _Signal, _WaiterList,_isListOfSigs
-from myhdl._Waiter import _Waiter, _EdgeWaiter, _EdgeTupleWaiter
+from myhdl._Memory import Memory
+from myhdl._Waiter import _Waiter, _StaticWaiter
 from myhdl._instance import _Instantiator
-from myhdl._resolverefs import _AttrRefTransformer
+from myhdl._simulator import _pending
+from myhdl._resolverefs import _inferSigNames
 
 # evacuate this later
 AlwaysSeqError = AlwaysError
@@ -86,6 +88,8 @@ class _AlwaysSeq(_Instantiator):
 
     def __init__(self, func, edge, reset):
         self.func = func
+        # the scope in which the block is elaborated
+        self._context = _pending()
         self.senslist = senslist = [edge]
         self.reset = reset
         if reset is not None:
@@ -99,11 +103,7 @@ class _AlwaysSeq(_Instantiator):
             self.gen = self.genfunc()
         else:
             self.gen = self.genfunc_no_reset()
-        if len(self.senslist) == 1:
-            W = _EdgeWaiter
-        else:
-            W = _EdgeTupleWaiter
-        self.waiter = W(self.gen)
+        self.waiter = _StaticWaiter(self.gen)
 
         # find symdict
         # similar to always_comb, but in class constructor
@@ -123,22 +123,18 @@ class _AlwaysSeq(_Instantiator):
         self.symdict = symdict
 
         # now infer outputs to be reset
-        s = inspect.getsource(func)
-        s = _dedent(s)
-        tree = ast.parse(s)
-        # print ast.dump(tree)
-        v = _AttrRefTransformer(self)
-        v.visit(tree)
-        v = _SigNameVisitor(self.symdict)
-        v.visit(tree)
+        inputs, outputs = _inferSigNames(self, _SigNameVisitor, _isSig)
         sigregs = self.sigregs = []
         varregs = self.varregs = []
-        for n in v.outputs:
+        memregs = self.memregs = []
+        for n in outputs:
             reg = self.symdict[n]
             if isinstance(reg, _Signal):
                 sigregs.append(reg)
             elif isinstance(reg, intbv):
                 varregs.append((n, reg, int(reg)))
+            elif isinstance(reg, Memory):
+                memregs.append(reg)
             else:
                 assert _isListOfSigs(reg)
                 for e in reg:
@@ -148,6 +144,8 @@ class _AlwaysSeq(_Instantiator):
     def reset_sigs(self):
         for s in self.sigregs:
             s.next = s._init
+        for m in self.memregs:
+            m._reset()
 
     def reset_vars(self):
         for v in self.varregs:
@@ -161,23 +159,23 @@ class _AlwaysSeq(_Instantiator):
             senslist = senslist[0]
         reset_sigs = self.reset_sigs
         reset_vars = self.reset_vars
-        func = self.func
+        # the function is looked up on each activation, as a simulation
+        # backend may replace it
         while 1:
             yield senslist
             if self.reset == self.reset.active:
                 reset_sigs()
                 reset_vars()
             else:
-                func()
+                self.func()
 
     def genfunc_no_reset(self):
         senslist = self.senslist
         assert len(senslist) == 1
         senslist = senslist[0]
-        func = self.func
         while 1:
             yield senslist
-            func()
+            self.func()
 
 
 # similar to always_comb, calls for refactoring
@@ -185,6 +183,10 @@ class _AlwaysSeq(_Instantiator):
 
 INPUT, OUTPUT, INOUT = range(3)
 
+
+def _isSig(obj):
+    return isinstance(obj, (_Signal, intbv, Memory)) or _isListOfSigs(obj)
+
 class _SigNameVisitor(ast.NodeVisitor):
     def __init__(self, symdict):
         self.inputs = set()
@@ -218,7 +220,7 @@ class _SigNameVisitor(ast.NodeVisitor):
         if id not in self.symdict:
             return
         s = self.symdict[id]
-        if isinstance(s, (_Signal, intbv)) or _isListOfSigs(s):
+        if _isSig(s):
             if self.context == INPUT:
                 self.inputs.add(id)
             elif self.context == OUTPUT:
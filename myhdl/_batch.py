@@ -0,0 +1,651 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the BatchSimulation class.
+
+A batch simulation runs a synchronous design on many lanes at once. The
+value of each signal is a NumPy vector with a value per lane. The blocks
+of the design are compiled into functions that evaluate all lanes in a
+single call. Control flow that diverges between lanes is turned into
+lane masks.
+
+"""
+from __future__ import absolute_import
+
+import ast
+import re
+
+from myhdl import SimulationError
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._concat import concat
+from myhdl._modbv import modbv
+from myhdl._Signal import _Signal, _WaiterList
+from myhdl._ShadowSignal import _ShadowSignal
+from myhdl._always_comb import _AlwaysComb
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._always import _Always
+from myhdl._util import _flatten
+from myhdl._compiled import _BlockCompiler, _Unsupported, _analyzeBlocks, \
+                            _binOpMap
+
+
+class _error:
+    pass
+_error.NumPy = "batch simulation requires NumPy"
+_error.Lanes = "number of lanes should be a positive integer"
+_error.KwArg = "Unexpected keyword argument"
+_error.ArgType = "batch simulation only supports always_seq, always_comb " \
+                 "and clock edge always blocks"
+_error.NrOfClocks = "batch simulation requires a single clock edge"
+_error.Unsupported = "block not supported in batch simulation"
+_error.MultipleDrivers = "signal driven by more than one block"
+_error.CombCycle = "combinational loop"
+_error.ClockRead = "clock used as a data signal"
+_error.Signal = "signal not used in the design"
+_error.Driven = "only undriven signals can be set"
+
+# values are stored as 64-bit signed integers
+_MAXBITS = 62
+# the bit length of the magnitude of any computed value
+_VALBITS = 63
+
+# NumPy is slow to import, and only imported for a batch simulation
+np = None
+
+def _importNumPy():
+    """ Import NumPy; return False if it is not available """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+def _truth(x):
+    return np.not_equal(x, 0)
+
+
+class _LaneCompiler(_BlockCompiler):
+
+    """ Generate a function that evaluates a block on all lanes.
+
+    An assignment under a condition only changes the lanes where the
+    lane mask of the condition is set. Blocks in which a value may not
+    fit in a 64-bit integer are not supported.
+
+    """
+
+    reserved = re.compile(r"_(vals|where|not|and|any|abs|truth|[svncm]\d+)$")
+
+    def __init__(self, tree):
+        _BlockCompiler.__init__(self, tree)
+        self.mask = None
+        self.nrMasks = 0
+        self.locals = set()
+        # bit lengths of the largest values of the variables
+        self.varBits = {}
+
+    def sigIndex(self, n):
+        sig = self.tree.sigdict[n]
+        if isinstance(sig, _ShadowSignal):
+            raise _Unsupported("shadow signal %s" % n)
+        for bound in (sig._min, sig._max):
+            if bound is not None and abs(bound) > 2**_MAXBITS:
+                raise _Unsupported("signal %s wider than %s bits" %
+                                   (n, _MAXBITS))
+        return _BlockCompiler.sigIndex(self, n)
+
+    def local(self, n):
+        if self.reserved.match(n):
+            raise _Unsupported("variable name %s" % n)
+        return _BlockCompiler.local(self, n)
+
+    # value widths
+
+    def bits(self, node):
+        """ Return the bit length of the largest magnitude of an expression
+
+        Expressions with a value that may not fit in 64 bits, and
+        subexpressions of them, are rejected.
+
+        """
+        b = self.exprBits(node)
+        if b > _VALBITS:
+            raise _Unsupported("value wider than %s bits" % _VALBITS)
+        return b
+
+    def sigBits(self, sig):
+        if sig._type is bool:
+            return 1
+        if sig._min is None or sig._max is None:
+            return _MAXBITS
+        return max(abs(sig._min), abs(sig._max - 1)).bit_length()
+
+    def opBits(self, op, left, right, node):
+        """ Return the bit length of a binary operation on node """
+        if isinstance(op, (ast.Add, ast.Sub)):
+            return max(left, right) + 1
+        if isinstance(op, ast.Mult):
+            return left + right
+        if isinstance(op, (ast.FloorDiv, ast.RShift)):
+            return left
+        if isinstance(op, ast.Mod):
+            return right
+        if isinstance(op, (ast.Pow, ast.LShift)):
+            n = self.constant(node)
+            if n is None or n < 0:
+                raise _Unsupported("variable exponent or shift")
+            return left * n if isinstance(op, ast.Pow) else left + n
+        # the result of a bitwise operation on negative values
+        return max(left, right) + 1
+
+    def exprBits(self, node):
+        tree = self.tree
+        if isinstance(node, ast.Num):
+            return abs(int(node.n)).bit_length()
+        if isinstance(node, ast.Name):
+            n = node.id
+            if n in tree.vardict:
+                return self.varBits.get(n, 0)
+            if n in tree.sigdict:
+                return self.sigBits(tree.sigdict[n])
+            obj = tree.symdict.get(n)
+            if isinstance(obj, integer_types):
+                return abs(obj).bit_length()
+            return 1
+        if isinstance(node, ast.Attribute):
+            sig = tree.sigdict.get(getattr(node.value, 'id', None))
+            if sig is not None and node.attr in ('min', 'max'):
+                return abs(getattr(sig, node.attr) or 0).bit_length()
+            return self.bits(node.value)
+        if isinstance(node, ast.BinOp):
+            return self.opBits(node.op, self.bits(node.left),
+                               self.bits(node.right), node.right)
+        if isinstance(node, ast.BoolOp):
+            return max([self.bits(v) for v in node.values])
+        if isinstance(node, ast.UnaryOp):
+            b = self.bits(node.operand)
+            if isinstance(node.op, ast.Not):
+                return 1
+            if isinstance(node.op, ast.Invert):
+                return self.width(node.operand) or b + 1
+            return b
+        if isinstance(node, ast.Compare):
+            self.bits(node.left)
+            self.bits(node.comparators[0])
+            return 1
+        if isinstance(node, ast.IfExp):
+            self.bits(node.test)
+            return max(self.bits(node.body), self.bits(node.orelse))
+        if isinstance(node, ast.Subscript):
+            if isinstance(node.slice, ast.Index):
+                self.bits(node.slice.value)
+                if self.isRom(node.value):
+                    rom = tree.symdict[node.value.id]
+                    return max([abs(v).bit_length() for v in rom])
+                self.bits(node.value)
+                return 1
+            b = self.bits(node.value)
+            if isinstance(node.slice, ast.Slice):
+                i, j = self.sliceBounds(node)
+                if i:
+                    return i - j
+            return b
+        if isinstance(node, ast.Call):
+            f = getattr(node.func, 'obj', None)
+            bits = [self.bits(arg) for arg in node.args]
+            if f is concat and len(node.args) > 1:
+                widths = [self.concatWidth(arg) for arg in node.args]
+                return (widths[0] or bits[0]) + sum(widths[1:])
+            if f is len:
+                return _MAXBITS.bit_length()
+            if f is bool:
+                return 1
+            return max(bits or [1])
+        # other expressions are rejected by the compiler
+        return 1
+
+    def checkWidths(self, body):
+        """ Check the values that the statements in body compute """
+        for stmt in body:
+            if isinstance(stmt, ast.Assign):
+                b = self.bits(stmt.value)
+                target = stmt.targets[0]
+                if isinstance(target, ast.Name):
+                    n = target.id
+                    self.varBits[n] = max(self.varBits.get(n, 0), b)
+            elif isinstance(stmt, ast.AugAssign) and \
+                 isinstance(stmt.target, ast.Name):
+                n = stmt.target.id
+                b = self.opBits(stmt.op, self.varBits.get(n, 0),
+                                self.bits(stmt.value), stmt.value)
+                if b > _VALBITS:
+                    raise _Unsupported("value wider than %s bits" % _VALBITS)
+                self.varBits[n] = max(self.varBits.get(n, 0), b)
+            elif isinstance(stmt, ast.If) and not stmt.ignore:
+                for test, suite in stmt.tests:
+                    self.bits(test)
+                    self.checkWidths(suite)
+                if stmt.else_:
+                    self.checkWidths(stmt.else_)
+            elif isinstance(stmt, ast.For):
+                bounds = [self.constant(arg) for arg in stmt.iter.args]
+                if None in bounds:
+                    continue # rejected by the compiler
+                n = stmt.target.id
+                self.varBits[n] = max([abs(b) for b in bounds]).bit_length()
+                # the widths of the variables grow until they are stable
+                for i in range(len(range(*bounds))):
+                    varBits = dict(self.varBits)
+                    self.checkWidths(stmt.body)
+                    if self.varBits == varBits:
+                        break
+
+    def newMask(self, expr):
+        self.nrMasks += 1
+        m = "_m%d" % self.nrMasks
+        self.line("%s = %s" % (m, expr))
+        return m
+
+    def assign(self, target, value):
+        if self.mask is None:
+            self.line("%s = %s" % (target, value))
+        else:
+            self.line("%s = _where(%s, %s, %s)" %
+                      (target, self.mask, value, target))
+
+    def maskedSuite(self, mask, body):
+        outer = self.mask
+        self.line("if _any(%s):" % mask)
+        self.mask = mask
+        nr = len(self.lines)
+        self.suite(body)
+        if len(self.lines) == nr:
+            self.indent()
+            self.line("pass")
+            self.dedent()
+        self.mask = outer
+
+    # statements
+
+    def visit_FunctionDef(self, node):
+        self.checkWidths(node.body)
+        _BlockCompiler.visit_FunctionDef(self, node)
+
+    def visit_Assign(self, node):
+        target = node.targets[0]
+        value = self.visit(node.value)
+        if isinstance(target, ast.Attribute) and target.attr == 'next' and \
+           isinstance(target.value, ast.Name) and \
+           target.value.id in self.tree.sigdict:
+            self.assign(self.writeSig(target.value.id), value)
+        elif isinstance(target, ast.Name):
+            self.locals.add(self.local(target.id))
+            self.assign(target.id, value)
+        else:
+            raise _Unsupported("assignment target")
+
+    def visit_AugAssign(self, node):
+        if not isinstance(node.target, ast.Name) or \
+           type(node.op) not in _binOpMap:
+            raise _Unsupported("augmented assignment")
+        n = self.local(node.target.id)
+        self.locals.add(n)
+        self.assign(n, "(%s %s %s)" % (n, _binOpMap[type(node.op)],
+                                       self.visit(node.value)))
+
+    def visit_If(self, node):
+        if node.ignore:
+            return
+        rest = self.mask
+        last = len(node.tests) - 1
+        for i, (test, suite) in enumerate(node.tests):
+            cond = "_truth(%s)" % self.visit(test)
+            if rest is not None:
+                cond = "_and(%s, %s)" % (rest, cond)
+            m = self.newMask(cond)
+            self.maskedSuite(m, suite)
+            if i < last or node.else_:
+                if rest is None:
+                    rest = self.newMask("_not(%s)" % m)
+                else:
+                    rest = self.newMask("_and(%s, _not(%s))" % (rest, m))
+        if node.else_:
+            self.maskedSuite(rest, node.else_)
+
+    def visit_For(self, node):
+        cf = node.iter
+        if node.orelse or getattr(cf.func, 'obj', None) is not range:
+            raise _Unsupported("for loop")
+        # all lanes run the same iterations
+        bounds = [self.constant(arg) for arg in cf.args]
+        if None in bounds:
+            raise _Unsupported("for loop bounds")
+        self.line("for %s in range(%s):" %
+                  (self.local(node.target.id),
+                   ", ".join([repr(b) for b in bounds])))
+        nr = len(self.lines)
+        self.suite(node.body)
+        if len(self.lines) == nr:
+            self.indent()
+            self.line("pass")
+            self.dedent()
+
+    def visit_Break(self, node):
+        raise _Unsupported("break")
+
+    def visit_Continue(self, node):
+        raise _Unsupported("continue")
+
+    # expressions
+
+    def visit_BoolOp(self, node):
+        values = [self.visit(v) for v in node.values]
+        expr = values[-1]
+        for v in reversed(values[:-1]):
+            if isinstance(node.op, ast.And):
+                expr = "_where(_truth(%s), %s, %s)" % (v, expr, v)
+            else:
+                expr = "_where(_truth(%s), %s, %s)" % (v, v, expr)
+        return expr
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return "_not(%s)" % self.visit(node.operand)
+        return _BlockCompiler.visit_UnaryOp(self, node)
+
+    def visit_IfExp(self, node):
+        return "_where(_truth(%s), %s, %s)" % (self.visit(node.test),
+                                               self.visit(node.body),
+                                               self.visit(node.orelse))
+
+    def romIndex(self, i, index):
+        return "_c%d.take(%s, mode='wrap')" % (i, index)
+
+    def visit_Call(self, node):
+        f = getattr(node.func, 'obj', None)
+        if len(node.args) == 1 and not node.keywords:
+            if f is int:
+                return self.visit(node.args[0])
+            if f is bool:
+                return "_truth(%s)" % self.visit(node.args[0])
+            if f is abs:
+                return "_abs(%s)" % self.visit(node.args[0])
+        return _BlockCompiler.visit_Call(self, node)
+
+    # code generation
+
+    def build(self, name, numbers):
+        """ Return a function that maps the signal values to the outputs.
+
+        numbers -- the numbers of the signals in the value list
+
+        """
+        head = []
+        for i in self.reads:
+            head.append("        _v%d = _vals[%d]" % (i, numbers[i]))
+        # outputs that are not assigned keep their value
+        for i in self.writes:
+            head.append("        _n%d = _vals[%d]" % (i, numbers[i]))
+        for n in sorted(self.locals):
+            head.append("        %s = 0" % n)
+        args = ["_where", "_not", "_and", "_any", "_abs", "_truth"] + \
+               ["_c%d" % i for i in range(len(self.consts))]
+        result = "".join(["_n%d, " % i for i in self.writes])
+        src = ["def _make(%s):" % ", ".join(args),
+               "    def _run(_vals):"]
+        src += head + self.lines
+        src += ["        return (%s)" % result,
+                "    return _run",
+                ""]
+        source = "\n".join(src)
+        namespace = {}
+        code = compile(source, "<batch %s>" % name, 'exec')
+        exec(code, namespace)
+        consts = [np.array(c, dtype=np.int64) for c in self.consts]
+        func = namespace['_make'](np.where, np.logical_not, np.logical_and,
+                                  np.any, np.abs, _truth, *consts)
+        func.__name__ = name
+        func.source = source
+        return func
+
+
+class BatchSimulation(object):
+
+    """ Batch simulation class.
+
+    Simulate a synchronous design on many lanes at once. The signal
+    values of the lanes are NumPy vectors. The values of undriven
+    signals are set by item assignment, and all values are read by
+    item access.
+
+    Methods:
+    step -- advance all lanes by some clock cycles
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Construct a batch simulation object.
+
+        *args -- list of arguments. Each argument is an always_seq,
+                 always_comb or clock edge always block, or a nested
+                 sequence of such blocks.
+        lanes -- the number of lanes
+
+        """
+        lanes = kwargs.pop('lanes', None)
+        if kwargs:
+            raise SimulationError(_error.KwArg, ", ".join(kwargs))
+        if not _importNumPy():
+            raise SimulationError(_error.NumPy)
+        if not isinstance(lanes, integer_types) or lanes < 1:
+            raise SimulationError(_error.Lanes, repr(lanes))
+        self.lanes = lanes
+        self.cycles = 0
+        self._finished = False
+        self._numbers = {}
+        self._sigs = []
+        self._names = []
+        self._vals = []
+        self._bounds = []
+        self._drivers = {}
+        blocks = []
+        edge = None
+        for arg in _flatten(*args):
+            if isinstance(arg, _AlwaysSeq):
+                senslist = arg.senslist
+            elif isinstance(arg, _Always) and len(arg.senslist) == 1 and \
+                 isinstance(arg.senslist[0], _WaiterList):
+                senslist = arg.senslist
+            elif isinstance(arg, _AlwaysComb):
+                senslist = None
+            else:
+                raise SimulationError(_error.ArgType, repr(arg))
+            if senslist is not None:
+                if edge is None:
+                    edge = senslist[0]
+                elif senslist[0] is not edge:
+                    raise SimulationError(_error.NrOfClocks)
+            blocks.append(arg)
+        self._clock = edge and edge.sig
+        trees, errors = _analyzeBlocks(blocks)
+        comb = []
+        self._seq = []
+        self._asyncResets = []
+        for b, tree, error in zip(blocks, trees, errors):
+            name = b.func.__name__
+            if tree is None:
+                raise SimulationError(_error.Unsupported,
+                                      "%s: %s" % (name, error))
+            v = _LaneCompiler(tree)
+            try:
+                v.visit(tree)
+            except _Unsupported as e:
+                raise SimulationError(_error.Unsupported,
+                                      "%s: %s" % (name, e))
+            numbers = [self._number(s, n) for s, n in zip(v.sigs, v.names)]
+            func = v.build(name, numbers)
+            inputs = [numbers[i] for i in v.reads]
+            outputs = [numbers[i] for i in v.writes]
+            for g in outputs:
+                if g in self._drivers:
+                    raise SimulationError(_error.MultipleDrivers,
+                                          self._names[g])
+                self._drivers[g] = name
+            if self._clock is not None and \
+               id(self._clock) in [id(v.sigs[i]) for i in v.reads]:
+                raise SimulationError(_error.ClockRead, name)
+            if isinstance(b, _AlwaysComb):
+                comb.append((func, inputs, outputs))
+            else:
+                self._seq.append((func, outputs, self._reset(b)))
+        self._comb = self._levelize(comb)
+        self._dirty = True
+
+    def _number(self, sig, name=None):
+        if id(sig) not in self._numbers:
+            g = self._numbers[id(sig)] = len(self._sigs)
+            self._sigs.append(sig)
+            self._names.append(name or sig._name or "signal")
+            if sig._type is bool:
+                bounds = (0, 2, False)
+            else:
+                bounds = (sig._min, sig._max, isinstance(sig._init, modbv))
+            self._bounds.append(bounds)
+            self._vals.append(np.full(self.lanes, int(sig._init),
+                                      dtype=np.int64))
+        return self._numbers[id(sig)]
+
+    def _reset(self, block):
+        """ Return the reset of an always_seq block, or None """
+        reset = getattr(block, 'reset', None)
+        if reset is None:
+            return None
+        regs = [(self._number(s), int(s._init)) for s in block.sigregs]
+        for g, init in regs:
+            self._drivers.setdefault(g, block.func.__name__)
+        info = (self._number(reset, 'reset'), int(reset.active), regs)
+        if reset.async:
+            self._asyncResets.append(info)
+        return info
+
+    def _levelize(self, comb):
+        """ Return the combinational blocks in evaluation order """
+        readers = {}
+        for i, (func, inputs, outputs) in enumerate(comb):
+            for g in inputs:
+                readers.setdefault(g, set()).add(i)
+        indegree = [0] * len(comb)
+        successors = []
+        for func, inputs, outputs in comb:
+            succ = set()
+            for g in outputs:
+                succ.update(readers.get(g, ()))
+            for j in succ:
+                indegree[j] += 1
+            successors.append(succ)
+        ready = [i for i, d in enumerate(indegree) if d == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for j in successors[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    ready.append(j)
+        if len(order) != len(comb):
+            names = [comb[i][0].__name__ for i in range(len(comb))
+                     if i not in order]
+            raise SimulationError(_error.CombCycle, ", ".join(names))
+        return [(comb[i][0], comb[i][2]) for i in order]
+
+    def _commit(self, g, value):
+        vals = np.empty(self.lanes, dtype=np.int64)
+        vals[...] = value
+        lo, hi, mod = self._bounds[g]
+        if lo is not None or hi is not None:
+            if mod:
+                vals = (vals - lo) % (hi - lo) + lo
+            else:
+                bad = np.zeros(self.lanes, dtype=bool)
+                if lo is not None:
+                    bad |= vals < lo
+                if hi is not None:
+                    bad |= vals >= hi
+                if bad.any():
+                    lane = int(np.argmax(bad))
+                    raise ValueError("%s: value %s out of range [%s, %s) "
+                                     "in lane %s" % (self._names[g],
+                                                     vals[lane], lo, hi, lane))
+        self._vals[g] = vals
+
+    def _settle(self):
+        vals = self._vals
+        for r, active, regs in self._asyncResets:
+            mask = vals[r] == active
+            if mask.any():
+                for g, init in regs:
+                    vals[g] = np.where(mask, init, vals[g])
+        for func, outputs in self._comb:
+            for g, value in zip(outputs, func(vals)):
+                self._commit(g, value)
+        self._dirty = False
+
+    def step(self, n=1):
+        """ Advance all lanes by n clock cycles """
+        for i in range(n):
+            if self._dirty:
+                self._settle()
+            vals = self._vals
+            updates = []
+            for func, outputs, reset in self._seq:
+                values = dict(zip(outputs, func(vals)))
+                if reset is not None:
+                    r, active, regs = reset
+                    mask = vals[r] == active
+                    for g, init in regs:
+                        values[g] = np.where(mask, init,
+                                             values.get(g, vals[g]))
+                updates.extend(values.items())
+            for g, value in updates:
+                self._commit(g, value)
+            self._settle()
+            self.cycles += 1
+
+    def _find(self, sig):
+        if not isinstance(sig, _Signal) or id(sig) not in self._numbers:
+            raise SimulationError(_error.Signal, repr(sig))
+        return self._numbers[id(sig)]
+
+    def __getitem__(self, sig):
+        g = self._find(sig)
+        if self._dirty:
+            self._settle()
+        return self._vals[g].copy()
+
+    def __setitem__(self, sig, values):
+        g = self._find(sig)
+        if g in self._drivers:
+            raise SimulationError(_error.Driven, self._names[g])
+        self._commit(g, values)
+        self._dirty = True
@@ -0,0 +1,60 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the bitslice class """
+from __future__ import absolute_import
+
+from myhdl._compat import integer_types
+
+
+class bitslice(object):
+
+    """ Reusable slice [i:j] of a bit vector.
+
+    A bitslice is used as an index of an intbv or a signal: x[s] returns
+    the value of the slice, and x[s] = v assigns it, as x[i:j] and
+    x[i:j] = v do. The mask, the shift and the bounds of the value are
+    computed once, when the bitslice is constructed.
+
+    """
+
+    __slots__ = ('_i', '_j', '_nrbits', '_max', '_mask', '_fieldmask')
+
+    def __init__(self, i, j=0):
+        if not isinstance(i, integer_types) or \
+           not isinstance(j, integer_types):
+            raise TypeError("bitslice(i, j) requires integer indices")
+        if j < 0:
+            raise ValueError("bitslice(i, j) requires j >= 0\n" \
+                  "            j == %s" % j)
+        if i <= j:
+            raise ValueError("bitslice(i, j) requires i > j\n" \
+                  "            i, j == %s, %s" % (i, j))
+        self._i = i
+        self._j = j
+        self._nrbits = i - j
+        self._max = 1 << (i - j)
+        self._mask = (1 << (i - j)) - 1
+        self._fieldmask = self._mask << j
+
+    def __len__(self):
+        return self._nrbits
+
+    def __repr__(self):
+        return "bitslice(%s, %s)" % (self._i, self._j)
@@ -0,0 +1,286 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" On-disk cache of analyzed sources.
+
+The dedented source, the parsed AST and the analysis results of each
+_Source are kept in a cache directory, so that they survive the process.
+There is one cache file per source file and Python version. It is only
+used when its digest matches the current contents of the source file,
+and its entries are keyed by the line range of the function in the file.
+
+The cache is off by default. It is enabled by setting the MYHDL_CACHE_DIR
+environment variable to a directory, or by calling setCacheDir. New
+entries are written when the process exits, or on flush.
+
+The cache can be warmed and cleared from the command line:
+
+    python -m myhdl.cache [-d DIR] warm PATH [PATH ...]
+    python -m myhdl.cache [-d DIR] clear
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import ast
+import sys
+import atexit
+import hashlib
+import pickle
+import linecache
+
+# the cache is dropped when the Python or MyHDL version changes
+_MAGIC = 1
+_SUFFIX = '.pickle'
+
+_dir = os.environ.get('MYHDL_CACHE_DIR') or None
+
+# cache files by absolute source file path
+_files = {}
+
+
+def _version():
+    from myhdl import __version__
+    return (_MAGIC, __version__, tuple(sys.version_info[:3]))
+
+
+class _Results(dict):
+
+    """ Results dict that marks its cache file as changed """
+
+    __slots__ = ('file',)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.file.dirty = True
+
+
+class _Entry(object):
+
+    """ Cached text, pickled AST and results of a function source """
+
+    __slots__ = ('file', 'text', 'ast', 'results')
+
+    def __init__(self, file, text=None, ast=None, results=None):
+        self.file = file
+        self.text = text
+        self.ast = ast
+        self.results = _Results(results or ())
+        self.results.file = file
+
+    def setText(self, text):
+        self.text = text
+        self.file.dirty = True
+
+    def parse(self):
+        """ Return a new AST of the text """
+        if self.ast is None:
+            tree = ast.parse(self.text)
+            self.ast = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+            self.file.dirty = True
+            return tree
+        return pickle.loads(self.ast)
+
+
+class _File(object):
+
+    """ Cache file of a source file """
+
+    __slots__ = ('path', 'lines', 'digest', 'entries', 'dirty')
+
+    def __init__(self, path, lines):
+        self.path = path
+        self.lines = lines
+        self.digest = _digest(lines)
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(_cachePath(path), 'rb') as f:
+                data = pickle.load(f)
+        # a missing, corrupt or foreign cache file is ignored
+        except Exception:
+            return
+        if data.get('version') != _version() or \
+           data.get('digest') != self.digest:
+            return
+        for key, (text, tree, results) in data['entries'].items():
+            self.entries[key] = _Entry(self, text, tree, results)
+
+    def write(self):
+        entries = {}
+        for key, entry in self.entries.items():
+            entries[key] = (entry.text, entry.ast, dict(entry.results))
+        data = dict(version=_version(), path=self.path, digest=self.digest,
+                    entries=entries)
+        # tempfile is slow to import, and only needed here
+        import tempfile
+        if not os.path.isdir(_dir):
+            os.makedirs(_dir)
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            _replace(tmp, _cachePath(self.path))
+        except:
+            os.remove(tmp)
+            raise
+        self.dirty = False
+
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _bytes(text):
+    """ Return text as bytes; byte strings, as on Python 2, are kept """
+    if isinstance(text, bytes):
+        return text
+    return text.encode('utf-8')
+
+
+def _digest(lines):
+    h = hashlib.sha1()
+    for line in lines:
+        h.update(_bytes(line))
+    return h.hexdigest()
+
+
+def _cachePath(path):
+    """ Return the cache file path of a source file.
+
+    The name includes the Python version, so that interpreters that share
+    the cache directory don't overwrite each other's entries.
+
+    """
+    base = os.path.splitext(os.path.basename(path))[0]
+    key = hashlib.sha1(_bytes(path)).hexdigest()[:16]
+    tag = "py%d%d" % sys.version_info[:2]
+    return os.path.join(_dir, "%s.%s.%s%s" % (base, key, tag, _SUFFIX))
+
+
+def _lookup(sourcefile, lineno, lines):
+    """ Return the cache entry of the source lines at lineno in sourcefile.
+
+    Return None if the cache is off or the source file is unknown. The
+    text of a new entry is None.
+
+    """
+    if _dir is None or sourcefile is None:
+        return None
+    path = os.path.abspath(sourcefile)
+    filelines = linecache.getlines(sourcefile)
+    if not filelines:
+        return None
+    file = _files.get(path)
+    if file is None or (file.lines is not filelines and
+                        file.digest != _digest(filelines)):
+        file = _files[path] = _File(path, filelines)
+    file.lines = filelines
+    key = (lineno, len(lines))
+    entry = file.entries.get(key)
+    if entry is None:
+        entry = file.entries[key] = _Entry(file)
+    return entry
+
+
+def flush():
+    """ Write the changed cache files """
+    if _dir is None:
+        return
+    for file in _files.values():
+        if file.dirty:
+            try:
+                file.write()
+            except (IOError, OSError):
+                pass
+
+atexit.register(flush)
+
+
+def setCacheDir(path):
+    """ Set the cache directory; None turns the cache off """
+    global _dir
+    flush()
+    _files.clear()
+    _dir = path
+
+
+def warm(paths):
+    """ Analyze the functions in Python files and directories.
+
+    The sources are compiled, not imported. Return the number of
+    functions that were analyzed.
+
+    """
+    from myhdl._util import _getSource
+    from myhdl._Waiter import _yieldNames
+    from myhdl._resolverefs import _attrRefs, _names
+    count = 0
+    for filename in _pyFiles(paths):
+        filename = os.path.abspath(filename)
+        try:
+            with open(filename, 'rb') as f:
+                module = compile(f.read(), filename, 'exec')
+        except (IOError, OSError, SyntaxError, ValueError) as e:
+            print("%s: skipped (%s)" % (filename, e), file=sys.stderr)
+            continue
+        codes = [module]
+        while codes:
+            code = codes.pop()
+            for const in code.co_consts:
+                if hasattr(const, 'co_code'):
+                    codes.append(const)
+            if code is module or code.co_name.startswith('<'):
+                continue
+            try:
+                src = _getSource(code)
+            except (IOError, OSError, SyntaxError):
+                continue
+            src.parse()
+            _names(src)
+            _yieldNames(src)
+            _attrRefs(src)
+            count += 1
+    flush()
+    return count
+
+
+def _pyFiles(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def clear():
+    """ Remove the cache files; return their number """
+    _files.clear()
+    if _dir is None or not os.path.isdir(_dir):
+        return 0
+    count = 0
+    for name in os.listdir(_dir):
+        if name.endswith(_SUFFIX):
+            os.remove(os.path.join(_dir, name))
+            count += 1
+    return count
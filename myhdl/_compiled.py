@@ -0,0 +1,567 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the compiled simulation backend.
+
+The conversion analyzer infers the signals, variables and types used in
+always_comb and always_seq blocks. From the analyzed tree, specialized
+Python source is generated for each block: signal values are read into
+locals, arithmetic is done on plain ints with explicit masking, and the
+results are written to the signals at the end of the call.
+
+Blocks that use constructs outside the supported subset are simulated
+with their original function.
+
+"""
+from __future__ import absolute_import
+
+import ast
+import re
+
+from myhdl import SimulationError, ConversionError
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._modbv import modbv
+from myhdl._concat import concat
+from myhdl._Signal import _Signal
+from myhdl._util import _isTupleOfInts
+from myhdl._always_comb import _AlwaysComb
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._simulator import _local
+
+
+class _error:
+    pass
+_error.Mismatch = "compiled block disagrees with its original function"
+
+
+class _Unsupported(Exception):
+    pass
+
+
+_binOpMap = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.FloorDiv: '//',
+    ast.Mod: '%',
+    ast.Pow: '**',
+    ast.LShift: '<<',
+    ast.RShift: '>>',
+    ast.BitAnd: '&',
+    ast.BitOr: '|',
+    ast.BitXor: '^',
+}
+
+_cmpOpMap = {
+    ast.Eq: '==',
+    ast.NotEq: '!=',
+    ast.Lt: '<',
+    ast.LtE: '<=',
+    ast.Gt: '>',
+    ast.GtE: '>=',
+}
+
+# names of the generated locals and closure variables
+_reservedName = re.compile(r"_(x|context|local|[svnc]\d+)$")
+
+
+class _BlockCompiler(ast.NodeVisitor):
+
+    """ Generate the source of the fast-path functions of an analyzed block """
+
+    reserved = _reservedName
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.sigs = []
+        self.names = []
+        self.consts = []
+        self.index = {}
+        self.reads = []
+        self.writes = []
+        self.lines = []
+        self.ind = ' ' * 8
+
+    def generic_visit(self, node):
+        raise _Unsupported(type(node).__name__)
+
+    def line(self, text):
+        self.lines.append(self.ind + text)
+
+    def indent(self):
+        self.ind += ' ' * 4
+
+    def dedent(self):
+        self.ind = self.ind[:-4]
+
+    def suite(self, body):
+        self.indent()
+        for stmt in body:
+            self.visit(stmt)
+        self.dedent()
+
+    # signals and names
+
+    def sigIndex(self, n):
+        sig = self.tree.sigdict[n]
+        if id(sig) not in self.index:
+            if sig._type not in (bool, intbv, integer_types):
+                raise _Unsupported("signal type")
+            self.index[id(sig)] = len(self.sigs)
+            self.sigs.append(sig)
+            self.names.append(n)
+        return self.index[id(sig)]
+
+    def readSig(self, n):
+        i = self.sigIndex(n)
+        if i not in self.reads:
+            self.reads.append(i)
+        return "_v%d" % i
+
+    def writeSig(self, n):
+        sig = self.tree.sigdict[n]
+        # the kernel drives clocks and shadow signals
+        if type(sig).next is not _Signal.next:
+            raise _Unsupported("signal driver")
+        i = self.sigIndex(n)
+        if i not in self.writes:
+            self.writes.append(i)
+        return "_n%d" % i
+
+    def local(self, n):
+        if self.reserved.match(n):
+            raise _Unsupported("variable name")
+        obj = self.tree.vardict[n]
+        if n in self.tree.nonlocaldict or \
+           not isinstance(obj, integer_types):
+            raise _Unsupported("variable type")
+        return n
+
+    def constant(self, node):
+        """ Return the value of a constant integer expression, or None """
+        if isinstance(node, ast.Num):
+            return node.n
+        names = [n.id for n in ast.walk(node) if isinstance(n, ast.Name)]
+        symdict = self.tree.symdict
+        for n in names:
+            if n in self.tree.vardict or n in self.tree.sigdict or \
+               not isinstance(symdict.get(n), integer_types):
+                return None
+        for n in ast.walk(node):
+            if not isinstance(n, (ast.Name, ast.Num, ast.BinOp, ast.UnaryOp,
+                                  ast.Load, ast.operator, ast.unaryop)):
+                return None
+        expr = ast.Expression(body=node)
+        ast.fix_missing_locations(expr)
+        return eval(compile(expr, '<string>', 'eval'), dict(symdict))
+
+    def sliceBounds(self, node):
+        """ Return the constant bounds of a slice """
+        sl = node.slice
+        if sl.step is not None:
+            raise _Unsupported("slice step")
+        i = j = 0
+        if sl.upper is not None:
+            j = self.constant(sl.upper)
+        if sl.lower is not None:
+            i = self.constant(sl.lower)
+            if i is None or j is None or not i > j >= 0:
+                raise _Unsupported("slice bounds")
+        elif j is None or j < 0:
+            raise _Unsupported("slice bounds")
+        return i, j
+
+    def width(self, node):
+        """ Return the bit width of an intbv-valued expression, or 0 """
+        if isinstance(node, ast.Name) and node.id in self.tree.sigdict:
+            sig = self.tree.sigdict[node.id]
+            if sig._type is intbv and sig._min is not None and sig._min >= 0:
+                return sig._nrbits
+        elif isinstance(node, ast.Subscript) and \
+             isinstance(node.slice, ast.Slice):
+            i, j = self.sliceBounds(node)
+            return i and i - j
+        elif isinstance(node, ast.Call) and \
+             getattr(node.func, 'obj', None) is concat:
+            return node.width
+        return 0
+
+    def concatWidth(self, node):
+        """ Return the bit width of a concat argument, or 0 """
+        if isinstance(node, ast.Name):
+            if node.id in self.tree.sigdict:
+                return self.tree.sigdict[node.id]._nrbits
+            if node.id in ('True', 'False'):
+                return 1
+        elif isinstance(node, ast.Subscript) and \
+             isinstance(node.slice, ast.Index) and not self.isRom(node.value):
+            return 1
+        elif type(node).__name__ == 'NameConstant':
+            return 1
+        return self.width(node)
+
+    def isRom(self, node):
+        if not isinstance(node, ast.Name):
+            return False
+        n = node.id
+        return n not in self.tree.vardict and n not in self.tree.sigdict and \
+               _isTupleOfInts(self.tree.symdict.get(n))
+
+    # statements
+
+    def visit_Module(self, node):
+        for stmt in node.body:
+            self.visit(stmt)
+
+    def visit_FunctionDef(self, node):
+        for stmt in node.body:
+            self.visit(stmt)
+        if not self.lines:
+            self.line("pass")
+
+    def visit_Assign(self, node):
+        target = node.targets[0]
+        value = self.visit(node.value)
+        if isinstance(target, ast.Attribute) and target.attr == 'next' and \
+           isinstance(target.value, ast.Name) and \
+           target.value.id in self.tree.sigdict:
+            self.line("%s = %s" % (self.writeSig(target.value.id), value))
+        elif isinstance(target, ast.Name):
+            self.line("%s = %s" % (self.local(target.id), value))
+        else:
+            raise _Unsupported("assignment target")
+
+    def visit_AugAssign(self, node):
+        if not isinstance(node.target, ast.Name) or \
+           type(node.op) not in _binOpMap:
+            raise _Unsupported("augmented assignment")
+        self.line("%s %s= %s" % (self.local(node.target.id),
+                                 _binOpMap[type(node.op)],
+                                 self.visit(node.value)))
+
+    def visit_If(self, node):
+        if node.ignore:
+            return
+        keyword = "if"
+        for test, suite in node.tests:
+            self.line("%s %s:" % (keyword, self.visit(test)))
+            self.suite(suite)
+            keyword = "elif"
+        if node.else_:
+            self.line("else:")
+            self.suite(node.else_)
+
+    def visit_For(self, node):
+        cf = node.iter
+        if node.orelse or getattr(cf.func, 'obj', None) is not range:
+            raise _Unsupported("for loop")
+        args = ", ".join([self.visit(arg) for arg in cf.args])
+        self.line("for %s in range(%s):" % (self.local(node.target.id), args))
+        self.suite(node.body)
+
+    def visit_Pass(self, node):
+        self.line("pass")
+
+    def visit_Break(self, node):
+        self.line("break")
+
+    def visit_Continue(self, node):
+        self.line("continue")
+
+    # expressions
+
+    def visit_Num(self, node):
+        return repr(node.n)
+
+    def visit_NameConstant(self, node):
+        if node.value not in (True, False):
+            raise _Unsupported("constant")
+        return repr(node.value)
+
+    def visit_Name(self, node):
+        n = node.id
+        if n in self.tree.vardict:
+            return self.local(n)
+        if n in self.tree.sigdict:
+            return self.readSig(n)
+        if n in ('True', 'False'):
+            return n
+        obj = self.tree.symdict.get(n)
+        if isinstance(obj, integer_types):
+            return repr(obj)
+        raise _Unsupported("name %s" % n)
+
+    def visit_Attribute(self, node):
+        if not isinstance(node.value, ast.Name) or \
+           node.value.id not in self.tree.sigdict:
+            raise _Unsupported("attribute")
+        sig = self.tree.sigdict[node.value.id]
+        if node.attr == 'val':
+            return self.readSig(node.value.id)
+        if node.attr in ('min', 'max'):
+            return repr(getattr(sig, node.attr))
+        raise _Unsupported("attribute %s" % node.attr)
+
+    def visit_BinOp(self, node):
+        if type(node.op) not in _binOpMap:
+            raise _Unsupported("operator")
+        return "(%s %s %s)" % (self.visit(node.left),
+                               _binOpMap[type(node.op)],
+                               self.visit(node.right))
+
+    def visit_BoolOp(self, node):
+        op = " and " if isinstance(node.op, ast.And) else " or "
+        return "(%s)" % op.join([self.visit(v) for v in node.values])
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        op = node.op
+        if isinstance(op, ast.Not):
+            return "(not %s)" % operand
+        if isinstance(op, ast.USub):
+            return "(-%s)" % operand
+        if isinstance(op, ast.UAdd):
+            return "(+%s)" % operand
+        # unsigned intbv's invert within their bit width
+        w = self.width(node.operand)
+        if w:
+            return "(~%s & %d)" % (operand, (1 << w) - 1)
+        return "(~%s)" % operand
+
+    def visit_Compare(self, node):
+        op = node.ops[0]
+        if type(op) not in _cmpOpMap:
+            raise _Unsupported("comparison")
+        return "(%s %s %s)" % (self.visit(node.left), _cmpOpMap[type(op)],
+                               self.visit(node.comparators[0]))
+
+    def visit_IfExp(self, node):
+        return "(%s if %s else %s)" % (self.visit(node.body),
+                                       self.visit(node.test),
+                                       self.visit(node.orelse))
+
+    def visit_Subscript(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            raise _Unsupported("subscript assignment")
+        if isinstance(node.slice, ast.Index):
+            index = self.visit(node.slice.value)
+            if self.isRom(node.value):
+                self.consts.append(self.tree.symdict[node.value.id])
+                return self.romIndex(len(self.consts) - 1, index)
+            return "(%s >> %s & 1 != 0)" % (self.visit(node.value), index)
+        if not isinstance(node.slice, ast.Slice):
+            raise _Unsupported("subscript")
+        value = self.visit(node.value)
+        i, j = self.sliceBounds(node)
+        if not i:
+            return "(%s >> %d)" % (value, j)
+        if not j:
+            return "(%s & %d)" % (value, (1 << i) - 1)
+        return "((%s & %d) >> %d)" % (value, (1 << i) - 1, j)
+
+    def romIndex(self, i, index):
+        return "_c%d[%s]" % (i, index)
+
+    def visit_Call(self, node):
+        f = getattr(node.func, 'obj', None)
+        if node.keywords:
+            raise _Unsupported("keyword arguments")
+        if f is int or f is bool or f is abs:
+            args = ", ".join([self.visit(arg) for arg in node.args])
+            return "%s(%s)" % (f.__name__, args)
+        if f is len and len(node.args) == 1:
+            arg = node.args[0]
+            if isinstance(arg, ast.Name) and arg.id in self.tree.sigdict:
+                return repr(self.tree.sigdict[arg.id]._nrbits)
+        if f is concat and len(node.args) > 1:
+            base = node.args[0]
+            expr = self.visit(base)
+            width = 0
+            for arg in node.args[1:]:
+                value = self.visit(arg)
+                w = self.concatWidth(arg)
+                if not w:
+                    raise _Unsupported("concat argument")
+                expr = "(%s << %d | %s & %d)" % (expr, w, value, (1 << w) - 1)
+                width += w
+            basewidth = self.concatWidth(base)
+            node.width = basewidth and basewidth + width
+            return expr
+        raise _Unsupported("call")
+
+    # code generation
+
+    def build(self, name):
+        """ Return the fast-path function and the compute function """
+        head = []
+        for i in self.reads:
+            if self.sigs[i]._type is intbv:
+                head.append("        _v%d = _s%d._val._val" % (i, i))
+            else:
+                head.append("        _v%d = _s%d._val" % (i, i))
+        for i in self.writes:
+            head.append("        _n%d = None" % i)
+        update = []
+        if self.writes:
+            update.append("        _context = _local.context")
+        for i in self.writes:
+            sig = self.sigs[i]
+            update.append("        if _n%d is not None:" % i)
+            if sig._type is intbv:
+                update.append("            _x = _s%d._next" % i)
+                update.append("            _x._val = _n%d" % i)
+                checks = []
+                if sig._min is not None:
+                    checks.append("_n%d < %d" % (i, sig._min))
+                if sig._max is not None:
+                    checks.append("_n%d >= %d" % (i, sig._max))
+                if checks:
+                    update.append("            if %s:" % " or ".join(checks))
+                    update.append("                _x._handleBounds()")
+            elif sig._type is bool:
+                update.append("            if _n%d not in (0, 1):" % i)
+                update.append("                _s%d._setNextBool(_n%d)" % (i, i))
+                update.append("            _s%d._next = _n%d" % (i, i))
+            else:
+                update.append("            _s%d._next = _n%d" % (i, i))
+            update.append("            if _s%d._pending:" % i)
+            update.append("                _context.nrDuplicates += 1")
+            update.append("            else:")
+            update.append("                _s%d._pending = True" % i)
+            update.append("                _context.siglist.append(_s%d)" % i)
+        args = ["_local"] + ["_s%d" % i for i in range(len(self.sigs))] + \
+               ["_c%d" % i for i in range(len(self.consts))]
+        result = "".join(["_n%d, " % i for i in self.writes])
+        src = ["def _make(%s):" % ", ".join(args),
+               "    def _run():"]
+        src += head + self.lines + update
+        src += ["    def _compute():"]
+        src += head + self.lines
+        src += ["        return (%s)" % result,
+                "    return _run, _compute",
+                ""]
+        source = "\n".join(src)
+        namespace = {}
+        code = compile(source, "<compiled %s>" % name, 'exec')
+        exec(code, namespace)
+        func, compute = namespace['_make'](_local, *(self.sigs + self.consts))
+        func.__name__ = name
+        func.source = source
+        return func, compute
+
+
+def _analyzeBlocks(blocks):
+    """ Return the analyzed trees of blocks, and the analysis errors.
+
+    For a block that the analyzer rejects, the tree is None and the
+    error is the exception. Otherwise, the error is None.
+
+    """
+    from myhdl.conversion._analyze import _analyzeGens
+    # the analyzer marks signals as driven and read for conversion
+    marks = [(s, s._driven, s._read) for s in _local.context.signals]
+    for s, driven, read in marks:
+        s._driven = None
+    trees = []
+    errors = []
+    try:
+        for b in blocks:
+            try:
+                trees.append(_analyzeGens([b], {})[0])
+                errors.append(None)
+            except (ConversionError, AssertionError, IOError) as e:
+                trees.append(None)
+                errors.append(e)
+    finally:
+        for s, driven, read in marks:
+            s._driven = driven
+            s._read = read
+    return trees, errors
+
+
+def _compileBlock(block, tree):
+    """ Return the fast-path functions of a block, or None """
+    if tree is None:
+        return None
+    v = _BlockCompiler(tree)
+    try:
+        v.visit(tree)
+        func, compute = v.build(block.func.__name__)
+    except _Unsupported:
+        return None
+    outputs = [(v.names[i], v.sigs[i]) for i in v.writes]
+    return func, compute, outputs
+
+
+def _nextVal(sig):
+    if sig._type is intbv:
+        return sig._next._val
+    return sig._next
+
+
+def _normalize(sig, val):
+    lo, hi = sig._min, sig._max
+    if isinstance(sig._init, modbv) and lo is not None:
+        if val < lo or val >= hi:
+            val = (val - lo) % (hi - lo) + lo
+    return val
+
+
+def _checker(func, compute, outputs):
+    """ Return a function that runs func and checks it against compute """
+    name = func.__name__
+    def check():
+        expected = compute()
+        func()
+        for (n, sig), val in zip(outputs, expected):
+            if val is None:
+                continue
+            val = _normalize(sig, val)
+            if val != _nextVal(sig):
+                raise SimulationError(_error.Mismatch,
+                                      "%s: %s.next is %r, compiled %r" %
+                                      (name, n, _nextVal(sig), val))
+    return check
+
+
+def _compileBlocks(arglist, check=False):
+    """ Replace the functions of always_comb and always_seq blocks.
+
+    With check set, the original function is run as well, and its
+    results are compared with those of the compiled function.
+    Return a list of (block, original function) pairs.
+
+    """
+    blocks = [arg for arg in arglist
+              if isinstance(arg, (_AlwaysComb, _AlwaysSeq))]
+    if not blocks:
+        return []
+    trees, errors = _analyzeBlocks(blocks)
+    originals = []
+    for b, tree in zip(blocks, trees):
+        c = _compileBlock(b, tree)
+        if c is None:
+            continue
+        func, compute, outputs = c
+        originals.append((b, b.func))
+        if check:
+            func = _checker(b.func, compute, outputs)
+        b.func = func
+    return originals
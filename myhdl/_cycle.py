@@ -0,0 +1,287 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the cycle-based simulation engine.
+
+The engine simulates synchronous designs with a single Clock. Time
+advances from clock edge to clock edge, without a future event queue.
+At each edge, the always_seq blocks and the always blocks on that edge
+are called directly, and testbench generators that wait for it are
+resumed. Then all pending signals are updated, and the combinational
+logic is settled, in levelized order where possible.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+from types import GeneratorType
+
+from myhdl import SimulationError, StopSimulation, _SuspendSimulation
+from myhdl._Waiter import _Waiter, _StaticWaiter, _EdgeWaiter
+from myhdl._levelize import _evaluate
+from myhdl._instance import _Instantiator
+from myhdl._always import _Always
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._util import _printExcInfo
+
+
+class _error:
+    pass
+_error.NrOfClocks = "cycle mode requires a single Clock"
+_error.Cosim = "cycle mode does not support cosimulation"
+_error.ArgType = "cycle mode does not support waiter arguments"
+_error.ClockEdge = "process is not sensitive to an edge of the Clock"
+_error.Delay = "process with delays not supported in cycle mode"
+_error.WaitClause = "generator should only wait for edges of the Clock"
+_error.DelayedSignal = "signals with a delay not supported in cycle mode"
+
+
+class _CallWaiter(_Waiter):
+
+    """ Waiter that calls a function, for asynchronous resets """
+
+    __slots__ = ('call', 'hasRun', 'subscribed', 'triggered')
+
+    def __init__(self, call):
+        self.call = call
+        self.hasRun = 0
+        self.subscribed = True
+        self.triggered = False
+
+    def next(self, waiters, actives, exc):
+        self.triggered = False
+        self.call()
+
+
+def _seqCall(block):
+    """ Return a function that executes an always_seq block once """
+    func = block.func
+    reset = block.reset
+    if reset is None:
+        return func
+    reset_sigs = block.reset_sigs
+    reset_vars = block.reset_vars
+    def call():
+        if reset == reset.active:
+            reset_sigs()
+            reset_vars()
+        else:
+            func()
+    return call
+
+
+def _usedClocks(clocks, arglist):
+    """ Return the clocks in the sensitivity lists of the blocks """
+    edges = set()
+    for arg in arglist:
+        for e in getattr(arg, 'senslist', ()):
+            edges.add(id(e))
+    used = []
+    for clock in clocks:
+        if id(clock) in edges or clock._watched and \
+           (id(clock._posedgeWaiters) in edges or
+            id(clock._negedgeWaiters) in edges):
+            used.append(clock)
+    return used
+
+
+class _CycleEngine(object):
+
+    def __init__(self, context, arglist, clocks, waiters, cosim):
+        if cosim:
+            raise SimulationError(_error.Cosim)
+        self.context = context
+        # the clock that the blocks are sensitive to, or else the one
+        # that was elaborated with the design
+        clocks = _usedClocks(context.clocks, arglist) or clocks
+        if len(clocks) != 1:
+            raise SimulationError(_error.NrOfClocks, str(len(clocks)))
+        clock = self.clock = clocks[0]
+        def edgeIndex(edge):
+            # waiter lists compare by value, so check for identity
+            if edge is clock._posedgeWaiters:
+                return 0
+            if edge is clock._negedgeWaiters:
+                return 1
+            return None
+        owners = {}
+        for arg in arglist:
+            if isinstance(arg, GeneratorType):
+                owners[id(arg)] = arg
+            elif isinstance(arg, _Instantiator):
+                owners[id(arg.gen)] = arg
+            elif isinstance(arg, _Waiter):
+                raise SimulationError(_error.ArgType)
+        # functions and generators to run on each clock edge
+        self.calls = [[], []]
+        self.gens = [[], []]
+        self.waiters = []
+        self.resetWaiters = []
+        for w in waiters:
+            arg = owners.get(id(w.generator))
+            if isinstance(arg, _AlwaysSeq):
+                i = edgeIndex(arg.senslist[0])
+                if i is None:
+                    raise SimulationError(_error.ClockEdge, arg.func.__name__)
+                call = _seqCall(arg)
+                self.calls[i].append(call)
+                if len(arg.senslist) > 1:
+                    # asynchronous reset
+                    self.resetWaiters.append((arg.senslist[1],
+                                              _CallWaiter(call)))
+            elif isinstance(arg, _Always) and len(arg.senslist) == 1 and \
+                 edgeIndex(arg.senslist[0]) is not None:
+                self.calls[edgeIndex(arg.senslist[0])].append(arg.func)
+            elif isinstance(arg, _Always):
+                if not isinstance(w, _StaticWaiter):
+                    raise SimulationError(_error.Delay, arg.func.__name__)
+                self.waiters.append(w)
+            elif type(arg) is _Instantiator or isinstance(arg, GeneratorType):
+                if type(w) is not _EdgeWaiter:
+                    raise SimulationError(_error.WaitClause,
+                                          w.generator.__name__)
+                self.waiters.append(_GeneratorWaiter(self, w.generator))
+            else:
+                # always_comb blocks and shadow signals
+                self.waiters.append(w)
+        self.started = False
+        # the first edge is a rising edge at the clock phase
+        self.nextTime = clock._phase
+        self.rising = True
+
+    def _settle(self, waiters):
+        """ Run waiters and update signals until the design is stable """
+        context = self.context
+        siglist = context.siglist
+        actives = {}
+        exc = []
+        while 1:
+            while waiters:
+                try:
+                    waiters.pop().next(waiters, actives, exc)
+                except StopIteration:
+                    continue
+            if context.levelQueue:
+                _evaluate(context, waiters)
+            if siglist:
+                context.nrDeltas += 1
+                context.nrUpdates += len(siglist)
+                for s in siglist:
+                    s._pending = False
+                    waiters.extend(s._update())
+                del siglist[:]
+            elif not waiters:
+                break
+        for wl in actives.values():
+            wl.purge()
+        if context.futureEvents:
+            raise SimulationError(_error.DelayedSignal)
+
+    def _start(self):
+        for edge, w in self.resetWaiters:
+            edge.subscribe(w)
+        self.started = True
+        self._settle(self.waiters[:])
+
+    def _edge(self):
+        clock = self.clock
+        i = 0 if self.rising else 1
+        clock._next = self.rising
+        waiters = clock._update()
+        for call in self.calls[i]:
+            call()
+        gens = self.gens[i]
+        if gens:
+            self.gens[i] = []
+            for g in gens:
+                try:
+                    g.resume()
+                except StopIteration:
+                    pass
+        self._settle(waiters)
+        if self.rising:
+            self.nextTime += clock._high
+        else:
+            self.nextTime += clock._low
+        self.rising = not self.rising
+
+    def run(self, sim, duration, quiet):
+        context = self.context
+        maxTime = None
+        if duration:
+            maxTime = context.time + duration
+        tracing = context.tracing
+        tracefile = context.tf
+        try:
+            if not self.started:
+                self._start()
+            while 1:
+                t = self.nextTime
+                if maxTime is not None and t > maxTime:
+                    context.time = maxTime
+                    raise _SuspendSimulation(
+                        "Simulated %s timesteps" % duration)
+                context.time = t
+                if tracing:
+                    tracefile.timestep(t)
+                self._edge()
+
+        except _SuspendSimulation:
+            if not quiet:
+                _printExcInfo()
+            if tracing:
+                tracefile.flush()
+            return 1
+
+        except StopSimulation:
+            if not quiet:
+                _printExcInfo()
+            sim._finalize()
+            return 0
+
+        except Exception:
+            if tracing:
+                tracefile.abort()
+            sim._finalize()
+            raise
+
+
+class _GeneratorWaiter(_Waiter):
+
+    """ Waiter for a testbench generator that waits for clock edges """
+
+    __slots__ = ('engine', 'generator')
+
+    def __init__(self, engine, generator):
+        self.engine = engine
+        self.generator = generator
+
+    def next(self, waiters, actives, exc):
+        self.resume()
+
+    def resume(self):
+        engine = self.engine
+        clause = next(self.generator)
+        clock = engine.clock
+        if clause is clock._posedgeWaiters:
+            engine.gens[0].append(self)
+        elif clause is clock._negedgeWaiters:
+            engine.gens[1].append(self)
+        else:
+            raise SimulationError(_error.WaitClause, repr(clause))
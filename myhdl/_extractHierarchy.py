@@ -33,12 +33,24 @@ import linecache
 
 from myhdl import ExtractHierarchyError, ToVerilogError, ToVHDLError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._Memory import Memory
 from myhdl._util import _isGenFunc, _flatten, _genfunc
 from myhdl._misc import _isGenSeq
+from myhdl._Cosimulation import Cosimulation
+from myhdl._instance import _Instantiator
 from myhdl._resolverefs import _resolveRefs
+from myhdl._simulator import _pending
 
 
-_profileFunc = None
+# sys.monitoring is used when available (Python 3.12+), so that only the
+# returns of generator sequences go through Python code; otherwise a
+# profile hook is used, that ignores all other events
+_monitoring = getattr(sys, 'monitoring', None)
+if _monitoring is not None:
+    _TOOL = _monitoring.PROFILER_ID
+
+# the types of the generator sequences that a block can return
+_genSeqTypes = (_Instantiator, Cosimulation, list, tuple, set)
 
 class _error:
     pass
@@ -64,16 +76,30 @@ class _Instance(object):
 _memInfoMap = {}
 
 class _MemInfo(object):
-    __slots__ = ['mem', 'name', 'elObj', 'depth', '_used', '_driven', '_read']
+    __slots__ = ['obj', '_mem', 'name', 'elObj', 'depth', '_used', '_driven',
+                 '_read']
     def __init__(self, mem):
-        self.mem = mem
+        self.obj = mem
         self.name = None
         self.depth = len(mem)
-        self.elObj = mem[0]
+        if isinstance(mem, Memory):
+            # the element signals of a Memory are made on first use
+            self._mem = None
+            self.elObj = _Signal(mem._item(mem._init._val))
+        else:
+            self._mem = mem
+            self.elObj = mem[0]
         self._used = False
         self._driven = None
         self._read = None
 
+    # the list of element signals
+    def _get_mem(self):
+        if self._mem is None:
+            self._mem = self.obj._signals()
+        return self._mem
+    mem = property(_get_mem)
+
 
 def _getMemInfo(mem):
     return _memInfoMap[id(mem)]
@@ -218,7 +244,6 @@ class _HierExtr(object):
 
     def __init__(self, name, dut, *args, **kwargs):
 
-        global _profileFunc
         _memInfoMap.clear()
         for hdl in _userCodeMap:
             _userCodeMap[hdl].clear()
@@ -227,15 +252,14 @@ class _HierExtr(object):
                           'always', '_always_decorator', \
                           'instances', \
                           'processes', 'posedge', 'negedge')
-        self.skip = 0
         self.hierarchy = hierarchy = []
         self.absnames = absnames = {}
         self.level = 0
 
-        _profileFunc = self.extractor
-        sys.setprofile(_profileFunc)
-        _top = dut(*args, **kwargs)
-        sys.setprofile(None)
+        if _monitoring is not None and _monitoring.get_tool(_TOOL) is None:
+            _top = self._monitor(dut, args, kwargs)
+        else:
+            _top = self._profile(dut, args, kwargs)
         if not hierarchy:
             raise ExtractHierarchyError(_error.NoInstances)
 
@@ -265,104 +289,154 @@ class _HierExtr(object):
                         sni =  "%s_%s" % (sn, i)
                         names[id(soi)] = sni
                         absnames[id(soi)] = "%s_%s_%s" % (tn, sn, i)
+        # the names are used by the simulation of the design
+        _pending().hierarchy = self
+
+
+    def _monitor(self, dut, args, kwargs):
+        """ Call dut with a sys.monitoring hook on returns.
+
+        Only the returns of generator sequences are handled; the hook is
+        disabled for the other return locations.
 
+        """
+        stop = currentframe()
 
-    def extractor(self, frame, event, arg):
-        if event == "call":
-
-            funcname = frame.f_code.co_name
-            # skip certain functions
-            if funcname in self.skipNames:
-                self.skip +=1
-            if not self.skip:
-                self.level += 1
-
-        elif event == "return":
-
-            funcname = frame.f_code.co_name
-            func = frame.f_globals.get(funcname)
-            if func is None:
-                # Didn't find a func in the global space, try the local "self"
-                # argument and see if it has a method called *funcname*
-                obj = frame.f_locals.get('self')
-                if hasattr(obj, funcname):
-                    func = getattr(obj, funcname)
-
-            if not self.skip:
-                isGenSeq = _isGenSeq(arg)
-                if isGenSeq:
-                    specs = {}
-                    for hdl in _userCodeMap:
-                        spec = "__%s__" % hdl
-                        if spec in frame.f_locals and frame.f_locals[spec]:
-                            specs[spec] = frame.f_locals[spec]
-                        spec = "%s_code" % hdl
-                        if func and hasattr(func, spec) and getattr(func, spec):
-                            specs[spec] = getattr(func, spec)
-                        spec = "%s_instance" % hdl
-                        if func and hasattr(func, spec) and getattr(func, spec):
-                            specs[spec] = getattr(func, spec)
-                    if specs:
-                        _addUserCode(specs, arg, funcname, func, frame)
-                # building hierarchy only makes sense if there are generators
-                if isGenSeq and arg:
-                    sigdict = {}
-                    memdict = {}
-                    argdict = {}
-                    if func:
-                        arglist = inspect.getargspec(func).args
-                    else:
-                        arglist = []
-                    symdict = frame.f_globals.copy()
-                    symdict.update(frame.f_locals)
-                    cellvars = []
-                    cellvars.extend(frame.f_code.co_cellvars)
-
-                    #All nested functions will be in co_consts
-                    if func:
-                        local_gens = []
-                        consts = func.__code__.co_consts
-                        for item in _flatten(arg):
-                            genfunc = _genfunc(item)
-                            if genfunc.__code__ in consts:
-                                local_gens.append(item)
-                        if local_gens:
-                            objlist = _resolveRefs(symdict, local_gens)
-                            cellvars.extend(objlist)
-                    #for dict in (frame.f_globals, frame.f_locals):
-                    for n, v in symdict.items():
-                        # extract signals and memories
-                        # also keep track of whether they are used in generators
-                        # only include objects that are used in generators
-##                             if not n in cellvars:
-##                                 continue
-                        if isinstance(v, _Signal):
-                            sigdict[n] = v
-                            if n in cellvars:
-                                v._markUsed()
-                        if _isListOfSigs(v):
-                            m = _makeMemInfo(v)
-                            memdict[n] = m
-                            if n in cellvars:
-                                m._used = True
-                        # save any other variable in argdict
-                        if (n in arglist) and (n not in sigdict) and (n not in memdict):
-                            argdict[n] = v
-
-                    subs = []
-                    for n, sub in frame.f_locals.items():
-                        for elt in _inferArgs(arg):
-                            if elt is sub:
-                                subs.append((n, sub))
-
-
-                    inst = _Instance(self.level, arg, subs, sigdict, memdict, func, argdict)
-                    self.hierarchy.append(inst)
-
-                self.level -= 1
-
-            if funcname in self.skipNames:
-                self.skip -= 1
+        def returned(code, offset, arg):
+            if not _isGenSeq(arg):
+                return _monitoring.DISABLE
+            self._returned(sys._getframe(1), arg, stop)
+
+        _monitoring.use_tool_id(_TOOL, "myhdl")
+        try:
+            _monitoring.register_callback(_TOOL, _monitoring.events.PY_RETURN,
+                                          returned)
+            _monitoring.set_events(_TOOL, _monitoring.events.PY_RETURN)
+            return dut(*args, **kwargs)
+        finally:
+            _monitoring.set_events(_TOOL, 0)
+            _monitoring.register_callback(_TOOL, _monitoring.events.PY_RETURN,
+                                          None)
+            _monitoring.free_tool_id(_TOOL)
+            _monitoring.restart_events()
+
+    def _profile(self, dut, args, kwargs):
+        """ Call dut with a profile hook.
+
+        The hook is called for every event, but only handles the returns
+        of generator sequences; it does no bookkeeping for the others.
+
+        """
+        stop = currentframe()
+
+        def extractor(frame, event, arg):
+            if event == "return" and isinstance(arg, _genSeqTypes) and \
+               _isGenSeq(arg):
+                self._returned(frame, arg, stop)
+
+        sys.setprofile(extractor)
+        try:
+            return dut(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+    def _returned(self, frame, arg, stop):
+        """ Handle the return of generator sequence arg from frame
+
+        The level and the skipping are derived from the frames on the
+        stack, up to the stop frame that called the top-level function.
+
+        """
+        skipNames = self.skipNames
+        level = 0
+        f = frame
+        while f is not stop:
+            # other threads are monitored too
+            if f is None or f.f_code.co_name in skipNames:
+                return
+            level += 1
+            f = f.f_back
+        self.level = level
+        self._record(frame, arg)
+
+    def _record(self, frame, arg):
+        """ Record the return of generator sequence arg from frame """
+        funcname = frame.f_code.co_name
+        func = frame.f_globals.get(funcname)
+        if func is None:
+            # Didn't find a func in the global space, try the local "self"
+            # argument and see if it has a method called *funcname*
+            obj = frame.f_locals.get('self')
+            if hasattr(obj, funcname):
+                func = getattr(obj, funcname)
+
+        specs = {}
+        for hdl in _userCodeMap:
+            spec = "__%s__" % hdl
+            if spec in frame.f_locals and frame.f_locals[spec]:
+                specs[spec] = frame.f_locals[spec]
+            spec = "%s_code" % hdl
+            if func and hasattr(func, spec) and getattr(func, spec):
+                specs[spec] = getattr(func, spec)
+            spec = "%s_instance" % hdl
+            if func and hasattr(func, spec) and getattr(func, spec):
+                specs[spec] = getattr(func, spec)
+        if specs:
+            _addUserCode(specs, arg, funcname, func, frame)
+        # building hierarchy only makes sense if there are generators
+        if not arg:
+            return
+        sigdict = {}
+        memdict = {}
+        argdict = {}
+        if func:
+            arglist = inspect.getargspec(func).args
+        else:
+            arglist = []
+        symdict = frame.f_globals.copy()
+        symdict.update(frame.f_locals)
+        cellvars = []
+        cellvars.extend(frame.f_code.co_cellvars)
+
+        #All nested functions will be in co_consts
+        if func:
+            local_gens = []
+            consts = func.__code__.co_consts
+            for item in _flatten(arg):
+                genfunc = _genfunc(item)
+                if genfunc.__code__ in consts:
+                    local_gens.append(item)
+            if local_gens:
+                objlist = _resolveRefs(symdict, local_gens)
+                cellvars.extend(objlist)
+        #for dict in (frame.f_globals, frame.f_locals):
+        for n, v in symdict.items():
+            # extract signals and memories
+            # also keep track of whether they are used in generators
+            # only include objects that are used in generators
+##             if not n in cellvars:
+##                 continue
+            if isinstance(v, _Signal):
+                sigdict[n] = v
+                if n in cellvars:
+                    v._markUsed()
+            if _isListOfSigs(v) or isinstance(v, Memory):
+                m = _makeMemInfo(v)
+                memdict[n] = m
+                if n in cellvars:
+                    m._used = True
+            # save any other variable in argdict
+            if (n in arglist) and (n not in sigdict) and (n not in memdict):
+                argdict[n] = v
+
+        subs = []
+        for n, sub in frame.f_locals.items():
+            for elt in _inferArgs(arg):
+                if elt is sub:
+                    subs.append((n, sub))
+
+        inst = _Instance(self.level, arg, subs, sigdict, memdict, func, argdict)
+        self.hierarchy.append(inst)
 
 
 def _inferArgs(arg):
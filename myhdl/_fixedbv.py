@@ -0,0 +1,164 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the fixed-width bit vector classes.
+
+uintbv and sintbv are unsigned and signed intbv's with a bit width,
+umodbv and smodbv are the wrapping modbv counterparts. The range is
+fixed by the bit width, so that the bounds are handled with a single
+shift or mask, precomputed at construction.
+
+"""
+from __future__ import absolute_import
+
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._modbv import modbv
+
+class _error:
+    pass
+_error.NrBits = "%s bit width should be a positive integer"
+_error.Val = "%s constructor arg should be int or intbv"
+
+
+class _FixedWidth(object):
+
+    """ Common methods of the fixed-width bit vectors """
+
+    __slots__ = ()
+
+    _signed = False
+    _unsized = intbv
+
+    def __init__(self, val, nrbits):
+        if not isinstance(nrbits, integer_types) or nrbits < 1:
+            raise ValueError(_error.NrBits % type(self).__name__)
+        if isinstance(val, intbv):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError(_error.Val % type(self).__name__)
+        self._nrbits = nrbits
+        self._mask = (1 << nrbits) - 1
+        if self._signed:
+            self._max = 1 << (nrbits - 1)
+            self._min = -self._max
+        else:
+            self._max = 1 << nrbits
+            self._min = 0
+        self._val = val
+        self._handleBounds()
+
+    def _hasFullRange(self):
+        return True
+
+    def __repr__(self):
+        return "%s(%r, %s)" % (type(self).__name__, self._val, self._nrbits)
+
+    # copy methods, without going through the constructor
+    def __copy__(self):
+        c = object.__new__(type(self))
+        c._val = self._val
+        c._min = self._min
+        c._max = self._max
+        c._nrbits = self._nrbits
+        c._mask = self._mask
+        return c
+
+    def __deepcopy__(self, visit):
+        return self.__copy__()
+
+    # the bitwise operators of intbv return unsized values of the same
+    # type: return the unsized intbv or modbv instead
+    def __rshift__(self, other):
+        return self._unsized(self._val) >> other
+
+    def __and__(self, other):
+        return self._unsized(self._val) & other
+
+    def __rand__(self, other):
+        return other & self._unsized(self._val)
+
+    def __or__(self, other):
+        return self._unsized(self._val) | other
+
+    def __ror__(self, other):
+        return other | self._unsized(self._val)
+
+    def __xor__(self, other):
+        return self._unsized(self._val) ^ other
+
+    def __rxor__(self, other):
+        return other ^ self._unsized(self._val)
+
+    def __invert__(self):
+        c = self.__copy__()
+        if self._signed:
+            c._val = ~self._val
+        else:
+            c._val = ~self._val & self._mask
+        return c
+
+
+class uintbv(_FixedWidth, intbv):
+
+    """ Unsigned intbv with a fixed bit width """
+
+    __slots__ = ('_mask',)
+
+    def _handleBounds(self):
+        if self._val >> self._nrbits:
+            intbv._handleBounds(self)
+
+
+class sintbv(_FixedWidth, intbv):
+
+    """ Signed intbv with a fixed bit width """
+
+    __slots__ = ('_mask',)
+
+    _signed = True
+
+    def _handleBounds(self):
+        if (self._val + self._max) >> self._nrbits:
+            intbv._handleBounds(self)
+
+
+class umodbv(_FixedWidth, modbv):
+
+    """ Unsigned modbv with a fixed bit width """
+
+    __slots__ = ('_mask',)
+
+    _unsized = modbv
+
+    def _handleBounds(self):
+        self._val &= self._mask
+
+
+class smodbv(_FixedWidth, modbv):
+
+    """ Signed modbv with a fixed bit width """
+
+    __slots__ = ('_mask',)
+
+    _signed = True
+    _unsized = modbv
+
+    def _handleBounds(self):
+        self._val = ((self._val + self._max) & self._mask) - self._max
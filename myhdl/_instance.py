@@ -26,6 +26,7 @@ from types import FunctionType
 from myhdl import InstanceError
 from myhdl._util import _isGenFunc
 from myhdl._Waiter import _inferWaiter
+from myhdl._simulator import _pending
 
 class _error:
     pass
@@ -48,4 +49,6 @@ class _Instantiator(object):
         self.genfunc = genFunc
         self.gen = genFunc()
         self.waiter = _inferWaiter(self.gen)
+        # the scope in which the instance is elaborated
+        self._context = _pending()
         
@@ -24,11 +24,12 @@ import operator
 
 from myhdl._compat import long, integer_types, string_types, builtins
 from myhdl._bin import bin
+from myhdl._bitslice import bitslice
 
 
 
 class intbv(object):
-    #__slots__ = ('_val', '_min', '_max', '_nrbits', '_handleBounds')
+    __slots__ = ('_val', '_min', '_max', '_nrbits')
     
     def __init__(self, val=0, min=None, max=None, _nrbits=0):
         if _nrbits:
@@ -142,6 +143,8 @@ class intbv(object):
                       "            i, j == %s, %s" % (i, j))
             res = intbv((self._val & (long(1) << i)-1) >> j, _nrbits=i-j)
             return res
+        elif isinstance(key, bitslice):
+            return _field(intbv, self._val, key)
         else:
             i = int(key)
             res = bool((self._val >> i) & 0x1)
@@ -177,6 +180,13 @@ class intbv(object):
             self._val &= ~mask
             self._val |= (val << j)
             self._handleBounds()
+        elif isinstance(key, bitslice):
+            if val > key._mask or val < ~key._mask:
+                raise ValueError("intbv[s] = v abs(v) too large\n" \
+                      "            s, v == %r, %s" % (key, val))
+            self._val &= ~key._fieldmask
+            self._val |= (val << key._j)
+            self._handleBounds()
         else:
             i = int(key)
             if val == 1:
@@ -520,3 +530,18 @@ class intbv(object):
         retVal = self._val
 
       return retVal
+
+
+def _field(cls, val, key):
+    """ Return the value of bitslice key of val, as x[i:j] does.
+
+    The result is an instance of cls with the bit width of the slice. It
+    is made without the checks of the constructor, as it is in bounds.
+
+    """
+    res = cls.__new__(cls)
+    res._val = (val >> key._j) & key._mask
+    res._min = 0
+    res._max = key._max
+    res._nrbits = key._nrbits
+    return res
@@ -0,0 +1,160 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that levelizes networks of always_comb blocks.
+
+The always_comb blocks of a simulation that are not part of a
+combinational cycle are ranked in topological order. The blocks that
+are triggered in a delta cycle are evaluated in rank order, and their
+outputs are updated immediately. An acyclic network therefore settles
+in a single pass, instead of rippling through a delta cycle per logic
+level. Blocks in or downstream of a cycle remain event-driven.
+
+"""
+from __future__ import absolute_import
+
+from heapq import heappush, heappop
+
+from myhdl._Signal import _Signal
+from myhdl._Memory import Memory
+from myhdl._Waiter import _StaticWaiter
+from myhdl._always_comb import _AlwaysComb
+from myhdl._simulator import _local
+
+
+class _LevelWaiter(_StaticWaiter):
+
+    """ Waiter for a levelized always_comb block.
+
+    When triggered, it is queued by rank instead of run right away.
+    It replaces the waiter of the block, and is reused by the later
+    simulations of the block. In a simulation in which the block is not
+    levelized, its rank is None and it runs right away.
+
+    """
+
+    __slots__ = ('senslist', 'outputs', 'rank')
+
+    def __init__(self, generator, senslist, outputs, rank):
+        _StaticWaiter.__init__(self, generator)
+        self.senslist = senslist
+        self.outputs = outputs
+        self.rank = rank
+
+    def next(self, waiters, actives, exc):
+        if self.rank is None:
+            return _StaticWaiter.next(self, waiters, actives, exc)
+        if not self.subscribed:
+            for s in self.senslist:
+                s._eventWaiters.subscribe(self)
+            self.subscribed = True
+            self.triggered = True
+        context = _local.context
+        heappush(context.levelQueue, (self.rank, next(context.seqno), self))
+
+    def evaluate(self, context, waiters):
+        """ Run the block and update its outputs; return the nr of updates """
+        self.triggered = False
+        next(self.generator)
+        queue = context.levelQueue
+        nr = 0
+        for s in self.outputs:
+            if s._pending:
+                s._pending = False
+                nr += 1
+                for w in s._update():
+                    if isinstance(w, _LevelWaiter) and w.rank is not None:
+                        heappush(queue, (w.rank, next(context.seqno), w))
+                    else:
+                        waiters.append(w)
+        return nr
+
+
+def _evaluate(context, waiters):
+    """ Evaluate the triggered levelized blocks in rank order.
+
+    Waiters of other processes that are triggered by the outputs
+    are appended to waiters.
+
+    """
+    queue = context.levelQueue
+    nr = 0
+    while queue:
+        nr += heappop(queue)[2].evaluate(context, waiters)
+    if nr:
+        context.nrUpdates += nr
+        # outputs updated in the pass are no longer pending
+        siglist = context.siglist
+        siglist[:] = [s for s in siglist if s._pending]
+
+
+def _outputSigs(block):
+    sigs = []
+    for n in block.outputs:
+        obj = block.symdict[n]
+        if isinstance(obj, (_Signal, Memory)):
+            sigs.append(obj)
+        else: # list of sigs
+            sigs.extend(obj)
+    return sigs
+
+
+def _levelize(arglist, waiters):
+    """ Replace the waiters of acyclic always_comb blocks in waiters """
+    blocks = [arg for arg in arglist if isinstance(arg, _AlwaysComb)]
+    if not blocks:
+        return
+    readers = {}
+    for i, b in enumerate(blocks):
+        for s in b.senslist:
+            readers.setdefault(id(s), set()).add(i)
+    outputs = [_outputSigs(b) for b in blocks]
+    successors = []
+    indegree = [0] * len(blocks)
+    for sigs in outputs:
+        succ = set()
+        for s in sigs:
+            succ.update(readers.get(id(s), ()))
+        for j in succ:
+            indegree[j] += 1
+        successors.append(succ)
+    # Kahn's algorithm: blocks in or downstream of a cycle are never ready
+    ready = [i for i, d in enumerate(indegree) if d == 0]
+    order = []
+    while ready:
+        i = ready.pop()
+        order.append(i)
+        for j in successors[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                ready.append(j)
+    for b in blocks:
+        if isinstance(b.waiter, _LevelWaiter):
+            b.waiter.rank = None
+    levelized = {}
+    for rank, i in enumerate(order):
+        b = blocks[i]
+        w = b.waiter
+        if isinstance(w, _LevelWaiter):
+            w.outputs = outputs[i]
+            w.rank = rank
+        else:
+            b.waiter = levelized[id(w)] = _LevelWaiter(b.gen, b.senslist,
+                                                       outputs[i], rank)
+    waiters[:] = [levelized.get(id(w), w) for w in waiters]
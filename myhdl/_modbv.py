@@ -20,7 +20,9 @@
 """ Module with the modbv class """
 from __future__ import absolute_import
 
-from ._intbv import intbv
+from ._compat import long
+from ._intbv import intbv, _field
+from ._bitslice import bitslice
 
 class modbv(intbv):
     __slots__ = []
@@ -55,6 +57,8 @@ class modbv(intbv):
                       "            i, j == %s, %s" % (i, j))
             res = modbv((self._val & (long(1) << i)-1) >> j, _nrbits=i-j)
             return res
+        elif isinstance(key, bitslice):
+            return _field(modbv, self._val, key)
         else:
             i = int(key)
             res = bool((self._val >> i) & 0x1)
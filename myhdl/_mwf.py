@@ -0,0 +1,413 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the MyHDL waveform format.
+
+An mwf file is a compact binary alternative to a vcd file. The value
+changes are written in compressed blocks. Each block starts with the
+values of all signals, so that it can be decoded on its own. An index
+at the end of the file holds the time range and the file offset of each
+block, and a directory of the scopes and signals.
+
+The layout of a file is:
+
+    magic | compression | block ... | index | index offset, length | magic
+
+The compression is a byte: 0 for none, 1 for zlib and 2 for lzma. The
+index is a compressed JSON object. A block is a compressed sequence
+of records, that start with an unsigned LEB128 tag:
+
+    0, t        -- time t, as a delta with the previous time in the block
+    1, v ...    -- the values of all signals
+    n + 2, v    -- a change of signal n
+
+A value of a bit or vector signal is an unsigned LEB128 integer, with
+negative values in two's complement. Other values are an LEB128 length,
+followed by the UTF-8 encoded string that a vcd file would hold.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import json
+import struct
+import time
+import zlib
+from bisect import bisect_right
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+from myhdl import __version__
+from myhdl._intbv import intbv
+from myhdl._traceSignals import _TraceWriter
+
+_MAGIC = b"MYHDLWF1"
+_TRAILER = struct.Struct("<QQ")
+_COMPRESSIONS = (None, 'zlib', 'lzma')
+
+class _error:
+    pass
+_error.Compression = "Unsupported compression: %s"
+_error.Format = "Not an mwf file: %s"
+
+_TIME, _VALUES, _CHANGE = 0, 1, 2
+_BIT, _VEC, _STR = 'bit', 'vec', 'str'
+
+
+def _compressor(compression):
+    if compression == 'zlib':
+        return zlib.compress, zlib.decompress
+    if compression == 'lzma' and lzma is not None:
+        return lzma.compress, lzma.decompress
+    if compression is None:
+        return bytes, bytes
+    raise ValueError(_error.Compression % compression)
+
+
+def _putint(buf, n):
+    while n > 0x7f:
+        buf.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _getint(data, i):
+    n = shift = 0
+    while 1:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def _kind(s):
+    if isinstance(s._val, bool):
+        return _BIT
+    if isinstance(s._val, intbv) and s._nrbits:
+        return _VEC
+    return _STR
+
+
+class _MwfWriter(_TraceWriter):
+
+    """ Writer of an mwf file.
+
+    The mwf format has no unknown values: while a trace is stopped, the
+    file holds the values that the signals had when it was stopped.
+
+    """
+
+    def __init__(self, f, timescale, scopes, siglist, compression='zlib',
+                 blocksize=1 << 18):
+        _TraceWriter.__init__(self, siglist)
+        self.f = f
+        self.compress = _compressor(compression)[0]
+        self.kinds = []
+        self.masks = []
+        for i, s in enumerate(siglist):
+            s._code = i
+            self.kinds.append(_kind(s))
+            self.masks.append((1 << s._nrbits) - 1)
+        self.blocksize = blocksize
+        self.blocks = []
+        self.buf = bytearray()
+        self.tlast = self.tblock = 0
+        self.index = dict(version=1, date=time.asctime(),
+                          creator="MyHDL %s" % __version__,
+                          timescale=timescale,
+                          compression=compression,
+                          signals=[dict(kind=k, width=s._nrbits)
+                                   for k, s in zip(self.kinds, siglist)],
+                          scopes=[dict(level=level, name=name,
+                                       vars=[(n, s._code) for n, s in vars])
+                                  for level, name, vars in scopes],
+                          blocks=self.blocks)
+        f.write(_MAGIC)
+        f.write(struct.pack("<B", _COMPRESSIONS.index(compression)))
+        self.end = f.tell()
+        self._startBlock(0)
+
+    def _putval(self, s):
+        buf = self.buf
+        kind = self.kinds[s._code]
+        val = s._val
+        if kind is _VEC:
+            _putint(buf, val._val & self.masks[s._code])
+        elif kind is _BIT:
+            _putint(buf, int(val))
+        else:
+            if isinstance(val, intbv):
+                val = hex(val)
+            val = str(val).encode('utf-8')
+            _putint(buf, len(val))
+            buf.extend(val)
+
+    def _startBlock(self, t):
+        self.tblock = self.tlast = t
+        _putint(self.buf, _TIME)
+        _putint(self.buf, t)
+        _putint(self.buf, _VALUES)
+        for s in self.siglist:
+            self._putval(s)
+
+    def _writeBlock(self):
+        data = self.compress(bytes(self.buf))
+        self.f.seek(self.end)
+        self.f.write(data)
+        self.blocks.append((self.tblock, self.tlast, self.end, len(data)))
+        self.end += len(data)
+        self.buf = bytearray()
+
+    def _dumpChanges(self):
+        buf = self.buf
+        for s in self.changed:
+            s._tracing = 1
+            _putint(buf, s._code + _CHANGE)
+            self._putval(s)
+        del self.changed[:]
+
+    def _writeTime(self, t):
+        if len(self.buf) > self.blocksize:
+            self._writeBlock()
+            self._startBlock(t)
+        else:
+            _putint(self.buf, _TIME)
+            _putint(self.buf, t - self.tlast)
+            self.tlast = t
+
+    def _writeStart(self):
+        if self.tlast != self.t:
+            self._writeTime(self.t)
+
+    def _writeStop(self):
+        pass
+
+    def flush(self):
+        """ Write the pending changes and the index """
+        self._dumpChanges()
+        self._writeBlock()
+        self._startBlock(self.tlast)
+        index = self.compress(json.dumps(self.index).encode('utf-8'))
+        f = self.f
+        f.seek(self.end)
+        f.write(index)
+        f.write(_TRAILER.pack(self.end, len(index)))
+        f.write(_MAGIC)
+        f.truncate()
+        f.flush()
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+
+class MwfFile(object):
+
+    """ Reader of an mwf file.
+
+    Only the blocks that hold the requested time window are read. The
+    values of bit and vector signals are integers, the other values are
+    strings. Signals are identified by their index in the 'signals'
+    attribute.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(_error.Format % path)
+            code = struct.unpack("<B", f.read(1))[0]
+            f.seek(-_TRAILER.size - len(_MAGIC), 2)
+            offset, length = _TRAILER.unpack(f.read(_TRAILER.size))
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(_error.Format % path)
+            f.seek(offset)
+            data = f.read(length)
+        self.decompress = _compressor(_COMPRESSIONS[code])[1]
+        index = json.loads(self.decompress(data).decode('utf-8'))
+        self.timescale = index['timescale']
+        self.date = index['date']
+        self.creator = index['creator']
+        self.signals = index['signals']
+        self.scopes = index['scopes']
+        self.blocks = [tuple(b) for b in index['blocks']]
+        self._starts = [b[0] for b in self.blocks]
+
+    def _readBlock(self, i):
+        t0, t1, offset, length = self.blocks[i]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return bytearray(self.decompress(f.read(length)))
+
+    def _decode(self, data):
+        """ Generate the records of a block as (time, index, value) tuples.
+
+        The first records hold the values at the start of the block, with
+        index -1 for the time record before them.
+
+        """
+        signals = self.signals
+        i, n, t = 0, len(data), 0
+        while i < n:
+            tag, i = _getint(data, i)
+            if tag == _TIME:
+                dt, i = _getint(data, i)
+                t += dt
+                yield t, -1, None
+            elif tag == _VALUES:
+                for k, sig in enumerate(signals):
+                    val, i = self._getval(data, i, sig)
+                    yield t, k, val
+            else:
+                k = tag - _CHANGE
+                val, i = self._getval(data, i, signals[k])
+                yield t, k, val
+
+    def _getval(self, data, i, sig):
+        val, i = _getint(data, i)
+        if sig['kind'] == _STR:
+            s = bytes(data[i:i+val]).decode('utf-8')
+            return s, i + val
+        return val, i
+
+    def _records(self, t0):
+        """ Generate the records from the block that holds time t0 """
+        first = max(bisect_right(self._starts, t0) - 1, 0)
+        for b in range(first, len(self.blocks)):
+            for rec in self._decode(self._readBlock(b)):
+                yield rec
+
+    def values(self, t):
+        """ Return the values of all signals at time t """
+        vals = [None] * len(self.signals)
+        for rt, k, val in self._records(t):
+            if rt > t:
+                break
+            if k >= 0:
+                vals[k] = val
+        return vals
+
+    def changes(self, t0=0, t1=None):
+        """ Generate the values at time t0 and the changes up to time t1.
+
+        The results are (time, index, value) tuples, starting with the
+        value of each signal at time t0, followed by the changes after
+        t0 up to t1 included.
+
+        """
+        vals = [None] * len(self.signals)
+        started = False
+        for t, k, val in self._records(t0):
+            if t > t0 and not started:
+                started = True
+                for i, v in enumerate(vals):
+                    yield t0, i, v
+            if t1 is not None and t > t1:
+                return
+            if k < 0 or vals[k] == val:
+                continue
+            vals[k] = val
+            if started:
+                yield t, k, val
+        if not started:
+            for i, v in enumerate(vals):
+                yield t0, i, v
+
+
+def _vcdValue(sig, code, val):
+    if sig['kind'] == _BIT:
+        return "%d%s\n" % (val, code)
+    if sig['kind'] == _VEC:
+        return "b%s %s\n" % (format(val, 'b').zfill(sig['width']), code)
+    return "s%s %s\n" % (val, code)
+
+
+def mwf2vcd(path, vcdpath=None):
+    """ Convert an mwf file to a vcd file.
+
+    path -- path of the mwf file
+    vcdpath -- path of the vcd file (default: path with a .vcd extension)
+
+    """
+    from myhdl._traceSignals import _namecode
+    mwf = MwfFile(path)
+    if vcdpath is None:
+        vcdpath = path.rsplit('.', 1)[0] + ".vcd"
+    signals = mwf.signals
+    codes = [_namecode(i) for i in range(len(signals))]
+    with open(vcdpath, 'w') as f:
+        print("$date", file=f)
+        print("    %s" % mwf.date, file=f)
+        print("$end", file=f)
+        print("$version", file=f)
+        print("    %s" % mwf.creator, file=f)
+        print("$end", file=f)
+        print("$timescale", file=f)
+        print("    %s" % mwf.timescale, file=f)
+        print("$end", file=f)
+        print(file=f)
+        curlevel = 0
+        for scope in mwf.scopes:
+            level = scope['level']
+            delta = curlevel - level
+            curlevel = level
+            if delta >= 0:
+                for i in range(delta + 1):
+                    print("$upscope $end", file=f)
+            print("$scope module %s $end" % scope['name'], file=f)
+            for n, k in scope['vars']:
+                sig = signals[k]
+                if sig['kind'] == _STR:
+                    print("$var real 1 %s %s $end" % (codes[k], n), file=f)
+                else:
+                    print("$var reg %s %s %s $end" % (sig['width'], codes[k], n),
+                          file=f)
+        for i in range(curlevel):
+            print("$upscope $end", file=f)
+        print(file=f)
+        print("$enddefinitions $end", file=f)
+        print("$dumpvars", file=f)
+        vals = [None] * len(signals)
+        t = 0
+        # the values at the start of the first block are the initial values
+        nrInitial = len(signals)
+        for b in range(len(mwf.blocks)):
+            for rt, k, val in mwf._decode(mwf._readBlock(b)):
+                if nrInitial == 0:
+                    print("$end", file=f)
+                    nrInitial = -1
+                if k < 0:
+                    if rt != t:
+                        t = rt
+                        print("#%s" % t, file=f)
+                    continue
+                if nrInitial > 0:
+                    nrInitial -= 1
+                if vals[k] != val:
+                    vals[k] = val
+                    f.write(_vcdValue(signals[k], codes[k], val))
+        if nrInitial >= 0:
+            print("$end", file=f)
+    return vcdpath
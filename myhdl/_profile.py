@@ -0,0 +1,255 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Simulation profiler.
+
+The profiler counts the activations and measures the run time of each
+process, counts the updates of each signal, and records the number of
+delta cycles and events of each timestep. It is set up when the
+Simulation is constructed, by wrapping the generators of the waiters and
+the list of pending signals. The run loop itself is the same with and
+without profiling.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+from timeit import default_timer as _timer
+
+from myhdl._compat import string_types
+from myhdl._instance import _Instantiator
+
+
+class _Process(object):
+
+    """ Generator wrapper that counts and times the activations """
+
+    __slots__ = ('name', 'generator', 'profile', 'count', 'time')
+
+    def __init__(self, name, generator, profile):
+        self.name = name
+        self.generator = generator
+        self.profile = profile
+        self.count = 0
+        self.time = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        profile = self.profile
+        if profile.context.time != profile.now:
+            profile._timestep()
+        profile.events += 1
+        self.count += 1
+        start = _timer()
+        try:
+            return next(self.generator)
+        finally:
+            self.time += _timer() - start
+
+    next = __next__
+
+
+class _SignalList(list):
+
+    """ List of pending signals that counts the signal updates.
+
+    A signal is appended once per delta cycle in which it is updated.
+
+    """
+
+    def __init__(self, profile):
+        list.__init__(self)
+        self.profile = profile
+
+    def append(self, sig):
+        profile = self.profile
+        if profile.context.time != profile.now:
+            profile._timestep()
+        profile.events += 1
+        updates = profile.updates
+        if id(sig) in updates:
+            updates[id(sig)][1] += 1
+        else:
+            updates[id(sig)] = [sig, 1]
+        list.append(self, sig)
+
+
+class _Profile(object):
+
+    """ Profile of a simulation.
+
+    Methods:
+    stats -- return the profile data as a dict
+    report -- print a report sorted by run time and update count
+    dump -- write the profile data in JSON format
+
+    """
+
+    def __init__(self, context, arglist, waiters):
+        self.context = context
+        self.now = context.time
+        self.mark = context.nrDeltas
+        self.events = 0
+        self.timesteps = []
+        self.updates = {}
+        self.processes = []
+        self.names = _names(context.hierarchy, arglist)
+        self._wrapped = []
+        used = set()
+        for w in waiters:
+            gen = getattr(w, 'generator', None)
+            if gen is None:
+                continue
+            name = self.names.get(id(gen)) or \
+                   getattr(gen, '__name__', 'process')
+            p = _Process(_unique(name, used), gen, self)
+            self.processes.append(p)
+            self._wrapped.append((w, gen))
+            w.generator = p
+        context.siglist = _SignalList(self)
+
+    def _timestep(self):
+        context = self.context
+        self.timesteps.append((self.now, context.nrDeltas - self.mark,
+                               self.events))
+        self.now = context.time
+        self.mark = context.nrDeltas
+        self.events = 0
+
+    def _restore(self):
+        """ Put back the original generators """
+        for w, gen in self._wrapped:
+            w.generator = gen
+        self._wrapped = []
+
+    def stats(self):
+        """ Return the profile data as a dict.
+
+        processes -- list of dicts with the name, the number of activations
+                     and the run time in seconds, by decreasing run time
+        signals -- list of dicts with the name and the number of updates,
+                   by decreasing number of updates
+        timesteps -- list of dicts with the time, the number of delta
+                     cycles and the number of events, by increasing time
+
+        """
+        processes = [dict(name=p.name, activations=p.count, time=p.time)
+                     for p in self.processes]
+        processes.sort(key=lambda d: (-d['time'], d['name']))
+        signals = []
+        used = set()
+        for sig, count in self.updates.values():
+            name = self.names.get(id(sig)) or getattr(sig, '_name', None) \
+                   or 'signal'
+            signals.append(dict(name=_unique(name, used), updates=count))
+        signals.sort(key=lambda d: (-d['updates'], d['name']))
+        timesteps = list(self.timesteps)
+        if self.events:
+            timesteps.append((self.now, self.context.nrDeltas - self.mark,
+                              self.events))
+        timesteps = [dict(time=t, deltas=d, events=e)
+                     for t, d, e in timesteps]
+        return dict(processes=processes, signals=signals,
+                    timesteps=timesteps)
+
+    def report(self, f=None, limit=20):
+        """ Print a report of the profile.
+
+        f -- file to print to (default: sys.stdout)
+        limit -- maximum number of processes and signals to print
+
+        """
+        if f is None:
+            f = sys.stdout
+        stats = self.stats()
+        processes = stats['processes']
+        print("%d processes, %.3f s" %
+              (len(processes), sum(d['time'] for d in processes)), file=f)
+        print("%12s %10s %14s  %s" %
+              ("activations", "time (s)", "per call (us)", "process"), file=f)
+        for d in processes[:limit]:
+            n = d['activations']
+            percall = 1e6 * d['time'] / n if n else 0.0
+            print("%12d %10.3f %14.2f  %s" %
+                  (n, d['time'], percall, d['name']), file=f)
+        print(file=f)
+        signals = stats['signals']
+        print("%d signals, %d updates" %
+              (len(signals), sum(d['updates'] for d in signals)), file=f)
+        print("%12s  %s" % ("updates", "signal"), file=f)
+        for d in signals[:limit]:
+            print("%12d  %s" % (d['updates'], d['name']), file=f)
+        print(file=f)
+        timesteps = stats['timesteps']
+        print("%d timesteps" % len(timesteps), file=f)
+        for key in ('deltas', 'events'):
+            if not timesteps:
+                break
+            top = max(timesteps, key=lambda d: d[key])
+            total = sum(d[key] for d in timesteps)
+            print("%12s per timestep: mean %.2f, max %d at time %s" %
+                  (key, float(total) / len(timesteps), top[key], top['time']),
+                  file=f)
+
+    def dump(self, f):
+        """ Write the profile data in JSON format to a file or path """
+        import json
+        if isinstance(f, string_types):
+            with open(f, 'w') as fobj:
+                json.dump(self.stats(), fobj, indent=1, sort_keys=True)
+        else:
+            json.dump(self.stats(), f, indent=1, sort_keys=True)
+
+
+def _names(hierarchy, arglist):
+    """ Map the ids of generators and signals to names.
+
+    The hierarchical names are used if the hierarchy of the design was
+    extracted, the function names otherwise.
+
+    """
+    names = {}
+    absnames = {}
+    if hierarchy is not None:
+        absnames = hierarchy.absnames
+    for arg in arglist:
+        if isinstance(arg, _Instantiator):
+            func = getattr(arg, 'func', arg.genfunc)
+            names[id(arg.gen)] = absnames.get(id(arg), func.__name__)
+        elif id(arg) in absnames:
+            names[id(arg)] = absnames[id(arg)]
+    if hierarchy is not None:
+        for inst in hierarchy.hierarchy:
+            prefix = absnames.get(id(inst.obj), inst.name)
+            for n, s in sorted(inst.sigdict.items()):
+                names.setdefault(id(s), "%s_%s" % (prefix, n))
+    return names
+
+
+def _unique(name, used):
+    unique = name
+    i = 1
+    while unique in used:
+        unique = "%s_%d" % (name, i)
+        i += 1
+    used.add(unique)
+    return unique
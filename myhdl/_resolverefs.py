@@ -2,30 +2,138 @@ from __future__ import absolute_import
 import ast
 from types import FunctionType
 
-from myhdl._util import _flatten, _makeAST, _genfunc
+from myhdl._util import _flatten, _getSource, _genfunc
 from myhdl._enum import EnumType
 from myhdl._Signal import SignalType
 
 
-class Data():
-    pass
+_reserved = ('next',  'posedge',  'negedge',  'max',  'min',  'val',  'signed')
 
 
 def _resolveRefs(symdict, arg):
     gens = _flatten(arg)
-    data = Data()
-    data.symdict = symdict
-    v = _AttrRefTransformer(data)
+    objlist = []
     for gen in gens:
         func = _genfunc(gen)
-        tree = _makeAST(func)
+        _bindAttrRefs(_getSource(func), symdict, objlist)
+    return objlist
+
+
+def _attrRefs(src):
+    """ Return the attribute references of a source.
+
+    The references are in the order in which _AttrRefTransformer handles
+    them. Each is a tuple (value, attr), where value is the name of the
+    object, the index of the reference that it is an attribute of, or
+    None if it is another expression.
+
+    """
+    refs = src.results.get('attrRefs')
+    if refs is None:
+        v = _AttrRefCollector()
+        v.visit(src.parse())
+        refs = src.results['attrRefs'] = tuple(v.refs)
+    return refs
+
+
+def _bindAttrRefs(src, symdict, objlist):
+    """ Bind the attribute references of a source as _AttrRefTransformer
+    does, without an AST.
+
+    The objects are added to symdict, and their new names to objlist.
+    Return a tuple with the new name of each reference, or None if it is
+    not replaced by a name.
+
+    """
+    names = []
+    for value, attr in _attrRefs(src):
+        if isinstance(value, int):
+            value = names[value]
+        name = None
+        if value is not None and attr not in _reserved:
+            obj = symdict[value]
+            if isinstance(obj, (EnumType, FunctionType)):
+                pass
+            elif isinstance(obj, SignalType) and hasattr(SignalType, attr):
+                pass
+            else:
+                attrobj = getattr(obj, attr)
+                name = value + '.' + attr
+                if name not in symdict:
+                    symdict[name] = attrobj
+                    objlist.append(name)
+        names.append(name)
+    return tuple(names)
+
+
+def _inferSigNames(block, visitorClass, isSig):
+    """ Infer the input and output signal names of an always block.
+
+    The attribute references of block.func are bound in block.symdict, and
+    block.objlist is set to their new names. The visitor only runs once for
+    each code object and pattern of names that refer to signals; the
+    pattern decides the result. Return the sets of input and output names.
+
+    """
+    src = _getSource(block.func)
+    block.objlist = []
+    refs = _bindAttrRefs(src, block.symdict, block.objlist)
+    names = _names(src)
+    symdict = block.symdict
+    pattern = [n in symdict and isSig(symdict[n]) for n in names]
+    pattern.extend([isSig(symdict[n]) for n in refs if n is not None])
+    key = ("%s.%s" % (visitorClass.__module__, visitorClass.__name__),
+           refs, tuple(pattern))
+    result = src.results.get(key)
+    if result is None:
+        tree = src.parse()
+        data = _Data()
+        data.symdict = symdict
+        _AttrRefTransformer(data).visit(tree)
+        v = visitorClass(symdict)
         v.visit(tree)
-    return data.objlist
+        result = src.results[key] = (frozenset(v.inputs), frozenset(v.outputs))
+    return set(result[0]), set(result[1])
+
 
-#TODO: Refactor this into two separate nodetransformers, since _resolveRefs
-#needs only the names, not the objects
+def _names(src):
+    """ Return the names in a source """
+    names = src.results.get('names')
+    if names is None:
+        names = set()
+        for node in ast.walk(src.parse()):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+        names = src.results['names'] = tuple(sorted(names))
+    return names
 
 
+class _Data(object):
+    pass
+
+
+class _AttrRefCollector(ast.NodeVisitor):
+
+    """ Collect the attribute references for _bindAttrRefs """
+
+    def __init__(self):
+        self.refs = []
+        self.index = {}
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        value = node.value
+        if isinstance(value, ast.Name):
+            value = value.id
+        else:
+            value = self.index.get(id(value))
+        self.index[id(node)] = len(self.refs)
+        self.refs.append((value, node.attr))
+
+    def visit_FunctionDef(self, node):
+        for n in _flatten(node.body, node.args):
+            self.visit(n)
+
 class _AttrRefTransformer(ast.NodeTransformer):
     def __init__(self, data):
         self.data = data
@@ -35,8 +143,7 @@ class _AttrRefTransformer(ast.NodeTransformer):
     def visit_Attribute(self, node):
         self.generic_visit(node)
 
-        reserved = ('next',  'posedge',  'negedge',  'max',  'min',  'val',  'signed')
-        if node.attr in reserved:
+        if node.attr in _reserved:
             return node
 
         #Don't handle subscripts for now.
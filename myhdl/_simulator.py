@@ -22,17 +22,192 @@
 This module provides the following objects:
 now -- function that returns the current simulation time
 
+The state of a simulation is kept in a _SimContext object. Each thread
+has a current context, that of the simulation that was last constructed
+or run in it, and a pending context. Signals, clocks, processes and
+traces that are elaborated in a thread are bound to its pending context,
+which is the scope of the elaboration. A Simulation claims the scopes
+of its processes, with the signals registered in them.
+
 """
 
+import threading
+import weakref
+from heapq import heappush
+from itertools import count
+
+
+class _WeakList(object):
+
+    """ Weakly referenced objects, in the order in which they were added.
+
+    References to dead objects are pruned as the list grows, so that its
+    size stays proportional to the number of live objects.
+
+    """
+
+    __slots__ = ('refs', 'limit')
+
+    def __init__(self):
+        self.refs = []
+        self.limit = 64
+
+    def append(self, obj):
+        refs = self.refs
+        refs.append(weakref.ref(obj))
+        if len(refs) > self.limit:
+            refs[:] = [r for r in refs if r() is not None]
+            self.limit = max(64, 2 * len(refs))
+
+    def __iter__(self):
+        for ref in self.refs[:]:
+            obj = ref()
+            if obj is not None:
+                yield obj
+
+
+# all live contexts that can hold signals for another simulation
+_contexts = _WeakList()
+
+
+class _SimContext(object):
+
+    """ State of a single simulation """
+
+    def __init__(self):
+        self.siglist = []      # signals with a pending update
+        self.futureEvents = []
+        self.levelQueue = []   # levelized always_comb blocks, by rank
+        self.clocks = _WeakList()
+        self.time = 0
+        self.cosim = 0
+        self.tracing = 0
+        self.tf = None
+        # the hierarchy extracted when the design was elaborated, if any
+        self.hierarchy = None
+        # delta cycle counters: deltas, signal updates, and redundant update
+        # requests that were dropped because the signal was already pending
+        self.nrDeltas = 0
+        self.nrUpdates = 0
+        self.nrDuplicates = 0
+        # sequence numbers keep events scheduled for the same time in order
+        self.seqno = count()
+        self.simulation = None
+        # the signals and memories registered in this context
+        self.signals = _WeakList()
+        _contexts.append(self)
+
+    def register(self, sig):
+        """ Register a signal or a memory, and bind it to this context """
+        sig._context = self
+        self.signals.append(sig)
+
+    def owned(self):
+        """ Return the live signals bound to this context, once each
+
+        A signal that was bound to another context and back is listed
+        twice.
+
+        """
+        seen = set()
+        sigs = []
+        for s in self.signals:
+            if s._context is self and id(s) not in seen:
+                seen.add(id(s))
+                sigs.append(s)
+        return sigs
+
+    def expired(self):
+        """ Return True if the simulation has finished or was discarded """
+        if self.simulation is None:
+            return False
+        simulation = self.simulation()
+        return simulation is None or simulation._finished
+
+    def handOver(self, context):
+        """ Register the signals of this context in another context """
+        kept = _WeakList()
+        for s in self.signals:
+            # signals that were bound to another context since are skipped
+            if s._context is not self:
+                continue
+            # a traced signal stays with the live context that writes its
+            # trace
+            if getattr(s, '_tracing', 0) and self.tracing and \
+               not context.tracing and not self.expired():
+                kept.append(s)
+            else:
+                context.register(s)
+        self.signals = kept
+
+    def schedule(self, t, event):
+        """ Schedule an event (a _Waiter or a _SignalWrap) at time t """
+        heappush(self.futureEvents, (t, next(self.seqno), event))
+
+
+class _ThreadState(threading.local):
+
+    def __init__(self):
+        self.pending = self.context = _SimContext()
+
+_local = _ThreadState()
+
+
+def _claim(simulation, scopes):
+    """ Bind a context to a Simulation, and make it current
+
+    scopes are the contexts in which the processes of the simulation
+    were elaborated. The simulation claims the first of them that is
+    still unclaimed, or a new context, and takes over the signals of the
+    others. It also takes over the signals of the simulations that have
+    finished or were discarded, as it may reuse them. The signals of
+    other live simulations are left alone.
+
+    """
+    context = None
+    for c in scopes:
+        if c.simulation is None:
+            context = c
+            break
+    if context is None:
+        context = _SimContext()
+    context.simulation = weakref.ref(simulation)
+    live = _WeakList()
+    for c in _contexts:
+        if c is context:
+            live.append(c)
+        elif c.expired():
+            c.handOver(context)
+        else:
+            if c in scopes:
+                c.handOver(context)
+            live.append(c)
+    _contexts.refs = live.refs
+    if context is _local.pending:
+        _local.pending = _SimContext()
+    _local.context = context
+    return context
+
+def _activate(context):
+    """ Make context the current context of this thread """
+    _local.context = context
+
+def _context():
+    """ Return the current simulation context of this thread """
+    return _local.context
+
+def _pending():
+    """ Return the context to which elaborated objects are bound """
+    context = _local.pending
+    if context.simulation is not None:
+        # claimed by a simulation in another thread
+        context = _local.pending = _SimContext()
+    return context
 
-_signals = []
-_siglist = []
-_futureEvents = []
-_time = 0
-_cosim = 0
-_tracing = 0
-_tf = None
+def _schedule(t, event):
+    """ Schedule an event in the current simulation context """
+    _local.context.schedule(t, event)
 
 def now():
     """ Return the current simulation time """
-    return _time
+    return _local.context.time
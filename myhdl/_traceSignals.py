@@ -26,15 +26,19 @@ from __future__ import print_function
 
 
 import sys
+from fnmatch import fnmatchcase
 from inspect import currentframe, getouterframes
 import time
 import os
 path = os.path
-import shutil
+from collections import deque
 
 from myhdl import _simulator, __version__, EnumItemType
 from myhdl._extractHierarchy import _HierExtr
+from myhdl._intbv import intbv
+from myhdl._Memory import Memory
 from myhdl import TraceSignalsError
+from myhdl._compat import integer_types, string_types
 
 _tracing = 0
 _profileFunc = None
@@ -44,19 +48,38 @@ class _error:
 _error.TopLevelName = "result of traceSignals call should be assigned to a top level name"
 _error.ArgType = "traceSignals first argument should be a classic function"
 _error.MultipleTraces = "Cannot trace multiple instances simultaneously"
+_error.Format = "Unsupported trace format"
+_error.Compression = "Unsupported compression"
+_error.Window = "Trace window should be a (start, stop) tuple"
+_error.RingSize = "Flight recorder size should be a positive integer"
+_error.RingFormat = "A flight recorder trace is written in the vcd format"
 
 
 class _TraceSignalsClass(object):
 
     __slot__ = ("name",
                 "timescale",
-                "tracelists"
+                "tracelists",
+                "format",
+                "compression",
+                "scopes",
+                "signals",
+                "depth",
+                "window",
+                "ringsize"
                 )
 
     def __init__(self):
         self.name = None
         self.timescale = "1ns"
         self.tracelists = True
+        self.format = 'vcd'
+        self.compression = 'zlib'
+        self.scopes = None
+        self.signals = None
+        self.depth = None
+        self.window = None
+        self.ringsize = None
 
     def __call__(self, dut, *args, **kwargs):
         global _tracing
@@ -70,8 +93,31 @@ class _TraceSignalsClass(object):
             raise TraceSignalsError("Cannot use traceSignals while converting to Verilog")
         if not callable(dut):
             raise TraceSignalsError(_error.ArgType, "got %s" % type(dut))
-        if _simulator._tracing:
+        context = _simulator._pending()
+        if context.tracing:
             raise TraceSignalsError(_error.MultipleTraces)
+        if self.format not in ('vcd', 'mwf'):
+            raise TraceSignalsError(_error.Format, repr(self.format))
+        if self.window is not None:
+            try:
+                start, stop = self.window
+            except (TypeError, ValueError):
+                raise TraceSignalsError(_error.Window, repr(self.window))
+            if stop is not None and stop < start:
+                raise TraceSignalsError(_error.Window, repr(self.window))
+        if self.ringsize is not None:
+            if not isinstance(self.ringsize, integer_types) or \
+               self.ringsize <= 0:
+                raise TraceSignalsError(_error.RingSize, repr(self.ringsize))
+            if self.format != 'vcd':
+                raise TraceSignalsError(_error.RingFormat)
+        if self.format == 'mwf':
+            from myhdl._mwf import _compressor
+            try:
+                _compressor(self.compression)
+            except ValueError:
+                raise TraceSignalsError(_error.Compression,
+                                        repr(self.compression))
 
         _tracing = 1
         try:
@@ -82,16 +128,30 @@ class _TraceSignalsClass(object):
             if name is None:
                 raise TraceSignalsError(_error.TopLevelName)
             h = _HierExtr(name, dut, *args, **kwargs)
-            vcdpath = name + ".vcd"
-            if path.exists(vcdpath):
-                backup = vcdpath + '.' + str(path.getmtime(vcdpath))
-                shutil.copyfile(vcdpath, backup)
-                os.remove(vcdpath)
-            vcdfile = open(vcdpath, 'w')
-            _simulator._tracing = 1
-            _simulator._tf = vcdfile
-            _writeVcdHeader(vcdfile, self.timescale)
-            _writeVcdSigs(vcdfile, h.hierarchy, self.tracelists)
+            tracepath = name + "." + self.format
+            if path.exists(tracepath):
+                backup = tracepath + '.' + str(path.getmtime(tracepath))
+                import shutil
+                shutil.copyfile(tracepath, backup)
+                os.remove(tracepath)
+            scopes, siglist = _traceScopes(h.hierarchy, self.tracelists,
+                                           self.scopes, self.signals,
+                                           self.depth)
+            if self.ringsize is not None:
+                tracefile = _RingWriter(tracepath, self.timescale, scopes,
+                                        siglist, self.ringsize)
+            elif self.format == 'mwf':
+                from myhdl._mwf import _MwfWriter
+                tracefile = _MwfWriter(open(tracepath, 'wb'), self.timescale,
+                                       scopes, siglist, self.compression)
+            else:
+                tracefile = _VcdWriter(open(tracepath, 'w'), siglist)
+                _writeVcdHeader(tracefile, self.timescale)
+                _writeVcdSigs(tracefile, scopes, siglist)
+            if self.window is not None:
+                tracefile.setWindow(*self.window)
+            context.tracing = 1
+            context.tf = tracefile
         finally:
             _tracing = 0
 
@@ -100,6 +160,324 @@ class _TraceSignalsClass(object):
 traceSignals = _TraceSignalsClass()
 
 
+def start_trace():
+    """ Restart the signal tracing of the running simulation.
+
+    The values of all traced signals are written at the current time.
+    Without signal tracing, the call has no effect.
+
+    """
+    context = _simulator._context()
+    if context.tracing:
+        context.tf.start()
+
+def stop_trace():
+    """ Stop the signal tracing of the running simulation.
+
+    While the tracing is stopped, the traced signals are not written,
+    and their changes have no tracing overhead. Without signal tracing,
+    the call has no effect.
+
+    """
+    context = _simulator._context()
+    if context.tracing:
+        context.tf.stop()
+
+def dump_trace():
+    """ Write the signal trace of the running simulation to its file.
+
+    With a flight recorder, the recorded timesteps are written to a vcd
+    file. Without signal tracing, the call has no effect.
+
+    """
+    context = _simulator._context()
+    if context.tracing:
+        context.tf.dump()
+
+
+class _TraceWriter(object):
+
+    """ Base class of the trace file writers.
+
+    A traced signal that changes is added to the 'changed' list, once
+    per timestep. Its final value is written when the simulation moves
+    to the next timestep.
+
+    A trace can be stopped and restarted. While it is stopped, the
+    '_tracing' flag of the signals is off, so that they are not added
+    to the 'changed' list, and no time is written. When it is restarted,
+    the values of all signals are written at the end of the timestep.
+
+    """
+
+    def __init__(self, siglist):
+        self.siglist = siglist
+        self.changed = []
+        self.on = True
+        self.t = 0
+        self.startTime = self.stopTime = None
+
+    def setWindow(self, start, stop=None):
+        """ Trace from time start until time stop """
+        self.startTime = start
+        self.stopTime = stop
+        if start > 0:
+            self.stop()
+        self._checkWindow(0)
+
+    def _checkWindow(self, t):
+        if self.startTime is not None and t >= self.startTime:
+            self.startTime = None
+            self.start()
+        if self.stopTime is not None and t >= self.stopTime:
+            self.stopTime = None
+            self.stop()
+
+    def timestep(self, t):
+        """ Write the changes of the current timestep, and start a new one """
+        if t == self.t:
+            # events after a delay(0) are part of the current timestep
+            return
+        if self.on:
+            self._dumpChanges()
+            self._writeTime(t)
+        self.t = t
+        if self.startTime is not None or self.stopTime is not None:
+            self._checkWindow(t)
+
+    def start(self):
+        """ Restart a stopped trace """
+        if self.on:
+            return
+        self.on = True
+        for s in self.siglist:
+            s._tracing = 2
+        self.changed[:] = self.siglist
+        self._writeStart()
+
+    def stop(self):
+        """ Stop the trace, after writing the changes so far """
+        if not self.on:
+            return
+        self._dumpChanges()
+        self.on = False
+        for s in self.siglist:
+            s._tracing = 0
+        self._writeStop()
+
+    def dump(self):
+        """ Write the trace so far to the file """
+        self.flush()
+
+    def abort(self):
+        """ Write the trace after an error in the simulation """
+        self.flush()
+
+
+class _VcdWriter(_TraceWriter):
+
+    """ Buffered writer of a vcd file.
+
+    The output is collected in a buffer, that is written to the file in
+    large blocks. A stopped trace is written with the $dumpoff and
+    $dumpon commands of the vcd format.
+
+    """
+
+    def __init__(self, f, siglist=(), bufsize=1024):
+        _TraceWriter.__init__(self, list(siglist))
+        self.f = f
+        self.buf = []
+        self.bufsize = bufsize
+        # the time of the last time stamp, and the pending $dumpon
+        self.tstamp = 0
+        self.dumpon = False
+
+    def write(self, s):
+        self.buf.append(s)
+
+    def _dumpChanges(self):
+        changed = self.changed
+        if changed:
+            buf = self.buf
+            if self.dumpon:
+                self.dumpon = False
+                buf.append("$dumpon\n")
+                buf.extend([s._formatVcd() for s in changed])
+                buf.append("$end\n")
+            else:
+                buf.extend([s._formatVcd() for s in changed])
+            for s in changed:
+                s._tracing = 1
+            del changed[:]
+
+    def _writeTime(self, t):
+        buf = self.buf
+        buf.append("#%s\n" % t)
+        self.tstamp = t
+        if len(buf) > self.bufsize:
+            self.f.write("".join(buf))
+            del buf[:]
+
+    def _writeStart(self):
+        if self.tstamp != self.t:
+            self._writeTime(self.t)
+        self.dumpon = True
+
+    def _writeStop(self):
+        buf = self.buf
+        buf.append("$dumpoff\n")
+        for s in self.siglist:
+            if s._type is bool:
+                buf.append("x%s\n" % s._code)
+            elif s._type is intbv and s._nrbits:
+                buf.append("bx %s\n" % s._code)
+        buf.append("$end\n")
+
+    def flush(self):
+        self._dumpChanges()
+        self.f.write("".join(self.buf))
+        del self.buf[:]
+        self.f.flush()
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+
+_CHANGES, _DUMPON, _DUMPOFF = 0, 1, 2
+
+class _RingWriter(_TraceWriter):
+
+    """ Flight recorder of the last timesteps of a simulation.
+
+    The changes of the traced signals are kept in a ring buffer of the
+    last 'size' timesteps in which a traced signal changed. They are
+    only formatted and written to a vcd file when the simulation raises
+    an exception, or when a dump is requested. The values at the start
+    of the ring are kept up to date as timesteps drop out of it.
+
+    """
+
+    def __init__(self, path, timescale, scopes, siglist, size):
+        _TraceWriter.__init__(self, siglist)
+        self.path = path
+        self.timescale = timescale
+        self.scopes = scopes
+        self.size = size
+        self.ring = deque()
+        namegen = _genNameCode()
+        for s in siglist:
+            s._code = next(namegen)
+        self.base = dict((s._code, _ringValue(s)) for s in siglist)
+        self.tbase = 0
+        self.baseOn = True
+        self.dumpon = False
+
+    def _record(self, entry):
+        ring = self.ring
+        if len(ring) == self.size:
+            t, kind, changes = ring.popleft()
+            self.tbase = t
+            if kind == _DUMPOFF:
+                self.baseOn = False
+            else:
+                if kind == _DUMPON:
+                    self.baseOn = True
+                base = self.base
+                for s, v in changes:
+                    base[s._code] = v
+        ring.append(entry)
+
+    def _dumpChanges(self):
+        changed = self.changed
+        if changed:
+            for s in changed:
+                s._tracing = 1
+            changes = [(s, s._val._val if s._type is intbv else s._val)
+                       for s in changed]
+            del changed[:]
+            kind = _CHANGES
+            if self.dumpon:
+                self.dumpon = False
+                kind = _DUMPON
+            self._record((self.t, kind, changes))
+
+    def _writeTime(self, t):
+        pass
+
+    def _writeStart(self):
+        self.dumpon = True
+
+    def _writeStop(self):
+        self._record((self.t, _DUMPOFF, None))
+
+    def _writeDumpoff(self, f):
+        print("$dumpoff", file=f)
+        for s in self.siglist:
+            if s._type is bool:
+                print("x%s" % s._code, file=f)
+            elif s._type is intbv and s._nrbits:
+                print("bx %s" % s._code, file=f)
+        print("$end", file=f)
+
+    def dump(self):
+        """ Write the recorded timesteps to the vcd file """
+        self._dumpChanges()
+        with open(self.path, 'w') as f:
+            _writeVcdHeader(f, self.timescale)
+            _writeVcdScopes(f, self.scopes)
+            print("#%s" % self.tbase, file=f)
+            print("$dumpvars", file=f)
+            base = self.base
+            for s in self.siglist:
+                f.write(_ringFormat(s, base[s._code]))
+            print("$end", file=f)
+            if not self.baseOn:
+                self._writeDumpoff(f)
+            t = self.tbase
+            for rt, kind, changes in self.ring:
+                if rt != t:
+                    t = rt
+                    print("#%s" % t, file=f)
+                if kind == _DUMPOFF:
+                    self._writeDumpoff(f)
+                elif kind == _DUMPON:
+                    print("$dumpon", file=f)
+                    for s, v in changes:
+                        f.write(_ringFormat(s, v))
+                    print("$end", file=f)
+                else:
+                    for s, v in changes:
+                        f.write(_ringFormat(s, v))
+
+    def abort(self):
+        self.dump()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _ringValue(s):
+    if s._type is intbv:
+        return s._val._val
+    return s._val
+
+def _ringFormat(s, v):
+    if s._type is bool:
+        return "%d%s\n" % (v, s._code)
+    if s._type is intbv:
+        w = s._nrbits
+        if w:
+            return "b%s %s\n" % (format(v & ((1 << w) - 1), 'b').zfill(w),
+                                 s._code)
+        return "s%#x %s\n" % (v, s._code)
+    return "s%s %s\n" % (str(v), s._code)
+
+
 _codechars = ""
 for i in range(33, 127):
     _codechars += chr(i)
@@ -131,15 +509,93 @@ def _writeVcdHeader(f, timescale):
     print("$end", file=f)
     print(file=f)
 
-def _writeVcdSigs(f, hierarchy, tracelists):
-    curlevel = 0
-    namegen = _genNameCode()
-    siglist = []
+def _match(name, patterns):
+    if patterns is None:
+        return True
+    if isinstance(patterns, string_types):
+        patterns = [patterns]
+    for p in patterns:
+        if fnmatchcase(name, p):
+            return True
+    return False
+
+def _traceScopes(hierarchy, tracelists, scopes=None, signals=None,
+                 depth=None):
+    """ Return the scopes of a hierarchy, and the signals to trace.
+
+    The scopes are a list of (level, name, vars) tuples, where vars is a
+    list of (name, signal) tuples. The signals are marked as traced and
+    bound to the simulation that is traced, and returned in the order in
+    which they are first found.
+
+    The scopes and signals arguments are glob patterns, or lists of them,
+    that select the scopes by their dotted path, and the signals by their
+    name. Only the scopes up to level depth are traced. A scope without
+    selected signals is kept if it is the parent of a traced scope.
+
+    """
+    context = _simulator._pending()
+    selected = []
+    path = []
     for inst in hierarchy:
-        level = inst.level
         name = inst.name
-        sigdict = inst.sigdict
-        memdict = inst.memdict
+        level = inst.level
+        if depth is not None and level > depth:
+            continue
+        del path[level-1:]
+        path.append(name)
+        vars = []
+        if not _match(".".join(path), scopes):
+            selected.append((level, name, vars))
+            continue
+        for n, s in inst.sigdict.items():
+            vars.append((n, s))
+        # Memory dump by Frederik Teichert, http://teichert-ing.de, date: 2011.03.28
+        # The Value Change Dump standard doesn't support multidimensional arrays so 
+        # all memories are flattened and renamed.
+        if tracelists:
+            for n in inst.memdict.keys():
+                # the elements of a Memory are not signals, and not traced
+                if isinstance(inst.memdict[n].obj, Memory):
+                    continue
+                for memindex, s in enumerate(inst.memdict[n].mem):
+                    vars.append(("%s(%i)" % (n, memindex), s))
+        if signals is not None:
+            vars[:] = [(n, s) for n, s in vars if _match(n, signals)]
+        selected.append((level, name, vars))
+    # keep the scopes with signals, and their parents
+    result = []
+    parent = 0
+    for level, name, vars in reversed(selected):
+        if vars or level < parent:
+            result.append((level, name, vars))
+            parent = level
+    result.reverse()
+    siglist = []
+    for level, name, vars in result:
+        for n, s in vars:
+            if s._val is None:
+                raise ValueError("%s of module %s has no initial value" % (n, name))
+            if not s._tracing:
+                s._tracing = 1
+                if s._context is not context:
+                    context.register(s)
+                siglist.append(s)
+    return result, siglist
+
+def _writeVcdSigs(f, scopes, siglist):
+    namegen = _genNameCode()
+    for s in siglist:
+        s._code = next(namegen)
+    _writeVcdScopes(f, scopes)
+    print("$dumpvars", file=f)
+    for s in siglist:
+        f.write(s._formatVcd()) # initial value
+    print("$end", file=f)
+
+def _writeVcdScopes(f, scopes):
+    curlevel = 0
+    for level, name, vars in scopes:
         delta = curlevel - level
         curlevel = level
         assert(delta >= -1)
@@ -147,13 +603,7 @@ def _writeVcdSigs(f, hierarchy, tracelists):
             for i in range(delta + 1):
                 print("$upscope $end", file=f)
         print("$scope module %s $end" % name, file=f)
-        for n, s in sigdict.items():
-            if s._val is None:
-                raise ValueError("%s of module %s has no initial value" % (n, name))
-            if not s._tracing:
-                s._tracing = 1
-                s._code = next(namegen)
-                siglist.append(s)
+        for n, s in vars:
             w = s._nrbits
             # use real for enum strings
             if w and not isinstance(s._val, EnumItemType):
@@ -163,46 +613,7 @@ def _writeVcdSigs(f, hierarchy, tracelists):
                     print("$var reg %s %s %s $end" % (w, s._code, n), file=f)
             else:
                 print("$var real 1 %s %s $end" % (s._code, n), file=f)
-        # Memory dump by Frederik Teichert, http://teichert-ing.de, date: 2011.03.28
-        # The Value Change Dump standard doesn't support multidimensional arrays so 
-        # all memories are flattened and renamed.
-        if tracelists:
-            for n in memdict.keys():
-                memindex = 0
-                for s in memdict[n].mem:
-                    if s._val is None:
-                        raise ValueError("%s of module %s has no initial value" % (n, name))
-                    if not s._tracing:
-                        s._tracing = 1
-                        s._code = next(namegen)
-                        siglist.append(s)
-                    w = s._nrbits
-                    if w:
-                        if w == 1:
-                            print("$var reg 1 %s %s(%i) $end" % (s._code, n, memindex), file=f)
-                        else:
-                            print("$var reg %s %s %s(%i) $end" % (w, s._code, n, memindex), file=f)
-                    else:
-                        print("$var real 1 %s %s(%i) $end" % (s._code, n, memindex), file=f)
-                    memindex += 1
     for i in range(curlevel):
         print("$upscope $end", file=f)
     print(file=f)
     print("$enddefinitions $end", file=f)
-    print("$dumpvars", file=f)
-    for s in siglist:
-        s._printVcd() # initial value
-    print("$end", file=f)
-            
-            
-        
-        
-
-
-    
-    
-
-            
-        
-    
-    
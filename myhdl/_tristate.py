@@ -2,7 +2,7 @@ from __future__ import absolute_import
 import warnings
 
 from myhdl._Signal import _Signal, _DelayedSignal
-from myhdl._simulator import _siglist
+from myhdl._simulator import _local
 
 class BusContentionWarning(UserWarning):
     pass
@@ -61,7 +61,10 @@ class _TristateDriver(_Signal):
              self._next = None
          else:             
              self._setNextVal(val)
-         _siglist.append(self._bus)   
+         bus = self._bus
+         if not bus._pending:
+             bus._pending = True
+             _local.context.siglist.append(bus)
     next = property(_Signal._get_next, _set_next, None, "'next' access methods")
 
     
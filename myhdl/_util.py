@@ -27,10 +27,12 @@ from __future__ import print_function
 import ast
 import sys
 import inspect
+import weakref
 
 from tokenize import generate_tokens, untokenize, INDENT
 
 from myhdl._compat import integer_types, StringIO
+from myhdl import _cache
 
 def _printExcInfo():
     kind, value = sys.exc_info()[:2]
@@ -73,13 +75,69 @@ def _dedent(s):
     return untokenize(result)
 
 
+class _Source(object):
+
+    """ Dedented source of a code object.
+
+    The source is read and dedented once for each code object. Results
+    that are derived from the source alone, or from the source and a
+    binding pattern of its names, can be kept in the results dict, so
+    that they are computed once as well. When the on-disk cache is on,
+    the text, the AST and the results are shared with the cache entry.
+
+    """
+
+    __slots__ = ('text', 'sourcefile', 'lineoffset', 'results', 'entry')
+
+    def __init__(self, code):
+        lines, lineno = inspect.getsourcelines(code)
+        self.sourcefile = inspect.getsourcefile(code)
+        self.lineoffset = lineno - 1
+        entry = self.entry = _cache._lookup(self.sourcefile, lineno, lines)
+        if entry is None:
+            self.text = _dedent(''.join(lines))
+            self.results = {}
+        else:
+            if entry.text is None:
+                entry.setText(_dedent(''.join(lines)))
+            self.text = entry.text
+            self.results = entry.results
+
+    def parse(self):
+        """ Return a new AST of the source """
+        if self.entry is None:
+            tree = ast.parse(self.text)
+        else:
+            tree = self.entry.parse()
+        tree.sourcefile = self.sourcefile
+        tree.lineoffset = self.lineoffset
+        return tree
+
+
+# sources by code object id, with a weak reference to the code object
+_sources = {}
+
+def _getSource(obj):
+    """ Return the _Source of a function, frame or code object """
+    if inspect.isframe(obj):
+        code = obj.f_code
+    else:
+        code = getattr(obj, '__code__', obj)
+    key = id(code)
+    entry = _sources.get(key)
+    if entry is not None and entry[0]() is code:
+        return entry[1]
+    src = _Source(code)
+    # the module globals may be gone when this is called at exit
+    def remove(ref, key=key, sources=_sources):
+        if sources.get(key, (None,))[0] is ref:
+            del sources[key]
+    _sources[key] = (weakref.ref(code, remove), src)
+    return src
+
+
 def _makeAST(f):
-    s = inspect.getsource(f)
-    s = _dedent(s)
-    tree = ast.parse(s)
-    tree.sourcefile = inspect.getsourcefile(f)
-    tree.lineoffset = inspect.getsourcelines(f)[1]-1
-    return tree
+    return _getSource(f).parse()
 
 
 def _genfunc(gen):
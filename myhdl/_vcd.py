@@ -0,0 +1,296 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with a reader of vcd files.
+
+The reader parses a vcd file once, and builds an index with the value
+changes of each signal, sorted by time. The queries on a signal are
+binary searches in its index.
+
+The values of scalar and vector signals are unsigned integers. A value
+with unknown bits is a string of '0', '1', 'x' and 'z' characters, with
+the width of the signal. Real values are floats, and the string values
+that MyHDL writes for enum and unsized signals are strings.
+
+"""
+from __future__ import absolute_import
+
+from bisect import bisect_left, bisect_right
+
+
+class _error:
+    pass
+_error.NumPy = "NumPy arrays require NumPy"
+_error.Format = "Unexpected vcd syntax in %s: %s"
+_error.Signal = "No signal %s in %s"
+_error.Ambiguous = "Ambiguous signal name %s in %s: %s"
+_error.Edge = "Edges require a single bit signal: %s"
+_error.EdgeKind = "Edge kind should be 'posedge', 'negedge' or 'both'"
+
+# the largest width of a vector that is exported as 64-bit integers
+_MAXBITS = 63
+
+
+def _tokens(f):
+    for line in f:
+        for tok in line.split():
+            yield tok
+
+def _until(tokens):
+    """ Return the tokens up to the next $end keyword """
+    result = []
+    for tok in tokens:
+        if tok == "$end":
+            break
+        result.append(tok)
+    return result
+
+
+class VcdFile(object):
+
+    """ Reader of a vcd file, with an index of the changes of each signal.
+
+    A signal is identified by its hierarchical name, with the scope names
+    and the signal name separated by dots, such as "top.u1.count". A name
+    that ends in the name of a single signal, such as "u1.count", can be
+    used as well.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.date = self.version = self.timescale = None
+        self.signals = {}
+        self._codes = {}
+        self._widths = {}
+        self._traces = {}
+        with open(path) as f:
+            tokens = _tokens(f)
+            self._readHeader(tokens)
+            self._readChanges(tokens)
+
+    def _readHeader(self, tokens):
+        scope = []
+        for tok in tokens:
+            if tok == "$date":
+                self.date = " ".join(_until(tokens))
+            elif tok == "$version":
+                self.version = " ".join(_until(tokens))
+            elif tok == "$timescale":
+                self.timescale = "".join(_until(tokens))
+            elif tok == "$scope":
+                scope.append(_until(tokens)[-1])
+            elif tok == "$upscope":
+                _until(tokens)
+                scope.pop()
+            elif tok == "$var":
+                var = _until(tokens)
+                if len(var) < 4:
+                    raise ValueError(_error.Format % (self.path, " ".join(var)))
+                kind, width, code, name = var[:4]
+                # a bit select is part of the name, a range is not
+                if len(var) > 4 and ":" not in var[4]:
+                    name += var[4]
+                name = ".".join(scope + [name])
+                width = int(width)
+                self.signals[name] = dict(type=kind, width=width)
+                self._codes[name] = code
+                if code not in self._traces:
+                    self._traces[code] = ([], [])
+                    self._widths[code] = width
+            elif tok == "$enddefinitions":
+                _until(tokens)
+                return
+            elif tok.startswith("$"):
+                _until(tokens)
+            else:
+                raise ValueError(_error.Format % (self.path, tok))
+
+    def _readChanges(self, tokens):
+        traces = self._traces
+        t = 0
+        for tok in tokens:
+            c = tok[0]
+            if c == "#":
+                t = int(tok[1:])
+                continue
+            elif c == "b" or c == "B":
+                code = next(tokens)
+                try:
+                    val = int(tok[1:], 2)
+                except ValueError:
+                    val = self._unknown(tok[1:].lower(), code)
+            elif c == "r" or c == "R":
+                code = next(tokens)
+                val = float(tok[1:])
+            elif c == "s" or c == "S":
+                code = next(tokens)
+                val = tok[1:]
+            elif c == "$":
+                # $dumpvars and the like only hold value changes
+                if tok == "$comment":
+                    _until(tokens)
+                continue
+            elif c == "0" or c == "1":
+                code = tok[1:]
+                val = int(c)
+            else:
+                code = tok[1:]
+                val = c.lower()
+            try:
+                times, values = traces[code]
+            except KeyError:
+                raise ValueError(_error.Format % (self.path, tok))
+            if times and times[-1] == t:
+                # the last value in a timestep is kept
+                if len(values) > 1 and values[-2] == val:
+                    times.pop()
+                    values.pop()
+                else:
+                    values[-1] = val
+            elif not values or values[-1] != val:
+                times.append(t)
+                values.append(val)
+
+    def _unknown(self, val, code):
+        """ Extend a vector value with unknown bits to the signal width """
+        width = self._widths.get(code, len(val))
+        if len(val) < width:
+            ext = val[0] if val[0] in "xz" else "0"
+            val = ext * (width - len(val)) + val
+        return val
+
+    def _code(self, signal):
+        code = self._codes.get(signal)
+        if code is None:
+            suffix = "." + signal
+            names = [n for n in self._codes if n.endswith(suffix)]
+            if not names:
+                raise KeyError(_error.Signal % (signal, self.path))
+            codes = set(self._codes[n] for n in names)
+            if len(codes) > 1:
+                raise KeyError(_error.Ambiguous %
+                               (signal, self.path, ", ".join(sorted(names))))
+            code = codes.pop()
+        return code
+
+    def _trace(self, signal):
+        return self._traces[self._code(signal)]
+
+    def _window(self, times, t0, t1):
+        lo = bisect_left(times, t0)
+        hi = len(times) if t1 is None else bisect_left(times, t1)
+        return lo, hi
+
+    def value_at(self, signal, t):
+        """ Return the value of a signal at time t.
+
+        The value is that after the last change at or before time t, or
+        None before the first value of the signal.
+
+        """
+        times, values = self._trace(signal)
+        i = bisect_right(times, t) - 1
+        if i < 0:
+            return None
+        return values[i]
+
+    def changes_between(self, signal, t0=0, t1=None):
+        """ Return the changes of a signal from time t0 up to time t1.
+
+        The result is a list of (time, value) tuples, with the changes at
+        or after t0 and before t1. The default t1 of None includes all
+        changes after t0.
+
+        """
+        times, values = self._trace(signal)
+        lo, hi = self._window(times, t0, t1)
+        return list(zip(times[lo:hi], values[lo:hi]))
+
+    def edges(self, signal, t0=0, t1=None, kind='posedge'):
+        """ Return the times of the edges of a bit signal.
+
+        A posedge is a change to 1, and a negedge a change to 0. The kind
+        argument selects 'posedge', 'negedge' or 'both'. The edges are
+        those at or after t0, and before t1.
+
+        """
+        if kind not in ('posedge', 'negedge', 'both'):
+            raise ValueError(_error.EdgeKind)
+        code = self._code(signal)
+        if self._widths[code] != 1:
+            raise ValueError(_error.Edge % signal)
+        times, values = self._traces[code]
+        lo, hi = self._window(times, t0, t1)
+        # the first value of a signal is not an edge
+        lo = max(lo, 1)
+        if kind == 'posedge':
+            levels = (1,)
+        elif kind == 'negedge':
+            levels = (0,)
+        else:
+            levels = (0, 1)
+        return [times[i] for i in range(lo, hi) if values[i] in levels]
+
+    def to_numpy(self, signal):
+        """ Return the changes of a signal as a pair of NumPy arrays.
+
+        The first array holds the times of the changes, the second one
+        is a masked array with the values, in which the unknown values
+        are masked. Vectors of up to 63 bits have 64-bit integer values,
+        and real signals float values. Other values are Python objects.
+
+        """
+        # NumPy is slow to import, and only needed here
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError(_error.NumPy)
+        times, values = self._trace(signal)
+        mask = [isinstance(v, str) for v in values]
+        known = [v for v in values if not isinstance(v, str)]
+        if not known and any(v.strip("01xz") for v in values):
+            # a signal with string values
+            dtype, fill = object, None
+            mask = False
+        elif known and isinstance(known[0], float):
+            dtype, fill = np.float64, 0.0
+        elif max(known or [0]) < (1 << _MAXBITS):
+            dtype, fill = np.int64, 0
+        else:
+            dtype, fill = object, 0
+        if mask is not False:
+            values = [fill if m else v for v, m in zip(values, mask)]
+        data = np.array(values, dtype=dtype)
+        return (np.array(times, dtype=np.int64),
+                np.ma.masked_array(data, mask=mask))
+
+    def sample(self, signal, times):
+        """ Return the values of a signal at each of the given times.
+
+        The result is a masked array, as returned by to_numpy, in which
+        the values before the first value of the signal are masked.
+
+        """
+        tarr, varr = self.to_numpy(signal)
+        import numpy as np
+        index = np.searchsorted(tarr, np.asarray(times), side='right') - 1
+        result = varr[np.maximum(index, 0)]
+        result[index < 0] = np.ma.masked
+        return result
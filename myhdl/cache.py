@@ -0,0 +1,62 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Command line interface of the MyHDL source analysis cache.
+
+    python -m myhdl.cache [-d DIR] warm PATH [PATH ...]
+    python -m myhdl.cache [-d DIR] clear
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import sys
+import argparse
+
+from myhdl import _cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m myhdl.cache",
+                                     description="Manage the MyHDL source "
+                                     "analysis cache.")
+    parser.add_argument('-d', '--dir',
+                        default=os.environ.get('MYHDL_CACHE_DIR'),
+                        help="cache directory (default: $MYHDL_CACHE_DIR)")
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('warm', help="analyze the functions in Python files")
+    p.add_argument('paths', nargs='+', metavar='PATH',
+                   help="Python file or directory")
+    sub.add_parser('clear', help="remove the cache files")
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error("a command is required")
+    if not args.dir:
+        parser.error("no cache directory: use --dir or set MYHDL_CACHE_DIR")
+    _cache.setCacheDir(args.dir)
+    if args.command == 'warm':
+        print("%d functions analyzed" % _cache.warm(args.paths))
+    else:
+        print("%d cache files removed" % _cache.clear())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,51 @@
+""" Conversion and verification of MyHDL designs.
+
+The conversion modules are large, so they are imported on first use: the
+objects below are proxies that load their module when they are called or
+when one of their attributes is accessed. Pure simulation never imports
+them.
+
+"""
 from __future__ import absolute_import
-from ._verify import verify, analyze, registerSimulator
-from ._toVerilog import toVerilog
-from ._toVHDL import toVHDL
+
+import importlib
+
+
+class _LazyObject(object):
+
+    """ Proxy to an object of a conversion module, loaded on first use """
+
+    __slots__ = ('_module', '_name')
+
+    def __init__(self, module, name):
+        object.__setattr__(self, '_module', module)
+        object.__setattr__(self, '_name', name)
+
+    def _load(self):
+        module = importlib.import_module(self._module, __name__)
+        return getattr(module, self._name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __repr__(self):
+        return repr(self._load())
+
+
+verify = _LazyObject('._verify', 'verify')
+analyze = _LazyObject('._verify', 'analyze')
+registerSimulator = _LazyObject('._verify', 'registerSimulator')
+toVerilog = _LazyObject('._toVerilog', 'toVerilog')
+toVHDL = _LazyObject('._toVHDL', 'toVHDL')
 
 __all__ = ["verify",
            "analyze",
@@ -43,6 +43,8 @@ from myhdl.conversion._misc import (_error, _access, _kind,
 from myhdl._extractHierarchy import _isMem, _getMemInfo, _UserCode
 from myhdl._Signal import _Signal, _WaiterList
 from myhdl._ShadowSignal import _ShadowSignal, _SliceSignal, _TristateDriver
+from myhdl._Clock import Clock
+from myhdl._Memory import Memory
 from myhdl._util import _isTupleOfInts, _dedent, _flatten, _makeAST
 from myhdl._resolverefs import _AttrRefTransformer
 from myhdl._compat import builtins, integer_types
@@ -116,6 +118,9 @@ def _analyzeSigs(hierarchy, hdl='Verilog'):
             # slice signals
             for sl in s._slicesigs:
                 sl._setName(hdl)
+            # a clock is driven by its own clock generator
+            if isinstance(s, Clock):
+                s._driven = 'reg'
             siglist.append(s)
         # list of signals
         for n, m in memdict.items():
@@ -146,6 +151,17 @@ def _analyzeSigs(hierarchy, hdl='Verilog'):
 
 
 
+def _memSigs(items):
+    """ Replace the elaborated Memory objects in items by their signals """
+    sigs = []
+    for item in items:
+        if isinstance(item, Memory) and _isMem(item):
+            sigs.extend(_getMemInfo(item).mem)
+        else:
+            sigs.append(item)
+    return sigs
+
+
 def _analyzeGens(top, absnames):
     genlist = []
     for g in top:
@@ -171,9 +187,10 @@ def _analyzeGens(top, absnames):
             v = _FirstPassVisitor(tree)
             v.visit(tree)
             if isinstance(g, _AlwaysComb):
-                v = _AnalyzeAlwaysCombVisitor(tree, g.senslist)
+                v = _AnalyzeAlwaysCombVisitor(tree, _memSigs(g.senslist))
             elif isinstance(g, _AlwaysSeq):
-                v = _AnalyzeAlwaysSeqVisitor(tree, g.senslist, g.reset, g.sigregs, g.varregs)
+                sigregs = g.sigregs + _memSigs(g.memregs)
+                v = _AnalyzeAlwaysSeqVisitor(tree, g.senslist, g.reset, sigregs, g.varregs)
             else:
                 v = _AnalyzeAlwaysDecoVisitor(tree, g.senslist)
             v.visit(tree)
@@ -269,9 +286,10 @@ class _FirstPassVisitor(ast.NodeVisitor, _ConversionMixin):
         self.visit(node.value)
 
     def visit_Call(self, node):
-        if node.starargs:
+        # starargs and kwargs are no longer Call fields in Python 3.5+
+        if getattr(node, 'starargs', None):
             self.raiseError(node, _error.NotSupported, "extra positional arguments")
-        if node.kwargs:
+        if getattr(node, 'kwargs', None):
             self.raiseError(node, _error.NotSupported, "extra named arguments")
         # f = eval(_unparse(node.node), self.tree.symdict)
         self.generic_visit(node)
@@ -944,11 +962,28 @@ class _AnalyzeVisitor(ast.NodeVisitor, _ConversionMixin):
         self.generic_visit(node)
 
     def visit_Subscript(self, node):
+        if isinstance(node.slice, ast.Index):
+            self.bitsliceToSlice(node)
         if isinstance(node.slice, ast.Slice):
             self.accessSlice(node)
         else:
             self.accessIndex(node)
 
+    def bitsliceToSlice(self, node):
+        """ Replace an index by a bitslice with the equivalent slice """
+        index = node.slice.value
+        if not isinstance(index, ast.Name):
+            return
+        s = self.tree.symdict.get(index.id)
+        if not isinstance(s, bitslice):
+            return
+        upper = None
+        if s._j:
+            upper = ast.Num(n=s._j)
+        node.slice = ast.Slice(lower=ast.Num(n=s._i), upper=upper, step=None)
+        ast.copy_location(node.slice, node)
+        ast.fix_missing_locations(node.slice)
+
     def accessSlice(self, node):
         self.visit(node.value)
         node.obj = self.getObj(node.value)
@@ -978,7 +1013,7 @@ class _AnalyzeVisitor(ast.NodeVisitor, _ConversionMixin):
             else:
                 node.obj = node.value.obj.elObj
         elif _isMem(node.value.obj):
-            node.obj = node.value.obj[0]
+            node.obj = _getMemInfo(node.value.obj).elObj
         elif isinstance(node.value.obj, _Rom):
             node.obj = int(-1)
         elif isinstance(node.value.obj, intbv):
@@ -1239,6 +1274,11 @@ def _analyzeTopFunc(top_inst, func, *args, **kwargs):
     v = _AnalyzeTopFuncVisitor(func, tree, *args, **kwargs)
     v.visit(tree)
 
+    # a clock port is driven from outside the converted module
+    for obj in v.argdict.values():
+        if isinstance(obj, Clock):
+            obj._driven = None
+
     objs = []
     for name, obj in v.fullargdict.items():
         if not isinstance(obj, _Signal):
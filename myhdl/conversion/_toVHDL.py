@@ -50,6 +50,7 @@ from myhdl.conversion._misc import (_error,_kind,_context,
 from myhdl.conversion._analyze import (_analyzeSigs, _analyzeGens, _analyzeTopFunc,
                                        _Ram, _Rom, _enumTypeSet, _constDict, _extConstDict)
 from myhdl._Signal import _Signal,_WaiterList
+from myhdl._Memory import Memory
 from myhdl.conversion._toVHDLPackage import _package
 from myhdl._util import  _flatten
 from myhdl._compat import integer_types, class_types, StringIO
@@ -493,7 +494,7 @@ def _convertGens(genlist, siglist, memlist, vfile):
     print(file=vfile)
     # shadow signal assignments
     for s in siglist:
-        if hasattr(s, 'toVHDL') and s._read:
+        if hasattr(s, 'toVHDL') and s._read and s._driven:
             print(s.toVHDL(), file=vfile)
     # hack for slice signals in a list
     for m in memlist:
@@ -2057,7 +2058,7 @@ class _AnnotateTypesVisitor(ast.NodeVisitor, _ConversionMixin):
         elif f in _flatten(integer_types, ord):
             node.vhd = vhd_int()
             node.args[0].vhd = vhd_int()
-        elif f in (intbv, modbv):
+        elif inspect.isclass(f) and issubclass(f, intbv):
             node.vhd = vhd_int()
         elif f is len:
             node.vhd = vhd_int()
@@ -2232,6 +2233,8 @@ class _AnnotateTypesVisitor(ast.NodeVisitor, _ConversionMixin):
         if isinstance(obj, list):
             assert len(obj)
             node.vhd = inferVhdlObj(obj[0])
+        elif isinstance(obj, Memory):
+            node.vhd = inferVhdlObj(_getMemInfo(obj).elObj)
         elif isinstance(obj, _Ram):
             node.vhd = inferVhdlObj(obj.elObj)
         elif isinstance(obj, _Rom):
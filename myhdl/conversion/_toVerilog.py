@@ -743,7 +743,7 @@ class _ConvertVisitor(ast.NodeVisitor, _ConversionMixin):
             # convert number argument to integer
             if isinstance(node.args[0], ast.Num):
                 node.args[0].n = int(node.args[0].n)
-        elif f in (intbv, modbv):
+        elif inspect.isclass(f) and issubclass(f, intbv):
             self.visit(node.args[0])
             return
         elif f == intbv.signed: # note equality comparison
@@ -0,0 +1,77 @@
+""" Compare independent scalar simulations with one batch simulation.
+
+The design is the accumulator bank of perf_compiled. Each lane gets its
+own input sequence. The scalar runs simulate the lanes one after the
+other with the cycle-based kernel.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+
+def accumulator(acc, din, clock, reset):
+
+    nxt = Signal(intbv(0)[16:])
+
+    @always_comb
+    def datapath():
+        if din[7]:
+            nxt.next = (acc + concat(din[4:], din[8:4])) % 2**16
+        else:
+            nxt.next = acc ^ (~din & 0xff)
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        acc.next = nxt
+
+    return datapath, logic
+
+
+def design(nrAccs):
+    clock = Clock(10)
+    reset = ResetSignal(0, active=1, async=False)
+    din = Signal(intbv(0)[8:])
+    accs = [Signal(intbv(0)[16:]) for i in range(nrAccs)]
+    insts = [accumulator(a, din, clock, reset) for a in accs]
+    return insts, clock, reset, din
+
+
+def scalar(nrLanes, nrAccs, nrCycles):
+    start = time.time()
+    for lane in range(nrLanes):
+        insts, clock, reset, din = design(nrAccs)
+
+        @instance
+        def stimulus():
+            for i in range(nrCycles):
+                din.next = (i * 37 + lane) % 256
+                yield clock.negedge
+            raise StopSimulation()
+
+        Simulation(insts, stimulus, mode="cycle").run(quiet=1)
+    return time.time() - start
+
+
+def batch(nrLanes, nrAccs, nrCycles):
+    start = time.time()
+    insts, clock, reset, din = design(nrAccs)
+    sim = BatchSimulation(insts, lanes=nrLanes)
+    lanes = list(range(nrLanes))
+    for i in range(nrCycles):
+        sim[din] = [(i * 37 + lane) % 256 for lane in lanes]
+        sim.step()
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1, 10, 100]
+    nrAccs, nrCycles = 10, 200
+    print("%10s %10s %10s %8s" % ("lanes", "scalar", "batch", "speedup"))
+    for n in sizes:
+        s = scalar(n, nrAccs, nrCycles)
+        b = batch(n, nrAccs, nrCycles)
+        print("%10d %10.3f %10.3f %8.2f" % (n, s, b, s / b))
@@ -0,0 +1,40 @@
+""" Compare field access through slices and through bitslice objects.
+
+An instruction word is decoded into three fields, once with slices as in
+instr[16:12], and once with bitslice objects created up front, as in
+instr[OPCODE]. The field writes go through the next value of a signal.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import timeit
+
+
+SETUP = """
+from myhdl import Signal, intbv, bitslice
+OPCODE, REG, IMM = bitslice(16, 12), bitslice(12, 8), bitslice(8)
+instr = Signal(intbv(0x1234)[16:])
+word = Signal(intbv(0)[12:])
+"""
+
+OPS = (("read", "instr[16:12], instr[12:8], instr[8:]",
+                "instr[OPCODE], instr[REG], instr[IMM]"),
+       ("write", "word.next[12:8] = 3; word.next[8:] = 7",
+                 "word.next[REG] = 3; word.next[IMM] = 7"),
+      )
+
+
+def timeOp(stmt, number):
+    t = timeit.Timer(stmt, SETUP)
+    return min(t.repeat(3, number)) / number * 1e9
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if sys.argv[1:] else 100000
+    print("%-10s %10s %12s %8s" % ("operation", "slice ns", "bitslice ns",
+                                   "speedup"))
+    for op, stmt0, stmt1 in OPS:
+        t0 = timeOp(stmt0, number)
+        t1 = timeOp(stmt1, number)
+        print("%-10s %10.0f %12.0f %8.2f" % (op, t0, t1, t0 / t1))
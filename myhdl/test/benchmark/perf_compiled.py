@@ -0,0 +1,68 @@
+""" Compare the python and compiled simulation backends.
+
+The design is a bank of accumulators with combinational datapath logic
+on bit slices, clocked by a single Clock and reset by a synchronous reset.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+
+def accumulator(acc, din, clock, reset):
+
+    nxt = Signal(intbv(0)[16:])
+
+    @always_comb
+    def datapath():
+        if din[7]:
+            nxt.next = (acc + concat(din[4:], din[8:4])) % 2**16
+        else:
+            nxt.next = acc ^ (~din & 0xff)
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        acc.next = nxt
+
+    return datapath, logic
+
+
+def bench(nrAccs, nrCycles):
+
+    clock = Clock(10)
+    reset = ResetSignal(0, active=1, async=False)
+    din = Signal(intbv(0)[8:])
+    accs = [Signal(intbv(0)[16:]) for i in range(nrAccs)]
+    insts = [accumulator(a, din, clock, reset) for a in accs]
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield clock.negedge
+        reset.next = 0
+        for i in range(nrCycles):
+            din.next = (i * 37) % 256
+            yield clock.negedge
+        raise StopSimulation()
+
+    return insts, stimulus
+
+
+def measure(backend, nrAccs, nrCycles=2000):
+    sim = Simulation(bench(nrAccs, nrCycles), backend=backend)
+    start = time.time()
+    sim.run(quiet=1)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1, 10, 100]
+    print("%10s %10s %10s %8s" % ("accs", "python", "compiled", "speedup"))
+    for n in sizes:
+        python = measure("python", n)
+        compiled = measure("compiled", n)
+        print("%10d %10.3f %10.3f %8.2f" % (n, python, compiled,
+                                            python / compiled))
@@ -0,0 +1,63 @@
+""" Compare event-driven and cycle-based simulation of a synchronous design.
+
+The design is a bank of counters with combinational increment logic,
+clocked by a single Clock and reset by a synchronous reset.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+
+def counter(count, clock, reset):
+
+    nxt = Signal(intbv(0)[16:])
+
+    @always_comb
+    def inc():
+        nxt.next = (count + 1) % 2**16
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        count.next = nxt
+
+    return inc, logic
+
+
+def bench(nrCounters, nrCycles):
+
+    clock = Clock(10)
+    reset = ResetSignal(0, active=1, async=False)
+    counts = [Signal(intbv(0)[16:]) for i in range(nrCounters)]
+    counters = [counter(c, clock, reset) for c in counts]
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield clock.negedge
+        reset.next = 0
+        for i in range(nrCycles):
+            yield clock.negedge
+        assert counts[0] == nrCycles
+        raise StopSimulation()
+
+    return counters, stimulus
+
+
+def measure(mode, nrCounters, nrCycles=2000):
+    sim = Simulation(bench(nrCounters, nrCycles), mode=mode)
+    start = time.time()
+    sim.run(quiet=1)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1, 10, 100]
+    print("%10s %10s %10s %8s" % ("counters", "event", "cycle", "speedup"))
+    for n in sizes:
+        event = measure("event", n)
+        cycle = measure("cycle", n)
+        print("%10d %10.3f %10.3f %8.2f" % (n, event, cycle, event / cycle))
@@ -0,0 +1,57 @@
+""" Measure the elaboration time of arrays of identical blocks.
+
+Each timer has an always_seq block and an always_comb block. The source
+of their functions is parsed once, so the time per instance should not
+depend on the number of instances. For comparison, the source cache is
+cleared before each instance in the uncached run.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+from myhdl._util import _sources
+
+
+def timer(done, load, clock, reset):
+
+    count = Signal(intbv(0)[16:])
+
+    @always_seq(clock.posedge, reset=reset)
+    def counter():
+        if load:
+            count.next = 1000
+        elif count > 0:
+            count.next = count - 1
+
+    @always_comb
+    def output():
+        done.next = count == 0
+
+    return counter, output
+
+
+def elaborate(n, cached=True):
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, async=False)
+    load = Signal(bool(0))
+    start = time.time()
+    insts = []
+    for i in range(n):
+        if not cached:
+            _sources.clear()
+        insts.append(timer(Signal(bool(0)), load, clock, reset))
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+    print("%10s %10s %10s %12s" % ("timers", "cached", "uncached",
+                                   "us/instance"))
+    for n in sizes:
+        cached = elaborate(n)
+        uncached = elaborate(n, cached=False)
+        print("%10d %10.3f %10.3f %12.1f" % (n, cached, uncached,
+                                             1e6 * cached / n))
@@ -0,0 +1,44 @@
+""" Measure kernel throughput as the number of pending future events grows.
+
+Each waiter repeatedly waits for a random delay, so at any time there are
+as many pending events in the future event queue as there are waiters.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+import random
+from random import randrange
+
+from myhdl import *
+
+random.seed(1)
+
+def bench(nrWaiters, counter):
+
+    def waiter():
+        while True:
+            yield delay(randrange(1, 1000))
+            counter[0] += 1
+
+    return [waiter() for i in range(nrWaiters)]
+
+
+def measure(nrWaiters, nrEvents=200000):
+    counter = [0]
+    sim = Simulation(bench(nrWaiters, counter))
+    # the mean delay is 500, so each waiter fires every 500 time units
+    duration = max(1000, nrEvents * 500 // nrWaiters)
+    start = time.time()
+    sim.run(duration, quiet=1)
+    elapsed = time.time() - start
+    return counter[0], elapsed
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000, 100000]
+    print("%10s %12s %10s %14s" % ("pending", "events", "seconds", "events/sec"))
+    for n in sizes:
+        events, elapsed = measure(n)
+        print("%10d %12d %10.3f %14.0f" % (n, events, elapsed, events / elapsed))
@@ -0,0 +1,59 @@
+""" Measure the hierarchy extraction time of arrays of identical blocks.
+
+The timers are elaborated plainly and under hierarchy extraction, as
+traceSignals and the converters do. The extraction hook only handles
+the returns of generator sequences. With sys.monitoring (Python 3.12+),
+it is disabled for the other returns; with the profile hook, it is still
+called for every event.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+from myhdl import _extractHierarchy
+from myhdl._extractHierarchy import _HierExtr
+
+from perf_elaborate import timer
+
+
+def top(n):
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, async=False)
+    load = Signal(bool(0))
+    timers = [timer(Signal(bool(0)), load, clock, reset) for i in range(n)]
+    return timers
+
+
+def elaborate(n):
+    start = time.time()
+    top(n)
+    return time.time() - start
+
+
+def extract(n, monitoring=True):
+    saved = _extractHierarchy._monitoring
+    if not monitoring:
+        _extractHierarchy._monitoring = None
+    try:
+        start = time.time()
+        _HierExtr("top", top, n)
+        return time.time() - start
+    finally:
+        _extractHierarchy._monitoring = saved
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+    print("%10s %10s %10s %10s" % ("timers", "plain", "profile",
+                                   "monitoring"))
+    for n in sizes:
+        plain = elaborate(n)
+        profile = extract(n, monitoring=False)
+        if hasattr(sys, 'monitoring'):
+            print("%10d %10.3f %10.3f %10.3f" % (n, plain, profile,
+                                                 extract(n)))
+        else:
+            print("%10d %10.3f %10.3f %10s" % (n, plain, profile, "-"))
@@ -0,0 +1,34 @@
+""" Measure the time of `import myhdl` in a fresh interpreter.
+
+The conversion modules are loaded on first use, so a pure simulation
+process does not import them. For comparison, the time with an explicit
+import of the conversion modules is shown as well.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+import subprocess
+
+
+def measure(statement, n):
+    best = None
+    for i in range(n):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', statement])
+        t = time.time() - start
+        if best is None or t < best:
+            best = t
+    return best
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if sys.argv[1:] else 20
+    base = measure("pass", n)
+    lazy = measure("import myhdl", n)
+    eager = measure("import myhdl; import myhdl.conversion._verify", n)
+    print("%20s %10s" % ("", "ms"))
+    print("%20s %10.1f" % ("interpreter", 1e3 * base))
+    print("%20s %10.1f" % ("import myhdl", 1e3 * (lazy - base)))
+    print("%20s %10.1f" % ("with conversion", 1e3 * (eager - base)))
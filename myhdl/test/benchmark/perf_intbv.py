@@ -0,0 +1,53 @@
+""" Compare the fixed-width bit vectors with intbv and modbv.
+
+Each line times an operation of the simulation hot path on an 8-bit
+value, once with intbv(0)[8:] or modbv(0)[8:], and once with the fixed-
+width type of the same range: construction, copy, an in-place increment,
+and an assignment to the next value of a signal followed by its update.
+The signed types are timed on the range [-128, 128).
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import timeit
+
+from myhdl import Signal, intbv, modbv, uintbv, sintbv, umodbv, smodbv
+
+
+SETUP = """
+from copy import copy
+from myhdl import Signal, intbv, modbv, uintbv, sintbv, umodbv, smodbv
+a = %(make)s
+s = Signal(%(make)s)
+"""
+
+OPS = (("construct", "%(make)s"),
+       ("copy", "copy(a)"),
+       ("a += 1", "a += 1; a -= 1"),
+       ("s.next = v", "s.next = 100; s._update()"),
+      )
+
+TYPES = (("unsigned", "intbv(0)[8:]", "uintbv(0, 8)"),
+         ("signed", "intbv(0, min=-128, max=128)", "sintbv(0, 8)"),
+         ("unsigned wrap", "modbv(0, min=0, max=256)", "umodbv(0, 8)"),
+         ("signed wrap", "modbv(0, min=-128, max=128)", "smodbv(0, 8)"),
+        )
+
+
+def timeOp(stmt, make, number):
+    d = dict(make=make)
+    t = timeit.Timer(stmt % d, SETUP % d)
+    return min(t.repeat(3, number)) / number * 1e9
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if sys.argv[1:] else 100000
+    print("%-14s %-12s %10s %10s %8s" % ("type", "operation", "intbv ns",
+                                         "fixed ns", "speedup"))
+    for name, ref, fixed in TYPES:
+        for op, stmt in OPS:
+            t0 = timeOp(stmt, ref, number)
+            t1 = timeOp(stmt, fixed, number)
+            print("%-14s %-12s %10.0f %10.0f %8.2f" % (name, op, t0, t1,
+                                                       t0 / t1))
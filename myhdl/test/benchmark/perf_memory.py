@@ -0,0 +1,65 @@
+""" Measure the memory used per signal.
+
+Signals with an immutable initial value share it between their current,
+next and initial value, and the waiter lists of a signal are only
+allocated when a generator waits on it. The bytes per signal are shown
+for a bool, a small intbv, and the elements of a memory (a list of
+signals), once as constructed and once after waiting on each signal.
+The last line is for the elements of a Memory, that are not signals.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import gc
+
+from myhdl import Signal, Memory, intbv
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def measure(make, n, watch=False):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        sigs = make(n)
+        if watch:
+            for s in sigs:
+                s.posedge, s.negedge
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return size / float(n)
+
+
+def bools(n):
+    return [Signal(bool(0)) for i in range(n)]
+
+
+def words(n):
+    return [Signal(intbv(0)[8:]) for i in range(n)]
+
+
+def memory(n):
+    return [Signal(intbv(0, min=-128, max=128)) for i in range(n)]
+
+
+def flat(n):
+    return Memory(intbv(0, min=-128, max=128), n)
+
+
+if __name__ == '__main__':
+    if tracemalloc is None:
+        sys.exit("tracemalloc is not available in this Python version")
+    n = int(sys.argv[1]) if sys.argv[1:] else 10000
+    print("%20s %10s %10s" % ("", "bytes", "watched"))
+    for name, make in (("bool", bools),
+                       ("intbv[8:]", words),
+                       ("memory element", memory)):
+        print("%20s %10.0f %10.0f" % (name, measure(make, n),
+                                      measure(make, n, watch=True)))
+    print("%20s %10.0f %10s" % ("Memory element", measure(flat, n), "-"))
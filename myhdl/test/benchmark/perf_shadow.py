@@ -0,0 +1,43 @@
+""" Measure the update of slice and concatenation shadow signals.
+
+A 64-bit bus is split into 64 bit shadows and 8 byte shadows, and the
+bits are joined again with a ConcatSignal. The stimulus changes a few
+bits of the bus on each step, so that most shadows keep their value.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+import random
+
+from myhdl import *
+
+
+def bench(steps):
+    bus = Signal(intbv(0)[64:])
+    bits = [bus(i) for i in range(64)]
+    nibbles = [bus(i+8, i) for i in range(0, 64, 8)]
+    joined = ConcatSignal(*reversed(bits))
+    values = [random.getrandbits(3) << random.randrange(61)
+              for i in range(steps)]
+
+    @instance
+    def stimulus():
+        for v in values:
+            bus.next = bus ^ v
+            yield delay(10)
+        assert joined == bus
+        raise StopSimulation
+
+    return stimulus
+
+
+if __name__ == '__main__':
+    steps = int(sys.argv[1]) if sys.argv[1:] else 10000
+    random.seed(1)
+    sim = Simulation(bench(steps))
+    t = time.time()
+    sim.run(quiet=1)
+    t = time.time() - t
+    print("%d steps: %.2f s, %.1f us per step" % (steps, t, t / steps * 1e6))
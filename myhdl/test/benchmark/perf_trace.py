@@ -0,0 +1,46 @@
+""" Compare traced and untraced runs of the timer benchmark.
+
+The timer of test_timer.py, with a signal counter, is simulated for a
+number of timesteps without tracing, with traceSignals in each trace
+format, and with a flight recorder of the last 10000 timesteps. The
+size of the trace file is shown as well.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from myhdl import Simulation, traceSignals
+
+from timer import timer_sig
+from test_timer import test_timer
+
+
+def run(duration, trace=None, ringsize=None):
+    if trace:
+        traceSignals.name = "perf_trace"
+        traceSignals.format = trace
+        traceSignals.ringsize = ringsize
+        dut = traceSignals(test_timer, timer_sig)
+    else:
+        dut = test_timer(timer_sig)
+    sim = Simulation(dut)
+    t = time.time()
+    sim.run(duration, quiet=1)
+    sim._finalize()
+    return time.time() - t
+
+
+if __name__ == '__main__':
+    duration = int(sys.argv[1]) if sys.argv[1:] else 1000000
+    t0 = run(duration)
+    print("untraced:   %.2f s" % t0)
+    for format in ('vcd', 'mwf'):
+        t1 = run(duration, format)
+        size = os.path.getsize("perf_trace." + format)
+        print("traced %s: %.2f s (%.2fx), %d bytes" %
+              (format, t1, t1 / t0, size))
+    t1 = run(duration, 'vcd', 10000)
+    print("recorder:   %.2f s (%.2fx)" % (t1, t1 / t0))
@@ -0,0 +1,54 @@
+""" Compare indexed vcd queries with a scan of the file.
+
+The timer benchmark of perf_trace.py is traced for a number of
+timesteps. The value of the counter at random times is then looked up
+with a VcdFile, and with a scan of the file for each lookup, as an ad
+hoc script would do.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+import random
+
+from myhdl import VcdFile
+
+from perf_trace import run
+
+
+def scan(path, code, t):
+    """ Return the value of a vector signal at time t """
+    val = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith("#"):
+                if int(line[1:]) > t:
+                    break
+            elif line.startswith("b"):
+                v, c = line[1:].split()
+                if c == code:
+                    val = int(v, 2)
+    return val
+
+
+if __name__ == '__main__':
+    duration = int(sys.argv[1]) if sys.argv[1:] else 1000000
+    run(duration, 'vcd')
+    random.seed(1)
+    times = [random.randrange(duration) for i in range(10000)]
+    t = time.time()
+    vcd = VcdFile("perf_trace.vcd")
+    tindex = time.time() - t
+    t = time.time()
+    values = [vcd.value_at("dut.count", q) for q in times]
+    tquery = (time.time() - t) / len(times)
+    code = vcd._codes["perf_trace.dut.count"]
+    t = time.time()
+    for q, v in zip(times[:20], values):
+        assert scan("perf_trace.vcd", code, q) == v
+    tscan = (time.time() - t) / 20
+    print("index:      %.2f s" % tindex)
+    print("value_at:   %.1f us per query" % (tquery * 1e6))
+    print("scan:       %.1f ms per query" % (tscan * 1e3))
+    print("break even: %d queries" % (tindex / tscan + 1))
@@ -0,0 +1,60 @@
+from __future__ import absolute_import
+import random
+from random import randrange
+random.seed(2)
+
+from myhdl import *
+from myhdl.conversion import verify
+
+OPCODE = bitslice(16, 12)
+REG = bitslice(12, 8)
+IMM = bitslice(8)
+
+def decoder(op, reg, imm, word, instr, clock, reset):
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        op.next = instr[OPCODE]
+        reg.next = instr[REG]
+        imm.next = instr[IMM]
+        word.next[REG] = instr[OPCODE]
+        word.next[IMM] = instr[IMM]
+
+    return logic
+
+
+def DecoderBench():
+
+    op = Signal(intbv(0)[4:])
+    reg = Signal(intbv(0)[4:])
+    imm = Signal(intbv(0)[8:])
+    word = Signal(intbv(0)[12:])
+    instr = Signal(intbv(0)[16:])
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, async=True)
+
+    dut = decoder(op, reg, imm, word, instr, clock, reset)
+    instrs = tuple([randrange(2**16) for i in range(100)])
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield delay(10)
+        reset.next = 0
+        for i in range(100):
+            instr.next = instrs[i]
+            yield delay(10)
+            clock.next = 1
+            yield delay(10)
+            clock.next = 0
+            print(op)
+            print(reg)
+            print(imm)
+            print(word)
+        raise StopSimulation
+
+    return dut, stimulus
+
+
+def test_bitslice():
+    assert verify(DecoderBench) == 0
@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+from myhdl import *
+from myhdl.conversion import verify
+
+
+def counter(count, clock, reset):
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        count.next = count + 1
+
+    return logic
+
+
+def ClockBench(period, duty, phase):
+
+    count = Signal(modbv(0)[8:])
+    clock = Clock(period, duty=duty, phase=phase)
+    reset = ResetSignal(0, active=1, async=False)
+
+    counter_inst = counter(count, clock, reset)
+
+    @instance
+    def monitor():
+        reset.next = 1
+        yield clock.negedge
+        reset.next = 0
+        for i in range(100):
+            yield clock.negedge
+            print(count)
+        raise StopSimulation()
+
+    return counter_inst, monitor
+
+
+def MultiClockBench():
+
+    fast = Clock(10)
+    slow = Clock(34, duty=0.25, phase=7)
+    nfast = Signal(intbv(0)[8:])
+    nslow = Signal(intbv(0)[8:])
+
+    @always(fast.posedge)
+    def countfast():
+        nfast.next = nfast + 1
+
+    @always(slow.posedge)
+    def countslow():
+        nslow.next = nslow + 1
+
+    @instance
+    def monitor():
+        for i in range(50):
+            yield slow.negedge
+            print(nfast)
+            print(nslow)
+        raise StopSimulation()
+
+    return countfast, countslow, monitor
+
+
+def test_clock():
+    assert verify(ClockBench, 10, 0.5, 0) == 0
+
+def test_clock_duty_phase():
+    assert verify(ClockBench, 20, 0.3, 5) == 0
+
+def test_multiclock():
+    assert verify(MultiClockBench) == 0
@@ -109,6 +109,24 @@ def incTask(count, enable, clock, reset, n):
     return incTaskGen
 
 
+def incFixed(count, enable, clock, reset, n):
+
+    @instance
+    def incFixedGen():
+        cnt = umodbv(0, 8)
+        while 1:
+            yield clock.posedge, reset.negedge
+            if reset == ACTIVE_LOW:
+                cnt[:] = 0
+                count.next = 0
+            else:
+                if enable:
+                    cnt += 1
+                count.next = cnt
+
+    return incFixedGen
+
+
 def incTaskFreeVar(count, enable, clock, reset, n):
     
     def incTaskFunc():
@@ -176,5 +194,8 @@ def testIncTask():
     
 def testIncFunc():
     assert verify(IncBench, incFunc) == 0
+
+def testIncFixed():
+    assert verify(IncBench, incFixed) == 0
     
 
@@ -71,6 +71,23 @@ def ram_deco2(dout, din, addr, we, clk, depth=128):
     return write, read
 
 
+def ram_memory(dout, din, addr, we, clk, depth=128):
+    """  Ram model with a Memory """
+
+    mem = Memory(intbv(0)[8:], depth)
+
+    @always(clk.posedge)
+    def write():
+        if we:
+            mem[int(addr)].next = din
+
+    @always_comb
+    def read():
+        dout.next = mem[int(addr)]
+
+    return write, read
+
+
 def ram2(dout, din, addr, we, clk, depth=128):
         
     memL = [Signal(intbv()[len(dout):]) for i in range(depth)]
@@ -138,6 +155,9 @@ def testram_deco1():
 def testram_deco2():
     assert conversion.verify(RamBench, ram_deco2) == 0
 
+def testram_memory():
+    assert conversion.verify(RamBench, ram_memory) == 0
+
 def testram_clocked():
     assert conversion.verify(RamBench, ram_clocked) == 0
     
@@ -0,0 +1,179 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for Clock """
+from __future__ import absolute_import
+
+
+import unittest
+from unittest import TestCase
+
+from myhdl import Clock, Signal, Simulation, StopSimulation, always, \
+                  instance, delay, now
+from myhdl._Clock import _error
+
+QUIET=1
+
+
+class ClockArgs(TestCase):
+
+    def testPeriod(self):
+        for period in (0, 1, -4, 10.0):
+            try:
+                Clock(period)
+            except ValueError as e:
+                self.assertEqual(str(e), _error.Period)
+            else:
+                self.fail()
+
+    def testDuty(self):
+        for duty in (0, 1, 0.01, 1.2):
+            try:
+                Clock(10, duty=duty)
+            except ValueError as e:
+                self.assertEqual(str(e), _error.Duty)
+            else:
+                self.fail()
+
+    def testPhase(self):
+        try:
+            Clock(10, phase=-1)
+        except ValueError as e:
+            self.assertEqual(str(e), _error.Phase)
+        else:
+            self.fail()
+
+    def testNextReadOnly(self):
+        clk = Clock(10)
+        try:
+            clk.next = 1
+        except AttributeError:
+            pass
+        else:
+            self.fail()
+
+
+class ClockWaveform(TestCase):
+
+    # a clock that the design only reaches through an attribute
+    attrclk = Clock(10, phase=5)
+
+    def bench(self, clk, nrEdges, rises, falls):
+
+        @instance
+        def monitor():
+            for i in range(nrEdges):
+                yield clk
+                if clk:
+                    rises.append(now())
+                else:
+                    falls.append(now())
+            raise StopSimulation()
+
+        return monitor
+
+    def check(self, period, duty, phase, high):
+        clk = Clock(period, duty=duty, phase=phase)
+        rises, falls = [], []
+        Simulation(self.bench(clk, 20, rises, falls)).run(quiet=QUIET)
+        self.assertEqual(rises, [phase + i*period for i in range(10)])
+        self.assertEqual(falls, [phase + high + i*period for i in range(10)])
+
+    def testDefault(self):
+        self.check(10, 0.5, 0, 5)
+
+    def testDuty(self):
+        self.check(20, 0.25, 0, 5)
+
+    def testPhase(self):
+        self.check(8, 0.5, 3, 4)
+
+    def testRoundHalfUp(self):
+        self.check(34, 0.25, 0, 9)
+
+    def testMatchesGenerator(self):
+        """ Clock edges coincide with a hand-written clock generator """
+        clk = Clock(10, phase=5)
+        ref = Signal(bool(0))
+        mismatches = []
+
+        @instance
+        def refgen():
+            while True:
+                yield delay(5)
+                ref.next = not ref
+
+        @instance
+        def check():
+            for i in range(20):
+                yield clk, ref
+                if clk != ref:
+                    mismatches.append(now())
+            raise StopSimulation()
+
+        Simulation(refgen, check).run(quiet=QUIET)
+        self.assertEqual(mismatches, [])
+
+    def testMultipleDomains(self):
+        fast = Clock(10)
+        slow = Clock(30, phase=2)
+        count = [0, 0]
+
+        @always(fast.posedge)
+        def countfast():
+            count[0] += 1
+
+        @always(slow.posedge)
+        def countslow():
+            count[1] += 1
+
+        Simulation(countfast, countslow).run(300, quiet=QUIET)
+        self.assertEqual(count, [31, 10])
+
+    def testAttributeClock(self):
+        """ A clock that is not passed to the design is driven as well """
+        clk = ClockWaveform.attrclk
+        for run in range(2):
+            rises, falls = [], []
+            Simulation(self.bench(clk, 4, rises, falls)).run(quiet=QUIET)
+            self.assertEqual(rises, [5, 15])
+            self.assertEqual(falls, [10, 20])
+
+    def testUnrelatedSimulation(self):
+        """ The clock of an earlier design does not keep a simulation on """
+        clk = Clock(10)
+        Simulation(self.bench(clk, 2, [], [])).run(quiet=QUIET)
+        def stimulus():
+            yield delay(100)
+        sim = Simulation(stimulus())
+        clk2 = Clock(10)
+        sim.run(quiet=QUIET)
+        self.assertEqual(now(), 100)
+
+    def testStrayClock(self):
+        """ A clock that nothing waits on does not keep a simulation on """
+        clk = Clock(10)
+        def stimulus():
+            yield delay(100)
+        Simulation(stimulus()).run(quiet=QUIET)
+        self.assertEqual(now(), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for Memory """
+from __future__ import absolute_import
+
+
+import random
+from random import randrange
+random.seed(1) # random, but deterministic
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, ResetSignal, Memory, Simulation, StopSimulation, \
+                  intbv, modbv, delay, instance, always_comb, always_seq
+from myhdl._simulator import _local
+
+
+def ram(dout, din, waddr, raddr, we, clk, rst, mem):
+
+    @always_seq(clk.posedge, reset=rst)
+    def write():
+        if we:
+            mem[waddr].next = din
+
+    @always_comb
+    def read():
+        dout.next = mem[raddr]
+
+    return write, read
+
+
+def run(mem, depth):
+    """ Return the outputs of a ram on a random stimulus """
+    dout = Signal(intbv(0)[8:])
+    din = Signal(intbv(0)[8:])
+    waddr = Signal(intbv(0, min=0, max=depth))
+    raddr = Signal(intbv(0, min=0, max=depth))
+    we = Signal(bool(0))
+    clk = Signal(bool(0))
+    rst = ResetSignal(0, active=1, async=False)
+    dut = ram(dout, din, waddr, raddr, we, clk, rst, mem)
+    outputs = []
+
+    @instance
+    def stimulus():
+        for i in range(200):
+            we.next = randrange(4) != 0
+            din.next = randrange(256)
+            waddr.next = randrange(depth)
+            raddr.next = randrange(depth)
+            rst.next = i == 100
+            yield delay(5)
+            clk.next = 1
+            yield delay(5)
+            clk.next = 0
+            outputs.append(int(dout))
+        raise StopSimulation
+
+    Simulation(dut, stimulus).run(quiet=1)
+    return outputs
+
+
+class MemoryTest(TestCase):
+
+    def testListOfSigs(self):
+        """ A Memory behaves as a list of signals """
+        depth = 16
+        random.seed(2)
+        expected = run([Signal(intbv(0)[8:]) for i in range(depth)], depth)
+        random.seed(2)
+        self.assertEqual(run(Memory(intbv(0)[8:], depth), depth), expected)
+
+    def testFlatArray(self):
+        mem = Memory(intbv(0)[8:], 1000)
+        self.assertEqual(mem._vals.itemsize, 1)
+        mem = Memory(intbv(0, min=-2**15, max=2**15), 1000)
+        self.assertEqual(mem._vals.itemsize, 2)
+        mem = Memory(intbv(0)[200:], 10)
+        self.assertTrue(isinstance(mem._vals, list))
+
+    def testArgs(self):
+        self.assertRaises(TypeError, Memory, intbv(0), 8)
+        self.assertRaises(TypeError, Memory, 0, 8)
+        self.assertRaises(ValueError, Memory, intbv(0)[8:], 0)
+
+    def testRead(self):
+        mem = Memory(intbv(5)[8:], 4)
+        self.assertEqual(len(mem), 4)
+        self.assertEqual(mem[2], 5)
+        self.assertEqual(mem[-1], 5)
+        self.assertEqual(mem[Signal(intbv(3)[2:])], 5)
+        self.assertEqual(len(mem[0]), 8)
+        self.assertEqual([int(w) for w in mem], [5, 5, 5, 5])
+        self.assertRaises(IndexError, mem.__getitem__, 4)
+
+    def testEvent(self):
+        """ Writes fire a single event with the changed indices """
+        mem = Memory(intbv(0)[8:], 64)
+        events = []
+
+        @instance
+        def write():
+            yield delay(10)
+            for i in (3, 7, 60):
+                mem[i].next = i
+            mem[5].next = 0 # no change
+            yield delay(10)
+            mem[2].next[4:] = 9
+            mem[2].next[7] = 1
+
+        @instance
+        def watch():
+            while 1:
+                yield mem
+                events.append((_local.context.time, mem.dirty, int(mem[2])))
+
+        Simulation(write, watch).run(30, quiet=1)
+        self.assertEqual(events, [(10, (3, 7, 60), 0), (20, (2,), 0x89)])
+
+    def testBounds(self):
+        mem = Memory(intbv(0)[4:], 4)
+        self.assertRaises(ValueError, setattr, mem[0], 'next', 16)
+        self.assertRaises(TypeError, setattr, mem[0], 'next', "1")
+        mem = Memory(modbv(0, min=0, max=16), 4)
+        mem[0].next = 17
+        self.assertEqual(mem._writes[0], 1)
+        mem._update()
+        self.assertEqual(mem[0], 1)
+
+    def testClear(self):
+        mem = Memory(intbv(1)[8:], 4)
+        mem[1].next = 2
+        mem._update()
+        mem._clear()
+        self.assertEqual([int(w) for w in mem], [1, 1, 1, 1])
+        self.assertEqual(mem.dirty, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
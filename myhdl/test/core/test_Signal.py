@@ -33,7 +33,7 @@ import copy
 import unittest
 from unittest import TestCase
 
-from myhdl._simulator import _siglist
+from myhdl import _simulator
 from myhdl import intbv, Signal
 from myhdl._compat import long
 
@@ -172,9 +172,9 @@ class SigTest(TestCase):
         s1.next = 0
         s1._update()
         s1.next = 1
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters + self.posedgeWaiters
         self.assertEqual(set(waiters), set(expected))
@@ -188,9 +188,9 @@ class SigTest(TestCase):
         s1.next = 1
         s1._update()
         s1.next = 0
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters + self.negedgeWaiters
         self.assertEqual(set(waiters), set(expected))
@@ -204,9 +204,9 @@ class SigTest(TestCase):
         s1.next = 4
         s1._update()
         s1.next = 5
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters
         self.assertEqual(set(waiters), set(expected))
@@ -220,9 +220,9 @@ class SigTest(TestCase):
         s1.next = 4
         s1._update()
         s1.next = 4
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         self.assertEqual(waiters, [])
         self.assertEqual(s1._eventWaiters, self.eventWaiters)
@@ -230,8 +230,13 @@ class SigTest(TestCase):
         self.assertEqual(s1._negedgeWaiters, self.negedgeWaiters)
     
     def testNextAccess(self):
-        """ each next attribute access puts a sig in a global siglist """
+        """ next attribute access puts a sig in the siglist once """
+        context = _simulator._context()
+        _siglist = context.siglist
+        for sig in _siglist:
+            sig._pending = False
         del _siglist[:]
+        context.nrDuplicates = 0
         s = [None] * 4
         for i in range(len(s)):
             s[i] = Signal(i)
@@ -241,8 +246,13 @@ class SigTest(TestCase):
         s[3].next = 0
         s[3].next = 1
         s[3].next = 3
-        for i in range(len(s)):
-            self.assertEqual(_siglist.count(s[i]), i)
+        self.assertEqual(_siglist.count(s[0]), 0)
+        for i in range(1, len(s)):
+            self.assertEqual(_siglist.count(s[i]), 1)
+        self.assertEqual(context.nrDuplicates, 3)
+        for sig in _siglist:
+            sig._pending = False
+        del _siglist[:]
             
     
 class TestSignalAsNum(TestCase):
@@ -626,7 +636,48 @@ class TestSignalIntbvBounds(TestCase):
                 pass
             else:
                 self.fail()
-            
+
+
+class TestSignalMemory(TestCase):
+
+    def testWaitersLazy(self):
+        s = Signal(bool(0))
+        self.assertFalse(s._watched)
+        s.next = 1
+        s._update()
+        self.assertFalse(s._watched)
+        w = s.posedge
+        self.assertTrue(s._watched)
+        self.assertTrue(s._posedgeWaiters is w)
+        self.assertEqual(s._eventWaiters, [])
+
+    def testSharedImmutable(self):
+        for v in (0, bool(1), None, "a"):
+            s = Signal(v)
+            self.assertTrue(s._val is s._init)
+            self.assertTrue(s._next is s._init)
+        s = Signal(intbv(0)[8:])
+        self.assertFalse(s._val is s._init)
+        self.assertFalse(s._next is s._val)
+
+    def testClear(self):
+        s = Signal(intbv(3)[8:])
+        s.next = 5
+        s._update()
+        s._clear()
+        self.assertEqual(s, 3)
+        self.assertFalse(s._val is s._init)
+        s = Signal(3)
+        s.next = 5
+        s._update()
+        s.posedge
+        s._clear()
+        self.assertEqual(s, 3)
+        self.assertEqual(s._posedgeWaiters, [])
+
+    def testIntbvSlots(self):
+        self.assertFalse(hasattr(intbv(0), '__dict__'))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -28,10 +28,9 @@ from random import randrange
 random.seed(1) # random, but deterministic
 
 from myhdl import Simulation, SimulationError, now, delay, StopSimulation, join
-from myhdl import Signal, intbv
+from myhdl import Signal, intbv, always_comb
 from myhdl._Simulation import _error
 
-from myhdl._simulator import _siglist
 
 QUIET=1
 
@@ -869,7 +868,214 @@ class TimeZeroEvents(TestCase):
         Simulation(testBench).run(quiet=QUIET)
 
 
-        
+class FutureEventOrder(TestCase):
+    """ Ordering of future events """
+
+    def testSameTimeOrder(self):
+        """ Events scheduled for the same time fire in scheduling order """
+        order = []
+        def waiter(i, d):
+            yield delay(d)
+            order.append(i)
+        def stimulus():
+            yield delay(100)
+        N = 50
+        gens = [waiter(i, (i % 5) * 10) for i in range(N)]
+        Simulation(gens, stimulus()).run(quiet=QUIET)
+        expected = []
+        for d in range(5):
+            expected.extend([i for i in range(N) if i % 5 == d])
+        self.assertEqual(order, expected)
+
+    def testManyPendingEvents(self):
+        """ Time advances monotonically with many pending events """
+        times = []
+        def waiter(d):
+            yield delay(d)
+            times.append(now())
+        delays = [randrange(1, 1000) for i in range(2000)]
+        Simulation([waiter(d) for d in delays]).run(quiet=QUIET)
+        self.assertEqual(times, sorted(delays))
+
+class DeltaStats(TestCase):
+    """ Deduplicated signal updates """
+
+    def test1(self):
+        """ Multiple writes in one delta cycle result in a single update """
+        a = Signal(intbv(0)[8:])
+        nrUpdates = []
+        def writer(i):
+            yield delay(10)
+            a.next = i
+            a.next[0] = 1
+        def monitor():
+            while 1:
+                yield a
+                nrUpdates.append(now())
+        sim = Simulation([writer(i) for i in range(4)], monitor())
+        sim.run(quiet=QUIET)
+        self.assertEqual(nrUpdates, [10])
+        stats = sim.deltaStats()
+        self.assertEqual(stats['deltas'], 1)
+        self.assertEqual(stats['updates'], 1)
+        self.assertEqual(stats['duplicates'], 7)
+
+
+def counterBench(period, count, trace):
+
+    sig = Signal(intbv(0)[16:])
+
+    def gen():
+        for i in range(count):
+            yield delay(period)
+            sig.next = sig + 1
+            trace.append(now())
+
+    def check():
+        while 1:
+            yield sig
+            if sig != len(trace):
+                raise ValueError("unexpected value %s" % sig)
+
+    return gen(), check()
+
+
+class SimulationContexts(TestCase):
+    """ Independent simulations coexist """
+
+    def testUpdateBetweenRuns(self):
+        """ A new simulation keeps the updates requested in another """
+        a = Signal(0)
+        log = []
+        def watch():
+            while 1:
+                yield a
+                log.append((now(), int(a)))
+        def tick():
+            while 1:
+                yield delay(10)
+        simA = Simulation(watch(), tick())
+        simA.run(20, quiet=QUIET)
+        a.next = 5
+        simB = Simulation(counterBench(1, 10, []))
+        simA.run(20, quiet=QUIET)
+        self.assertEqual(log, [(20, 5)])
+
+    def testInterleaved(self):
+        traceA, traceB = [], []
+        simA = Simulation(counterBench(3, 100, traceA))
+        simB = Simulation(counterBench(5, 100, traceB))
+        for i in range(4):
+            self.assertEqual(simA.run(30, quiet=QUIET), 1)
+            self.assertEqual(now(), 30*(i+1))
+            self.assertEqual(simB.run(50, quiet=QUIET), 1)
+            self.assertEqual(now(), 50*(i+1))
+        self.assertEqual(traceA, [3*(i+1) for i in range(40)])
+        self.assertEqual(traceB, [5*(i+1) for i in range(40)])
+        # finishing one simulation leaves the other one intact
+        self.assertEqual(simA.run(quiet=QUIET), 0)
+        self.assertEqual(simB.run(quiet=QUIET), 0)
+        self.assertEqual(len(traceA), 100)
+        self.assertEqual(traceB, [5*(i+1) for i in range(100)])
+
+    def testThreads(self):
+        import threading
+        results = {}
+
+        def worker(period):
+            trace = []
+            sim = Simulation(counterBench(period, 1000, trace))
+            sim.run(quiet=QUIET)
+            results[period] = (trace, now())
+
+        threads = [threading.Thread(target=worker, args=(p,))
+                   for p in (2, 3, 7)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for p in (2, 3, 7):
+            trace, end = results[p]
+            self.assertEqual(trace, [p*(i+1) for i in range(1000)])
+            self.assertEqual(end, 1000*p)
+
+
+class SignalRegistry(TestCase):
+    """ A simulation only handles the signals of its design """
+
+    def testDiscarded(self):
+        import gc
+        sigs = [Signal(intbv(0)[8:]) for i in range(1000)]
+        del sigs
+        gc.collect()
+        trace = []
+        sim = Simulation(counterBench(1, 10, trace))
+        # the signals of a discarded design are gone from the registry
+        self.assertTrue(len(sim._context.owned()) < 1000)
+        sim.run(quiet=QUIET)
+        self.assertEqual(len(trace), 10)
+
+    def testReuse(self):
+        sig = Signal(0)
+        def incr():
+            for i in range(3):
+                yield delay(1)
+                sig.next = sig + 1
+        def owns(sim, sig):
+            return any(s is sig for s in sim._context.owned())
+        for i in range(2):
+            sim = Simulation(incr())
+            self.assertTrue(owns(sim, sig))
+            sim.run(quiet=QUIET)
+            # the signal is cleared for the next simulation
+            self.assertEqual(sig, 0)
+        # the signals of a live simulation are left alone
+        other = Signal(0)
+        simA = Simulation(incr())
+        simB = Simulation(incr())
+        self.assertTrue(owns(simA, other))
+        self.assertFalse(owns(simB, other))
+
+    def testShadowOfUnfinished(self):
+        # the shadows of a design belong to it, whatever was elaborated
+        # or simulated in between
+        a = Signal(intbv(0)[8:])
+        b = Signal(intbv(0)[4:])
+        low = a(3, 0)
+        @always_comb
+        def logic():
+            b.next = low
+        trace = []
+        def stim():
+            yield delay(1)
+            a.next = 0x1d
+            yield delay(1)
+            trace.append(int(b))
+        unfinished = Simulation(counterBench(1, 10, []))
+        Simulation(logic, stim()).run(quiet=QUIET)
+        self.assertEqual(trace, [5])
+
+    def testOtherThread(self):
+        import threading
+        a = Signal(intbv(0)[8:])
+        b = Signal(intbv(0)[4:])
+        low = a(3, 0)
+        @always_comb
+        def logic():
+            b.next = low
+        trace = []
+        def stim():
+            yield delay(1)
+            a.next = 0x16
+            yield delay(1)
+            trace.append(int(b))
+        def worker():
+            Simulation(logic, stim()).run(quiet=QUIET)
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertEqual(trace, [6])
+
 if __name__ == "__main__":
     unittest.main()
                 
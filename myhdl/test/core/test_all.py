@@ -24,12 +24,19 @@ from __future__ import absolute_import
 import test_Simulation, test_Signal, test_intbv, test_Cosimulation, test_misc, \
        test_always_comb, test_bin, test_traceSignals, test_enum, test_concat, \
        test_inferWaiter, test_always, test_instance, test_signed, \
-       test_modbv
+       test_modbv, test_Clock, test_levelize, \
+       test_cycle, test_compiled, test_batch, test_profile, \
+       test_source, test_cache, test_extractHierarchy, \
+       test_import, test_Memory, test_fixedbv, test_bitslice, test_mwf, \
+       test_vcd
 
 modules = (test_Simulation, test_Signal, test_intbv, test_misc, test_always_comb,
            test_bin, test_traceSignals, test_enum, test_concat,
            test_inferWaiter, test_always, test_instance, test_signed,
-           test_modbv
+           test_modbv, test_Clock, test_levelize,
+           test_cycle, test_compiled, test_batch, test_profile,
+           test_source, test_cache, test_extractHierarchy, test_import,
+           test_Memory, test_fixedbv, test_bitslice, test_mwf, test_vcd
           )
 
 import unittest
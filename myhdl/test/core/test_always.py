@@ -35,8 +35,7 @@ from myhdl import Signal, Simulation, instances, AlwaysError, \
 from myhdl._always import always, _Always, _error
 
 from myhdl._Waiter import _inferWaiter, _Waiter
-from myhdl._Waiter import _SignalWaiter,_SignalTupleWaiter, _DelayWaiter, \
-                          _EdgeWaiter, _EdgeTupleWaiter
+from myhdl._Waiter import _DelayWaiter, _StaticWaiter
 
 
 QUIET=1
@@ -152,6 +151,15 @@ def GeneralFunc(a, b, c, d, r):
         r.next = a + b + c + d
 
     return logic
+
+
+def DelaySignalFunc(a, b, c, d, r):
+
+    @always(delay(3), d)
+    def logic():
+        r.next = a + b + c + d
+
+    return logic
     
 
 
@@ -185,11 +193,11 @@ class InferWaiterTest(TestCase):
         return inst_r, _Waiter(inst_s.gen), _Waiter(stimulus()), _Waiter(check())
 
     def testSignal1(self):
-        sim = Simulation(self.bench(SignalFunc1, _SignalWaiter))
+        sim = Simulation(self.bench(SignalFunc1, _StaticWaiter))
         sim.run()
         
     def testSignalTuple1(self):
-        sim = Simulation(self.bench(SignalTupleFunc1, _SignalTupleWaiter))
+        sim = Simulation(self.bench(SignalTupleFunc1, _StaticWaiter))
         sim.run()
 
     def testDelay(self):
@@ -197,15 +205,19 @@ class InferWaiterTest(TestCase):
         sim.run()
 
     def testEdge1(self):
-        sim = Simulation(self.bench(EdgeFunc1, _EdgeWaiter))
+        sim = Simulation(self.bench(EdgeFunc1, _StaticWaiter))
         sim.run()
         
     def testEdgeTuple1(self):
-        sim = Simulation(self.bench(EdgeTupleFunc1, _EdgeTupleWaiter))
+        sim = Simulation(self.bench(EdgeTupleFunc1, _StaticWaiter))
         sim.run()
         
     def testGeneral(self):
-        sim = Simulation(self.bench(GeneralFunc, _Waiter))
+        sim = Simulation(self.bench(GeneralFunc, _StaticWaiter))
+        sim.run()
+
+    def testDelaySignal(self):
+        sim = Simulation(self.bench(DelaySignalFunc, _Waiter))
         sim.run()
 
 
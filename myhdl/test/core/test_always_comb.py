@@ -34,7 +34,7 @@ from myhdl import Signal, Simulation, instances, AlwaysCombError, \
 
 from myhdl._always_comb import always_comb, _AlwaysComb, _error
 
-from myhdl._Waiter import _Waiter,_SignalWaiter,_SignalTupleWaiter
+from myhdl._Waiter import _Waiter, _StaticWaiter
 
 
 QUIET=1
@@ -416,14 +416,47 @@ class InferWaiterTest(TestCase):
         return inst_r, _Waiter(inst_s.gen), _Waiter(stimulus()), _Waiter(check())
 
     def testSignal1(self):
-        sim = Simulation(self.bench(SignalGen1, _SignalWaiter))
+        sim = Simulation(self.bench(SignalGen1, _StaticWaiter))
         sim.run()
         
     def testSignalTuple1(self):
-        sim = Simulation(self.bench(SignalTupleGen1, _SignalTupleWaiter))
+        sim = Simulation(self.bench(SignalTupleGen1, _StaticWaiter))
         sim.run()
 
 
 
+class StaticSensitivityTest(TestCase):
+
+    def testSubscription(self):
+        """ A wide always_comb subscribes once and runs once per delta """
+        inputs = [Signal(intbv(0)[8:]) for i in range(40)]
+        r = Signal(intbv(0)[14:])
+        count = [0]
+
+        @always_comb
+        def logic():
+            count[0] += 1
+            r.next = sum(inputs)
+
+        def stimulus():
+            for i in range(1, 10):
+                for s in inputs:
+                    s.next = i
+                yield delay(10)
+                for s in inputs:
+                    self.assertEqual(len(s._eventWaiters), 0)
+                    self.assertEqual(s._eventWaiters.subscribers,
+                                     [logic.waiter])
+                self.assertEqual(r, 40*i)
+            raise StopSimulation
+
+        Simulation(logic, stimulus()).run(quiet=QUIET)
+        self.assertEqual(count[0], 10)
+        # cleaned up for a new simulation
+        for s in inputs:
+            self.assertEqual(s._eventWaiters.subscribers, ())
+        self.assertFalse(logic.waiter.subscribed)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,272 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for batch simulation """
+from __future__ import absolute_import
+
+
+from random import randrange
+import unittest
+from unittest import TestCase
+
+from myhdl import Clock, Signal, ResetSignal, Simulation, BatchSimulation, \
+                  SimulationError, StopSimulation, intbv, modbv, concat, \
+                  always, always_comb, always_seq, instance
+from myhdl._batch import _error, _importNumPy
+
+QUIET=1
+
+WIDTH = 8
+SQUARES = tuple([(i * i) % 64 for i in range(16)])
+NRLANES = 6
+NRCYCLES = 60
+
+
+def design(q, r, flag, a, b, clock, reset):
+
+    count = Signal(modbv(0, min=0, max=2**WIDTH))
+    mix = Signal(intbv(0)[WIDTH+2:])
+    ones = Signal(intbv(0, min=0, max=WIDTH+1))
+
+    @always_comb
+    def logic():
+        if a > b:
+            mix.next = a - b
+        elif a[0]:
+            mix.next = concat(a[4:], b[2:]) + SQUARES[b[4:]]
+        else:
+            mix.next = ~a
+        flag.next = a[WIDTH-1] and not b[0]
+
+    @always_comb
+    def popcount():
+        n = 0
+        for i in range(WIDTH):
+            if a[i]:
+                n += 1
+        ones.next = n
+
+    @always_seq(clock.posedge, reset=reset)
+    def counter():
+        count.next = count + ones
+        if flag:
+            q.next = (count ^ mix[WIDTH:]) % 200
+        r.next = int(mix[WIDTH+2:2]) // 3 if flag or ones > 4 else len(mix)
+
+    return logic, popcount, counter
+
+
+def makeSignals(isasync):
+    q = Signal(intbv(0)[WIDTH:])
+    r = Signal(intbv(0)[WIDTH:])
+    flag = Signal(bool(0))
+    a = Signal(intbv(0)[WIDTH:])
+    b = Signal(intbv(0)[WIDTH:])
+    clock = Clock(10, phase=5)
+    reset = ResetSignal(0, active=1, async=isasync)
+    return q, r, flag, a, b, clock, reset
+
+
+def scalarRun(vectors, isasync):
+    """ Simulate a single lane with the event-driven kernel """
+    q, r, flag, a, b, clock, reset = sigs = makeSignals(isasync)
+    dut = design(*sigs)
+    trace = []
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield clock.negedge
+        for av, bv, rv in vectors:
+            a.next = av
+            b.next = bv
+            reset.next = rv
+            yield clock.negedge
+            trace.append((int(q), int(r), int(flag)))
+        raise StopSimulation()
+
+    Simulation(dut, stimulus).run(quiet=QUIET)
+    return trace
+
+
+def batchRun(lanes, isasync):
+    """ Simulate all lanes at once """
+    q, r, flag, a, b, clock, reset = sigs = makeSignals(isasync)
+    sim = BatchSimulation(design(*sigs), lanes=len(lanes))
+    sim[reset] = 1
+    sim.step()
+    traces = [[] for lane in lanes]
+    for i in range(NRCYCLES):
+        sim[a] = [lane[i][0] for lane in lanes]
+        sim[b] = [lane[i][1] for lane in lanes]
+        sim[reset] = [lane[i][2] for lane in lanes]
+        sim.step()
+        for trace, qv, rv, fv in zip(traces, sim[q], sim[r], sim[flag]):
+            trace.append((int(qv), int(rv), int(fv)))
+    return traces
+
+
+@unittest.skipIf(not _importNumPy(), "NumPy not available")
+class BatchSimulationTest(TestCase):
+
+    def compare(self, isasync):
+        lanes = [[(randrange(256), randrange(256), randrange(10) == 0)
+                  for i in range(NRCYCLES)]
+                 for k in range(NRLANES)]
+        traces = batchRun(lanes, isasync)
+        for vectors, trace in zip(lanes, traces):
+            self.assertEqual(trace, scalarRun(vectors, isasync))
+
+    def testSyncReset(self):
+        self.compare(False)
+
+    def testAsyncReset(self):
+        self.compare(True)
+
+    def testValues(self):
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[5:])
+        @always_comb
+        def logic():
+            q.next = a + 1
+        sim = BatchSimulation(logic, lanes=3)
+        sim[a] = [1, 5, 15]
+        self.assertEqual(list(sim[q]), [2, 6, 16])
+        sim[a] = 7
+        self.assertEqual(list(sim[q]), [8, 8, 8])
+
+    def testWideProduct(self):
+        a = Signal(intbv(0)[31:])
+        b = Signal(intbv(0)[31:])
+        q = Signal(intbv(0)[31:])
+        @always_comb
+        def logic():
+            q.next = (a * b)[62:31]
+        sim = BatchSimulation(logic, lanes=2)
+        sim[a] = [2**31 - 1, 12345]
+        sim[b] = [2**31 - 3, 67890]
+        self.assertEqual(list(sim[q]), [((2**31 - 1) * (2**31 - 3)) >> 31,
+                                        (12345 * 67890) >> 31])
+
+    def testBounds(self):
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[4:])
+        @always_comb
+        def logic():
+            q.next = a + 1
+        sim = BatchSimulation(logic, lanes=3)
+        sim[a] = [1, 15, 2]
+        self.assertRaises(ValueError, sim.__getitem__, q)
+
+
+@unittest.skipIf(not _importNumPy(), "NumPy not available")
+class BatchSimulationErrorTest(TestCase):
+
+    def check(self, kind, *args):
+        try:
+            BatchSimulation(*args, lanes=4)
+        except SimulationError as e:
+            self.assertEqual(e.kind, kind)
+        else:
+            self.fail()
+
+    def testArgType(self):
+        a = Signal(bool(0))
+        @instance
+        def stimulus():
+            yield a
+        self.check(_error.ArgType, stimulus)
+
+    def testTwoClocks(self):
+        clock1, clock2 = Signal(bool(0)), Signal(bool(0))
+        a, b = Signal(bool(0)), Signal(bool(0))
+        @always(clock1.posedge)
+        def logic1():
+            a.next = not a
+        @always(clock2.posedge)
+        def logic2():
+            b.next = not b
+        self.check(_error.NrOfClocks, logic1, logic2)
+
+    def testUnsupported(self):
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[4:])
+        @always_comb
+        def logic():
+            for i in range(4):
+                if a[i]:
+                    break
+            q.next = i
+        self.check(_error.Unsupported, logic)
+
+    def testWideValue(self):
+        a = Signal(intbv(0)[40:])
+        b = Signal(intbv(0)[40:])
+        q = Signal(intbv(0)[40:])
+        @always_comb
+        def logic():
+            q.next = (a * b)[80:40]
+        self.check(_error.Unsupported, logic)
+
+    def testWideVariable(self):
+        a = Signal(intbv(0)[16:])
+        q = Signal(intbv(0)[16:])
+        @always_comb
+        def logic():
+            p = 1
+            for i in range(5):
+                p *= a
+            q.next = p & 0xffff
+        self.check(_error.Unsupported, logic)
+
+    def testCombCycle(self):
+        a = Signal(bool(0))
+        b = Signal(bool(0))
+        @always_comb
+        def logic1():
+            a.next = not b
+        @always_comb
+        def logic2():
+            b.next = a
+        self.check(_error.CombCycle, logic1, logic2)
+
+    def testDriven(self):
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[4:])
+        @always_comb
+        def logic():
+            q.next = a
+        sim = BatchSimulation(logic, lanes=2)
+        try:
+            sim[q] = 1
+        except SimulationError as e:
+            self.assertEqual(e.kind, _error.Driven)
+        else:
+            self.fail()
+
+    def testLanes(self):
+        a, b = Signal(bool(0)), Signal(bool(0))
+        @always_comb
+        def logic():
+            a.next = b
+        self.assertRaises(SimulationError, BatchSimulation, logic, lanes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for bitslice """
+from __future__ import absolute_import
+
+
+import random
+from random import randrange
+random.seed(1) # random, but deterministic
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, intbv, modbv, umodbv, bitslice, concat
+
+
+class TestBitslice(TestCase):
+
+    def testArgs(self):
+        self.assertRaises(TypeError, bitslice, 4.0, 2)
+        self.assertRaises(ValueError, bitslice, 4, -1)
+        self.assertRaises(ValueError, bitslice, 4, 4)
+        s = bitslice(8, 3)
+        self.assertEqual(len(s), 5)
+        self.assertEqual(repr(s), "bitslice(8, 3)")
+        self.assertEqual(len(bitslice(8)), 8)
+
+    def testGetItem(self):
+        """ x[s] has the value of x[i:j] """
+        for i, j in ((8, 0), (16, 12), (40, 3), (1, 0)):
+            s = bitslice(i, j)
+            for k in range(50):
+                v = randrange(-2**45, 2**45)
+                for x in (intbv(v), modbv(v), Signal(intbv(v))):
+                    self.assertEqual(x[s], x[i:j])
+                    self.assertEqual(type(x[s]), type(x[i:j]))
+                    self.assertEqual(len(x[s]), len(x[i:j]))
+                    self.assertEqual(x[s].min, 0)
+                    self.assertEqual(x[s].max, 2**(i-j))
+
+    def testConcat(self):
+        x = intbv(0x1234)[16:]
+        y = concat(x[bitslice(8)], x[bitslice(16, 8)])
+        self.assertEqual(y, 0x3412)
+        self.assertEqual(len(y), 16)
+        y = concat(Signal(modbv(0xab)[8:])[bitslice(4)], True)
+        self.assertEqual(y, 0x17)
+        self.assertEqual(len(y), 5)
+
+    def testSetItem(self):
+        """ x[s] = v has the effect of x[i:j] = v """
+        for i, j in ((8, 0), (16, 12), (40, 3), (1, 0)):
+            s = bitslice(i, j)
+            for k in range(50):
+                v = randrange(2**45)
+                f = randrange(-2**(i-j)-1, 2**(i-j)+1)
+                ref, x = intbv(v), intbv(v)
+                try:
+                    ref[i:j] = f
+                except ValueError:
+                    self.assertRaises(ValueError, x.__setitem__, s, f)
+                else:
+                    x[s] = f
+                    self.assertEqual(x, ref)
+
+    def testBounds(self):
+        x = intbv(0)[8:]
+        x[bitslice(8, 4)] = 15
+        self.assertEqual(x, 0xf0)
+        x = intbv(0, min=0, max=100)
+        self.assertRaises(ValueError, x.__setitem__, bitslice(8, 4), 15)
+        x = umodbv(0xff, 8)
+        self.assertEqual(x[bitslice(6, 2)], 0xf)
+
+    def testSignal(self):
+        s = Signal(intbv(0)[16:])
+        s.next[bitslice(12, 8)] = 5
+        s._update()
+        self.assertEqual(s, 0x500)
+        self.assertEqual(s[bitslice(12, 4)], 0x50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the on-disk source analysis cache """
+from __future__ import absolute_import
+
+
+import os
+import sys
+import ast
+import shutil
+import tempfile
+import linecache
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal
+from myhdl import _cache
+from myhdl.cache import main
+from myhdl._util import _getSource, _sources
+
+
+source = """\
+# -*- coding: utf-8 -*-
+from myhdl import always_comb
+
+def comb(q, x, y):
+
+    @always_comb
+    def logic():
+        # %s
+        q.next = x %s y
+
+    return logic
+"""
+
+
+class DiskCacheTest(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cachedir = os.path.join(self.dir, 'cache')
+        self.path = os.path.join(self.dir, 'design.py')
+        self.write('+')
+        _cache.setCacheDir(self.cachedir)
+
+    def tearDown(self):
+        _cache.setCacheDir(None)
+        _sources.clear()
+        linecache.checkcache(self.path)
+        shutil.rmtree(self.dir)
+
+    def write(self, op, comment="sum"):
+        with open(self.path, 'wb') as f:
+            f.write((source % (comment, op)).encode('utf-8'))
+        linecache.checkcache(self.path)
+
+    def comb(self):
+        ns = {}
+        with open(self.path, 'rb') as f:
+            exec(compile(f.read(), self.path, 'exec'), ns)
+        return ns['comb'](Signal(0), Signal(0), Signal(0))
+
+    def restart(self):
+        """ Drop the in-process state, as a new process would start """
+        _cache.flush()
+        _sources.clear()
+        _cache._files.clear()
+
+    def testReuse(self):
+        inst = self.comb()
+        src = _getSource(inst.func)
+        tree = ast.dump(src.parse())
+        results = dict(src.results)
+        self.assertTrue(results)
+        self.restart()
+        self.assertEqual(len(os.listdir(self.cachedir)), 1)
+        inst = self.comb()
+        src = _getSource(inst.func)
+        self.assertTrue(src.entry.ast is not None)
+        self.assertEqual(dict(src.results), results)
+        self.assertEqual(ast.dump(src.parse()), tree)
+        self.assertEqual(inst.inputs, set(['x', 'y']))
+        self.assertEqual(inst.outputs, set(['q']))
+
+    def testInvalidate(self):
+        inst = self.comb()
+        src = _getSource(inst.func)
+        self.assertTrue("+" in src.text)
+        digest = src.entry.file.digest
+        self.restart()
+        self.write('-')
+        inst = self.comb()
+        src = _getSource(inst.func)
+        self.assertTrue("-" in src.text)
+        self.assertNotEqual(src.entry.file.digest, digest)
+        self.assertEqual(len(os.listdir(self.cachedir)), 1)
+
+    def testNonAscii(self):
+        self.write('+', comment=u"Registre \u00e0 d\u00e9calage")
+        self.comb()
+        self.restart()
+        inst = self.comb()
+        src = _getSource(inst.func)
+        self.assertTrue(src.entry.ast is not None)
+        self.assertEqual(inst.inputs, set(['x', 'y']))
+
+    def testOtherPython(self):
+        """ Each Python version keeps its own cache file """
+        self.comb()
+        self.restart()
+        name = os.listdir(self.cachedir)[0]
+        tag = ".py%d%d." % sys.version_info[:2]
+        self.assertTrue(tag in name)
+        # the file of an interpreter of another version
+        other = os.path.join(self.cachedir, name.replace(tag, ".py00."))
+        shutil.copy(os.path.join(self.cachedir, name), other)
+        with open(other, 'rb') as f:
+            data = f.read()
+        self.write('-')
+        self.comb()
+        self.restart()
+        self.assertEqual(len(os.listdir(self.cachedir)), 2)
+        with open(other, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def testCorrupt(self):
+        self.comb()
+        self.restart()
+        for name in os.listdir(self.cachedir):
+            with open(os.path.join(self.cachedir, name), 'wb') as f:
+                f.write(b"garbage")
+        inst = self.comb()
+        self.assertEqual(inst.inputs, set(['x', 'y']))
+
+    def testWarmAndClear(self):
+        _cache.setCacheDir(None)
+        main(['-d', self.cachedir, 'warm', self.dir])
+        self.assertEqual(len(os.listdir(self.cachedir)), 1)
+        _cache.setCacheDir(self.cachedir)
+        _sources.clear()
+        inst = self.comb()
+        src = _getSource(inst.func)
+        self.assertTrue(src.entry.ast is not None)
+        self.assertTrue('names' in src.results)
+        self.assertTrue('attrRefs' in src.results)
+        main(['-d', self.cachedir, 'clear'])
+        self.assertEqual(os.listdir(self.cachedir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the compiled simulation backend """
+from __future__ import absolute_import
+
+
+import random
+from random import randrange
+import unittest
+from unittest import TestCase
+
+from myhdl import Clock, Signal, ResetSignal, Simulation, SimulationError, \
+                  StopSimulation, intbv, modbv, concat, enum, always_comb, \
+                  always_seq, instance, now
+from myhdl._compiled import _error, _checker
+
+QUIET=1
+
+WIDTH = 8
+SQUARES = tuple([(i * i) % 64 for i in range(16)])
+
+
+def design(q, r, s, flag, a, b, c, clock, reset):
+
+    count = Signal(modbv(0, min=0, max=2**WIDTH))
+    mix = Signal(intbv(0)[WIDTH+2:])
+    ones = Signal(intbv(0, min=0, max=WIDTH+1))
+
+    @always_comb
+    def logic():
+        if a > b:
+            mix.next = a - b
+        elif a[0]:
+            mix.next = concat(a[4:], b[2], c) + SQUARES[b[4:]]
+        else:
+            mix.next = ~a
+        flag.next = a[WIDTH-1] and not b[0]
+
+    @always_comb
+    def popcount():
+        n = 0
+        for i in range(WIDTH):
+            if a[i]:
+                n += 1
+        ones.next = n
+
+    @always_seq(clock.posedge, reset=reset)
+    def counter():
+        count.next = count + ones
+        q.next = (count ^ mix[WIDTH:]) % 200
+        r.next = int(mix[WIDTH+2:2]) // 3 if flag else len(mix)
+
+    @always_comb
+    def output():
+        s.next = q * 3 - r
+
+    return logic, popcount, counter, output
+
+
+def bench(trace):
+
+    q = Signal(intbv(0)[WIDTH:])
+    r = Signal(intbv(0)[WIDTH:])
+    s = Signal(intbv(0, min=-2**10, max=2**10))
+    flag = Signal(bool(0))
+    a = Signal(intbv(0)[WIDTH:])
+    b = Signal(intbv(0)[WIDTH:])
+    c = Signal(bool(0))
+    clock = Clock(10, phase=5)
+    reset = ResetSignal(0, active=1, async=False)
+
+    dut = design(q, r, s, flag, a, b, c, clock, reset)
+    vectors = [(randrange(256), randrange(256), randrange(2))
+               for i in range(200)]
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield clock.negedge
+        reset.next = 0
+        for av, bv, cv in vectors:
+            a.next = av
+            b.next = bv
+            c.next = cv
+            yield clock.negedge
+            trace.append((now(), int(q), int(r), int(s), bool(flag)))
+        raise StopSimulation()
+
+    return dut, stimulus
+
+
+class CompiledBackendTest(TestCase):
+
+    def compare(self, backend, mode="event"):
+        state = random.getstate()
+        ref = []
+        Simulation(bench(ref)).run(quiet=QUIET)
+        random.setstate(state)
+        res = []
+        dut = bench(res)
+        sim = Simulation(dut, mode=mode, backend=backend)
+        self.assertEqual(len(sim._compiled), 4)
+        sim.run(quiet=QUIET)
+        self.assertEqual(res, ref)
+        self.assertEqual(len(res), 200)
+
+    def testCompiled(self):
+        self.compare("compiled")
+
+    def testCheck(self):
+        self.compare("check")
+
+    def testCycleMode(self):
+        self.compare("compiled", mode="cycle")
+
+    def testRestore(self):
+        trace = []
+        dut = bench(trace)
+        funcs = [b.func for b in dut[0]]
+        sim = Simulation(dut, backend="compiled")
+        self.assertNotEqual([b.func for b in dut[0]], funcs)
+        sim.run(quiet=QUIET)
+        self.assertEqual([b.func for b in dut[0]], funcs)
+
+    def testRerun(self):
+        """ The same instances are simulated again with each backend """
+        q, r = Signal(intbv(0)[WIDTH:]), Signal(intbv(0)[WIDTH:])
+        s = Signal(intbv(0, min=-2**10, max=2**10))
+        flag = Signal(bool(0))
+        a, b = Signal(intbv(0)[WIDTH:]), Signal(intbv(0)[WIDTH:])
+        c = Signal(bool(0))
+        clock = Clock(10, phase=5)
+        reset = ResetSignal(0, active=1, async=False)
+        dut = design(q, r, s, flag, a, b, c, clock, reset)
+        originals = [block.func for block in dut]
+        vectors = [(randrange(256), randrange(256), randrange(2))
+                   for i in range(50)]
+
+        def stimulus(trace):
+            reset.next = 1
+            yield clock.negedge
+            reset.next = 0
+            for av, bv, cv in vectors:
+                a.next = av
+                b.next = bv
+                c.next = cv
+                yield clock.negedge
+                trace.append((int(q), int(r), int(s), bool(flag)))
+            raise StopSimulation()
+
+        def recorder(func, calls):
+            def record():
+                calls.add(func)
+                func()
+            return record
+
+        ref = None
+        for backend in ("python", "compiled", "check", "python"):
+            trace = []
+            sim = Simulation(dut, stimulus(trace), backend=backend)
+            funcs = [block.func for block in dut]
+            if backend == "python":
+                self.assertEqual(funcs, originals)
+            else:
+                self.assertTrue(set(funcs).isdisjoint(originals))
+            calls = set()
+            for block in dut:
+                block.func = recorder(block.func, calls)
+            sim.run(quiet=QUIET)
+            # the functions that ran are those of this backend
+            self.assertEqual(calls, set(funcs))
+            for block, func in zip(dut, originals):
+                block.func = func
+            if ref is None:
+                ref = trace
+            self.assertEqual(trace, ref)
+            self.assertEqual(len(trace), 50)
+
+    def testFallback(self):
+        """ Blocks outside the supported subset run as written """
+        t_state = enum('IDLE', 'RUN')
+        state = Signal(t_state.IDLE)
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[4:])
+        log = []
+
+        @always_comb
+        def logic():
+            if state == t_state.RUN:
+                q.next = a
+            else:
+                q.next = 0
+
+        @instance
+        def stimulus():
+            a.next = 5
+            state.next = t_state.RUN
+            yield a
+            yield q
+            log.append(int(q))
+
+        sim = Simulation(logic, stimulus, backend="compiled")
+        self.assertEqual(sim._compiled, [])
+        sim.run(quiet=QUIET)
+        self.assertEqual(log, [5])
+
+    def testBounds(self):
+        a = Signal(intbv(0)[4:])
+        q = Signal(intbv(0)[4:])
+
+        @always_comb
+        def logic():
+            q.next = a + 8
+
+        @instance
+        def stimulus():
+            a.next = 9
+            yield a
+
+        sim = Simulation(logic, stimulus, backend="compiled")
+        self.assertEqual(len(sim._compiled), 1)
+        self.assertRaises(ValueError, sim.run, quiet=QUIET)
+
+    def testMismatch(self):
+        q = Signal(intbv(0)[4:])
+        def func():
+            q.next = 3
+        def compute():
+            return (4,)
+        check = _checker(func, compute, [("q", q)])
+        try:
+            check()
+        except SimulationError as e:
+            self.assertEqual(e.kind, _error.Mismatch)
+        else:
+            self.fail()
+
+    def testBackend(self):
+        try:
+            Simulation(backend="native")
+        except SimulationError:
+            pass
+        else:
+            self.fail()
+
+
+if __name__ == "__main__":
+    unittest.main()
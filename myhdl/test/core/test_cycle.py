@@ -0,0 +1,194 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for cycle-based simulation """
+from __future__ import absolute_import
+
+
+import random
+from random import randrange
+import unittest
+from unittest import TestCase
+
+from myhdl import Clock, Signal, ResetSignal, Simulation, SimulationError, \
+                  StopSimulation, intbv, always, always_comb, \
+                  always_seq, instance, delay, now
+from myhdl._cycle import _error
+
+QUIET=1
+
+
+def design(q, acc, d, en, clock, reset):
+
+    count = Signal(intbv(0)[8:])
+    nxt = Signal(intbv(0)[8:])
+
+    @always_comb
+    def inc():
+        nxt.next = (count + 1) % 256
+
+    @always_seq(clock.posedge, reset=reset)
+    def counter():
+        if en:
+            count.next = nxt
+
+    @always_comb
+    def output():
+        q.next = count ^ d
+
+    @always(clock.posedge)
+    def accumulate():
+        acc.next = (acc + q) % 1000
+
+    return inc, counter, output, accumulate
+
+
+def bench(trace, isasync=False):
+
+    q = Signal(intbv(0)[8:])
+    acc = Signal(intbv(0)[10:])
+    d = Signal(intbv(0)[8:])
+    en = Signal(bool(0))
+    clock = Clock(10, phase=5)
+    reset = ResetSignal(0, active=1, async=isasync)
+
+    dut = design(q, acc, d, en, clock, reset)
+    vectors = [(randrange(256), randrange(2), randrange(8) == 0)
+               for i in range(200)]
+
+    @instance
+    def stimulus():
+        reset.next = 1
+        yield clock.negedge
+        reset.next = 0
+        for dv, ev, rv in vectors:
+            d.next = dv
+            en.next = ev
+            reset.next = rv
+            yield clock.negedge
+            trace.append((now(), int(q), int(acc)))
+        raise StopSimulation()
+
+    return dut, stimulus
+
+
+class CycleModeTest(TestCase):
+
+    def compare(self, isasync):
+        state = random.getstate()
+        ref = []
+        Simulation(bench(ref, isasync)).run(quiet=QUIET)
+        random.setstate(state)
+        res = []
+        sim = Simulation(bench(res, isasync), mode="cycle")
+        sim.run(quiet=QUIET)
+        self.assertEqual(res, ref)
+        self.assertEqual(len(res), 200)
+
+    def testSyncReset(self):
+        self.compare(False)
+
+    def testAsyncReset(self):
+        self.compare(True)
+
+    def testDuration(self):
+        trace = []
+        sim = Simulation(bench(trace), mode="cycle")
+        self.assertEqual(sim.run(102, quiet=QUIET), 1)
+        self.assertEqual(now(), 102)
+        self.assertEqual(len(trace), 9)
+        self.assertEqual(sim.run(quiet=QUIET), 0)
+        self.assertEqual(len(trace), 200)
+
+
+class CycleModeErrorTest(TestCase):
+
+    def tick(self, clock):
+        @always(clock.posedge)
+        def tick():
+            pass
+        return tick
+
+    def check(self, kind, *args):
+        try:
+            Simulation(*args, mode="cycle")
+        except SimulationError as e:
+            self.assertEqual(e.kind, kind)
+        else:
+            self.fail()
+
+    def testNoClock(self):
+        a = Signal(bool(0))
+        @always(a.posedge)
+        def logic():
+            pass
+        self.check(_error.NrOfClocks, logic)
+
+    def testTwoClocks(self):
+        clock1, clock2 = Clock(10), Clock(14)
+        self.check(_error.NrOfClocks, self.tick(clock1), self.tick(clock2))
+
+    def testOtherEdge(self):
+        clock = Clock(10)
+        a = Signal(bool(0))
+        b = Signal(bool(0))
+        @always_seq(a.posedge, reset=None)
+        def logic():
+            b.next = not b
+        self.check(_error.ClockEdge, self.tick(clock), logic)
+
+    def testAlwaysDelay(self):
+        clock = Clock(10)
+        @always(delay(10))
+        def logic():
+            pass
+        self.check(_error.Delay, self.tick(clock), logic)
+
+    def testInstanceDelay(self):
+        clock = Clock(10)
+        @instance
+        def stimulus():
+            yield delay(10)
+        self.check(_error.WaitClause, self.tick(clock), stimulus)
+
+    def testWaitOtherEdge(self):
+        clock = Clock(10)
+        a = Signal(bool(0))
+        @instance
+        def stimulus():
+            yield a.posedge
+        sim = Simulation(self.tick(clock), stimulus, mode="cycle")
+        try:
+            sim.run(quiet=QUIET)
+        except SimulationError as e:
+            self.assertEqual(e.kind, _error.WaitClause)
+        else:
+            self.fail()
+
+    def testMode(self):
+        try:
+            Simulation(mode="cycles")
+        except SimulationError:
+            pass
+        else:
+            self.fail()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for hierarchy extraction """
+from __future__ import absolute_import
+
+
+import sys
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, intbv, always, always_comb, instances
+from myhdl import _extractHierarchy
+from myhdl._extractHierarchy import _HierExtr
+from myhdl._simulator import _pending
+
+
+def inc(q, d):
+
+    @always_comb
+    def logic():
+        q.next = d + 1
+
+    return logic
+
+
+def reg(q, d, clk):
+
+    @always(clk.posedge)
+    def logic():
+        q.next = d
+
+    return logic
+
+
+def stage(q, d, clk):
+    n = Signal(intbv(0)[8:])
+    u_inc = inc(n, d)
+    u_reg = reg(q, n, clk)
+    return u_inc, u_reg
+
+
+def pipeline(q, d, clk, depth):
+    # a helper that is not a block, between the top and the stages
+    sigs = [Signal(intbv(0)[8:]) for i in range(depth - 1)]
+    ins = [d] + sigs
+    outs = sigs + [q]
+    return [stage(outs[i], ins[i], clk) for i in range(depth)]
+
+
+def top():
+    clk = Signal(bool(0))
+    d = Signal(intbv(0)[8:])
+    q = Signal(intbv(0)[8:])
+    stages = pipeline(q, d, clk, 3)
+    u_out = inc(Signal(intbv(0)[8:]), q)
+    return instances()
+
+
+def summary(h):
+    return [(inst.level, inst.name, h.absnames[id(inst.obj)],
+             sorted(inst.sigdict), sorted(inst.memdict))
+            for inst in h.hierarchy]
+
+
+class HierExtrTest(TestCase):
+
+    def tearDown(self):
+        _pending().hierarchy = None
+
+    def extract(self, monitoring):
+        saved = _extractHierarchy._monitoring
+        if not monitoring:
+            _extractHierarchy._monitoring = None
+        try:
+            return _HierExtr("top", top)
+        finally:
+            _extractHierarchy._monitoring = saved
+
+    def testProfile(self):
+        h = self.extract(monitoring=False)
+        self.assertEqual(h.hierarchy[0].level, 1)
+        names = [inst.name for inst in h.hierarchy]
+        self.assertEqual(names.count("u_inc"), 3)
+        self.assertTrue("stages_0" in names)
+        self.assertTrue("u_out" in names)
+        self.assertEqual(sys.getprofile(), None)
+
+    def testProfileError(self):
+        """ The profile hook is released when elaboration fails """
+        def bad():
+            u_inc = inc(Signal(intbv(0)[8:]), Signal(intbv(0)[8:]))
+            raise ValueError
+        _extractHierarchy._monitoring, saved = None, _extractHierarchy._monitoring
+        try:
+            self.assertRaises(ValueError, _HierExtr, "top", bad)
+        finally:
+            _extractHierarchy._monitoring = saved
+        self.assertEqual(sys.getprofile(), None)
+
+    @unittest.skipUnless(hasattr(sys, 'monitoring'), "needs sys.monitoring")
+    def testMonitoring(self):
+        expected = summary(self.extract(monitoring=False))
+        self.assertEqual(summary(self.extract(monitoring=True)), expected)
+        # the hook is released, and can be set up again
+        self.assertEqual(sys.monitoring.get_tool(sys.monitoring.PROFILER_ID),
+                         None)
+        self.assertEqual(summary(self.extract(monitoring=True)), expected)
+
+    @unittest.skipUnless(hasattr(sys, 'monitoring'), "needs sys.monitoring")
+    def testToolInUse(self):
+        """ Fall back to the profile hook when the tool id is taken """
+        tool = sys.monitoring.PROFILER_ID
+        sys.monitoring.use_tool_id(tool, "other")
+        try:
+            expected = summary(self.extract(monitoring=False))
+            self.assertEqual(summary(self.extract(monitoring=True)), expected)
+        finally:
+            sys.monitoring.free_tool_id(tool)
+
+
+if __name__ == "__main__":
+    unittest.main()
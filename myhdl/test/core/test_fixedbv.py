@@ -0,0 +1,164 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the fixed-width bit vectors """
+from __future__ import absolute_import
+
+
+import random
+from random import randrange
+random.seed(1) # random, but deterministic
+import unittest
+from unittest import TestCase
+from copy import copy, deepcopy
+
+from myhdl import Signal, intbv, modbv, concat, \
+                  uintbv, sintbv, umodbv, smodbv
+
+
+class TestFixedRange(TestCase):
+
+    def testUnsigned(self):
+        for cls in (uintbv, umodbv):
+            a = cls(5, 8)
+            self.assertEqual(a, 5)
+            self.assertEqual((a.min, a.max, len(a)), (0, 256, 8))
+            self.assertTrue(a._hasFullRange())
+
+    def testSigned(self):
+        for cls in (sintbv, smodbv):
+            a = cls(-5, 8)
+            self.assertEqual(a, -5)
+            self.assertEqual((a.min, a.max, len(a)), (-128, 128, 8))
+            self.assertTrue(a._hasFullRange())
+
+    def testIntbvArg(self):
+        a = uintbv(intbv(3)[2:], 8)
+        self.assertEqual((a, len(a)), (3, 8))
+
+    def testArgs(self):
+        self.assertRaises(ValueError, uintbv, 0, 0)
+        self.assertRaises(ValueError, sintbv, 0, 4.0)
+        self.assertRaises(TypeError, umodbv, "1", 4)
+        self.assertRaises(TypeError, smodbv, None, 4)
+
+    def testRepr(self):
+        self.assertEqual(repr(uintbv(5, 8)), "uintbv(5, 8)")
+        self.assertEqual(repr(smodbv(-1, 4)), "smodbv(-1, 4)")
+
+    def testCopy(self):
+        for a in (uintbv(5, 8), sintbv(-5, 6), umodbv(1, 3), smodbv(2, 4)):
+            for b in (copy(a), deepcopy(a)):
+                self.assertTrue(type(b) is type(a))
+                self.assertFalse(b is a)
+                self.assertEqual((b._val, b._min, b._max, b._nrbits, b._mask),
+                                 (a._val, a._min, a._max, a._nrbits, a._mask))
+
+
+class TestFixedBounds(TestCase):
+
+    """ The bounds are handled as for intbv and modbv with the same range """
+
+    def check(self, cls, ref, nrbits, min, max):
+        for i in range(100):
+            v = randrange(2*min-3, 2*max+3)
+            try:
+                r = ref(v, min=min, max=max)
+            except ValueError:
+                self.assertRaises(ValueError, cls, v, nrbits)
+                a = cls(0, nrbits)
+                self.assertRaises(ValueError, a.__iadd__, v)
+            else:
+                self.assertEqual(cls(v, nrbits), r)
+                a = cls(0, nrbits)
+                a += v
+                self.assertEqual(a, r)
+                a = cls(0, nrbits)
+                a[:] = v
+                self.assertEqual(a, r)
+
+    def testUnsigned(self):
+        for n in (1, 4, 8, 33, 70):
+            self.check(uintbv, intbv, n, 0, 2**n)
+
+    def testSigned(self):
+        for n in (1, 4, 8, 33, 70):
+            self.check(sintbv, intbv, n, -2**(n-1), 2**(n-1))
+
+    def testUnsignedWrap(self):
+        for n in (1, 4, 8, 33, 70):
+            self.check(umodbv, modbv, n, 0, 2**n)
+
+    def testSignedWrap(self):
+        for n in (1, 4, 8, 33, 70):
+            self.check(smodbv, modbv, n, -2**(n-1), 2**(n-1))
+
+
+class TestFixedOps(TestCase):
+
+    def testBitwise(self):
+        """ Bitwise operators return unsized intbv or modbv values """
+        a = uintbv(0x5a, 8)
+        for r in (a & 0xf, 0xf & a, a | 1, 1 | a, a ^ 3, 3 ^ a, a >> 1):
+            self.assertTrue(type(r) is intbv)
+            self.assertEqual(r._nrbits, 0)
+        self.assertEqual(a & 0xf, 0xa)
+        self.assertEqual(3 ^ a, 0x59)
+        self.assertEqual(a >> 1, 0x2d)
+        b = umodbv(0x5a, 8)
+        self.assertTrue(type(b & 1) is modbv)
+
+    def testInvert(self):
+        a = uintbv(0x5a, 8)
+        self.assertEqual(~a, 0xa5)
+        self.assertTrue(type(~a) is uintbv)
+        b = sintbv(5, 4)
+        self.assertEqual(~b, -6)
+        self.assertTrue(type(~b) is sintbv)
+
+    def testSlice(self):
+        a = umodbv(0xab, 8)
+        self.assertEqual(a[4:], 0xb)
+        self.assertTrue(type(a[4:]) is modbv)
+        self.assertEqual(uintbv(0xab, 8)[8:4], 0xa)
+
+    def testSignal(self):
+        s = Signal(uintbv(0, 4))
+        self.assertTrue(s._type is intbv)
+        self.assertEqual(len(s), 4)
+        s.next = 15
+        s._update()
+        self.assertEqual(s, 15)
+        self.assertRaises(ValueError, setattr, s, 'next', 16)
+        w = Signal(smodbv(0, 4))
+        w.next = 8
+        w._update()
+        self.assertEqual(w, -8)
+        w.next[3:] = 7
+        w._update()
+        self.assertEqual(w, -1)
+
+    def testConcat(self):
+        a = concat(uintbv(5, 4), sintbv(-1, 3), True)
+        self.assertEqual(len(a), 8)
+        self.assertEqual(a, 0x5f)
+
+
+if __name__ == "__main__":
+    unittest.main()
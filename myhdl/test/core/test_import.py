@@ -0,0 +1,74 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the lazy import of the conversion modules """
+from __future__ import absolute_import
+
+
+import os
+import sys
+import subprocess
+import unittest
+from unittest import TestCase
+
+import myhdl
+from myhdl import conversion
+
+
+def run(statement):
+    """ Run statement in a fresh interpreter; return its output """
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(myhdl.__file__)))
+    env['PYTHONPATH'] = root
+    out = subprocess.check_output([sys.executable, '-c', statement], env=env)
+    return out.decode().strip()
+
+
+class LazyImportTest(TestCase):
+
+    def testImport(self):
+        out = run("import sys; from myhdl import *; "
+                  "print(sorted(m for m in sys.modules "
+                  "if m.startswith('myhdl.conversion.')))")
+        self.assertEqual(out, "[]")
+
+    def testNumPy(self):
+        out = run("import sys; from myhdl import *; "
+                  "print('numpy' in sys.modules)")
+        self.assertEqual(out, "False")
+
+    def testLoad(self):
+        out = run("import sys; from myhdl import toVHDL; "
+                  "print(toVHDL.name); "
+                  "print('myhdl.conversion._toVHDL' in sys.modules)")
+        self.assertEqual(out.split(), ["None", "True"])
+
+    def testProxy(self):
+        from myhdl.conversion._toVerilog import toVerilog
+        self.assertTrue(myhdl.toVerilog is conversion.toVerilog)
+        myhdl.toVerilog.name = "top"
+        try:
+            self.assertEqual(toVerilog.name, "top")
+        finally:
+            myhdl.toVerilog.name = None
+        self.assertEqual(toVerilog.name, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
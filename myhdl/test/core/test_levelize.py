@@ -0,0 +1,165 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for levelized always_comb scheduling """
+from __future__ import absolute_import
+
+
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, Simulation, StopSimulation, intbv, always_comb, \
+                  instance, delay, now
+from myhdl._levelize import _LevelWaiter
+
+QUIET=1
+
+
+def incrementer(y, x, count):
+
+    @always_comb
+    def logic():
+        count[0] += 1
+        y.next = x + 1
+
+    return logic
+
+
+def adder(z, x, y, count):
+
+    @always_comb
+    def logic():
+        count[0] += 1
+        z.next = x + y
+
+    return logic
+
+
+def nor(z, x, y):
+
+    @always_comb
+    def logic():
+        z.next = not (x or y)
+
+    return logic
+
+
+class LevelizeTest(TestCase):
+
+    def testChain(self):
+        """ A chain of blocks settles in a single delta cycle """
+        depth = 20
+        sigs = [Signal(intbv(0, min=0, max=100)) for i in range(depth+1)]
+        count = [0]
+        chain = [incrementer(sigs[i+1], sigs[i], count) for i in range(depth)]
+        events = []
+
+        @instance
+        def monitor():
+            while True:
+                yield sigs[-1]
+                events.append((now(), int(sigs[-1])))
+
+        @instance
+        def stimulus():
+            for i in range(1, 6):
+                yield delay(10)
+                sigs[0].next = i
+            yield delay(10)
+            raise StopSimulation()
+
+        sim = Simulation(chain, monitor, stimulus)
+        self.assertEqual(len([w for w in sim._waiters
+                              if isinstance(w, _LevelWaiter)]), depth)
+        sim.run(quiet=QUIET)
+        self.assertEqual(events, [(0, depth)] +
+                         [(10*i, depth+i) for i in range(1, 6)])
+        self.assertEqual(count[0], 6*depth)
+        # the chain settles in the delta cycle of each stimulus update
+        self.assertEqual(sim.deltaStats()['deltas'], 5)
+
+    def testReconvergent(self):
+        """ A block with reconvergent inputs is evaluated once """
+        a, b, c = [Signal(intbv(0)[8:]) for i in range(3)]
+        count = [0, 0]
+        insts = [adder(c, a, b, count), incrementer(b, a, count[1:])]
+        values = []
+
+        @instance
+        def stimulus():
+            for i in range(10):
+                a.next = i
+                yield delay(10)
+                values.append(int(c))
+            raise StopSimulation()
+
+        Simulation(insts, stimulus).run(quiet=QUIET)
+        self.assertEqual(values, [2*i+1 for i in range(10)])
+        self.assertEqual(count[0], 10)
+
+    def testReuse(self):
+        """ Blocks can be reused while an earlier simulation is unfinished """
+        a, b, c = [Signal(intbv(0)[8:]) for i in range(3)]
+        count = [0, 0]
+        insts = [incrementer(b, a, count), incrementer(c, a, count[1:])]
+        values = []
+
+        def stimulus():
+            for i in range(5):
+                a.next = i
+                yield delay(10)
+                values.append((int(b), int(c)))
+
+        first = Simulation(insts, stimulus())
+        first.run(15, quiet=QUIET)
+        sim = Simulation(insts, stimulus())
+        waiters = [i.waiter for i in insts]
+        self.assertEqual([w for w in sim._waiters
+                          if isinstance(w, _LevelWaiter)], waiters)
+        del values[:]
+        sim.run(quiet=QUIET)
+        self.assertEqual(values, [(i+1, i+1) for i in range(5)])
+
+    def testCycle(self):
+        """ A combinational cycle remains event-driven """
+        s, r, q, qn = [Signal(bool(0)) for i in range(4)]
+        y = Signal(intbv(0)[4:])
+        count = [0]
+        insts = [nor(q, r, qn), nor(qn, s, q), incrementer(y, q, count)]
+        values = []
+
+        @instance
+        def stimulus():
+            for sv, rv in ((1, 0), (0, 0), (0, 1), (0, 0), (1, 0)):
+                s.next = sv
+                r.next = rv
+                yield delay(10)
+                values.append((int(q), int(qn), int(y)))
+            raise StopSimulation()
+
+        sim = Simulation(insts, stimulus)
+        self.assertEqual(len([w for w in sim._waiters
+                              if isinstance(w, _LevelWaiter)]), 0)
+        sim.run(quiet=QUIET)
+        self.assertEqual(values, [(1, 0, 2), (1, 0, 2), (0, 1, 1),
+                                  (0, 1, 1), (1, 0, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
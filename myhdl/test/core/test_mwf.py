@@ -0,0 +1,147 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the mwf waveform format """
+from __future__ import absolute_import
+
+import os
+import glob
+import unittest
+from unittest import TestCase
+
+from myhdl import delay, Signal, Simulation, _simulator, instance, intbv, \
+     enum, MwfFile, mwf2vcd
+from myhdl._traceSignals import traceSignals, TraceSignalsError, _error
+from myhdl._mwf import lzma
+
+QUIET=1
+
+t_State = enum('IDLE', 'RUN')
+
+def count(q, b, s):
+    @instance
+    def logic():
+        for i in range(100):
+            yield delay(10)
+            q.next = i + 1
+            b.next = (i % 3 == 0)
+            s.next = t_State.RUN if i % 2 else t_State.IDLE
+    return logic
+
+def trace(format, compression='zlib', blocksize=None):
+    q = Signal(intbv(0)[8:])
+    b = Signal(bool(0))
+    s = Signal(t_State.IDLE)
+    traceSignals.format = format
+    traceSignals.compression = compression
+    try:
+        dut = traceSignals(count, q, b, s)
+    finally:
+        traceSignals.format = 'vcd'
+        traceSignals.compression = 'zlib'
+    if blocksize is not None:
+        _simulator._pending().tf.blocksize = blocksize
+    Simulation(dut).run(quiet=QUIET)
+
+
+class TestMwf(TestCase):
+
+    def setUp(self):
+        self.tearDown()
+
+    def tearDown(self):
+        for context in (_simulator._context(), _simulator._pending()):
+            if context.tracing:
+                context.tf.close()
+                context.tracing = 0
+        for p in glob.glob("count.*") + glob.glob("copy.vcd"):
+            os.remove(p)
+
+    def codes(self, mwf):
+        return dict(mwf.scopes[0]['vars'])
+
+    def testVcdConversion(self):
+        """ The converted mwf file is the vcd file of the simulation """
+        trace('vcd')
+        with open("count.vcd") as f:
+            ref = f.read()
+        trace('mwf')
+        mwf2vcd("count.mwf", "copy.vcd")
+        with open("copy.vcd") as f:
+            vcd = f.read()
+        self.assertEqual(vcd.split("$version")[1], ref.split("$version")[1])
+
+    def testValues(self):
+        trace('mwf', blocksize=16)
+        mwf = MwfFile("count.mwf")
+        self.assertTrue(len(mwf.blocks) > 10)
+        codes = self.codes(mwf)
+        self.assertEqual(mwf.signals[codes['q']], dict(kind='vec', width=8))
+        for t in (0, 5, 10, 333, 500, 995, 1000, 2000):
+            vals = mwf.values(t)
+            i = min(t // 10, 100)
+            self.assertEqual(vals[codes['q']], i)
+            self.assertEqual(vals[codes['b']], int(i > 0 and (i-1) % 3 == 0))
+            self.assertEqual(vals[codes['s']],
+                             "RUN" if i > 0 and (i-1) % 2 else "IDLE")
+
+    def testChanges(self):
+        trace('mwf', blocksize=16)
+        mwf = MwfFile("count.mwf")
+        q = self.codes(mwf)['q']
+        changes = [(t, val) for t, k, val in mwf.changes(255, 300) if k == q]
+        self.assertEqual(changes, [(255, 25)] +
+                                  [(t, t // 10) for t in range(260, 301, 10)])
+        changes = [(t, val) for t, k, val in mwf.changes() if k == q]
+        self.assertEqual(changes, [(t, t // 10) for t in range(0, 1001, 10)])
+
+    def testNoCompression(self):
+        trace('mwf', compression=None)
+        mwf = MwfFile("count.mwf")
+        self.assertEqual(mwf.values(500)[self.codes(mwf)['q']], 50)
+
+    @unittest.skipIf(lzma is None, "lzma is not available")
+    def testLzma(self):
+        trace('mwf', compression='lzma')
+        mwf = MwfFile("count.mwf")
+        self.assertEqual(mwf.values(500)[self.codes(mwf)['q']], 50)
+
+    def testFormat(self):
+        try:
+            trace('fst')
+        except TraceSignalsError as e:
+            self.assertEqual(e.kind, _error.Format)
+        else:
+            self.fail()
+
+    def testCompression(self):
+        try:
+            trace('mwf', compression='bz2')
+        except TraceSignalsError as e:
+            self.assertEqual(e.kind, _error.Compression)
+        else:
+            self.fail()
+
+    def testNotMwf(self):
+        trace('vcd')
+        self.assertRaises(ValueError, MwfFile, "count.vcd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the simulation profiler """
+from __future__ import absolute_import
+
+
+import json
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, Simulation, SimulationError, intbv, delay, \
+                  always, always_comb, instance
+from myhdl._compat import StringIO
+from myhdl._extractHierarchy import _HierExtr
+from myhdl._simulator import _pending
+
+QUIET=1
+
+NRCYCLES = 10
+
+
+def acc(q, d, clk):
+
+    n = Signal(intbv(0)[8:])
+
+    @always_comb
+    def comb():
+        n.next = (q + d) % 256
+
+    @always(clk.posedge)
+    def seq():
+        q.next = n
+
+    return comb, seq
+
+
+def top():
+
+    clk = Signal(bool(0))
+    q = Signal(intbv(0)[8:])
+    d = Signal(intbv(0)[8:])
+    u = acc(q, d, clk)
+
+    @instance
+    def stim():
+        for i in range(NRCYCLES):
+            d.next = i + 1
+            clk.next = 1
+            yield delay(5)
+            clk.next = 0
+            yield delay(5)
+
+    return u, stim
+
+
+class ProfileTest(TestCase):
+
+    def tearDown(self):
+        _pending().hierarchy = None
+
+    def profile(self):
+        h = _HierExtr("top", top)
+        sim = Simulation(h.top, profile=True)
+        sim.run(quiet=QUIET)
+        return sim.profile.stats()
+
+    def testProcesses(self):
+        stats = self.profile()
+        counts = dict((d['name'], d['activations'])
+                      for d in stats['processes'])
+        self.assertEqual(counts, {'top_stim': 2 * NRCYCLES + 1,
+                                  'top_u_comb': 2 * NRCYCLES,
+                                  'top_u_seq': NRCYCLES + 1})
+        times = [d['time'] for d in stats['processes']]
+        self.assertEqual(times, sorted(times, reverse=True))
+
+    def testSignals(self):
+        stats = self.profile()
+        updates = dict((d['name'], d['updates']) for d in stats['signals'])
+        self.assertEqual(updates, {'top_clk': 2 * NRCYCLES,
+                                   'top_d': NRCYCLES,
+                                   'top_q': NRCYCLES,
+                                   'top_u_n': 2 * NRCYCLES})
+
+    def testTimesteps(self):
+        stats = self.profile()
+        timesteps = stats['timesteps']
+        self.assertEqual([d['time'] for d in timesteps],
+                         list(range(0, 10 * NRCYCLES + 1, 5)))
+        events = sum(d['events'] for d in timesteps)
+        self.assertEqual(events,
+                         sum(d['activations'] for d in stats['processes']) +
+                         sum(d['updates'] for d in stats['signals']))
+
+    def testAnonymous(self):
+        sim = Simulation(top(), profile=True)
+        sim.run(quiet=QUIET)
+        names = [d['name'] for d in sim.profile.stats()['processes']]
+        self.assertEqual(sorted(names), ['comb', 'seq', 'stim'])
+
+    def testReportAndDump(self):
+        h = _HierExtr("top", top)
+        sim = Simulation(h.top, profile=True)
+        sim.run(quiet=QUIET)
+        f = StringIO()
+        sim.profile.report(f)
+        self.assertTrue('top_u_comb' in f.getvalue())
+        f = StringIO()
+        sim.profile.dump(f)
+        self.assertEqual(json.loads(f.getvalue()), sim.profile.stats())
+
+    def testRestore(self):
+        u, stim = top()
+        gen = stim.waiter.generator
+        sim = Simulation(u, stim, profile=True)
+        self.assertNotEqual(stim.waiter.generator, gen)
+        sim.run(quiet=QUIET)
+        self.assertEqual(stim.waiter.generator, gen)
+
+    def testOff(self):
+        sim = Simulation(top())
+        self.assertEqual(sim.profile, None)
+        self.assertEqual(type(sim._context.siglist), list)
+
+    def testCycleMode(self):
+        self.assertRaises(SimulationError, Simulation, top(),
+                          mode="cycle", profile=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
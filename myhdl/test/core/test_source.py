@@ -0,0 +1,139 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the source cache used during elaboration """
+from __future__ import absolute_import
+
+
+import gc
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from myhdl import Signal, delay, always_comb, instance
+from myhdl._util import _getSource, _sources
+from myhdl._resolverefs import _resolveRefs, _AttrRefTransformer, _Data
+from myhdl._Waiter import _SignalWaiter, _Waiter
+
+
+class Bus(object):
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+
+def comb(q, x, y):
+
+    @always_comb
+    def logic():
+        q.next = x + y
+
+    return logic
+
+
+def combBus(q, bus):
+
+    @always_comb
+    def logic():
+        q.next = bus.a + bus.b
+
+    return logic
+
+
+def waiter(x):
+
+    @instance
+    def logic():
+        while 1:
+            yield x
+
+    return logic
+
+
+class SourceCacheTest(TestCase):
+
+    def testShared(self):
+        inst = comb(Signal(0), Signal(0), Signal(0))
+        src = _getSource(inst.func)
+        results = dict(src.results)
+        insts = [comb(Signal(0), Signal(0), Signal(0)) for i in range(20)]
+        for inst in insts:
+            self.assertTrue(_getSource(inst.func) is src)
+        self.assertTrue(_getSource(inst.func.__code__) is src)
+        self.assertEqual(src.results, results)
+
+    def testBinding(self):
+        """ The same code with another binding of its names """
+        q, x, y = Signal(0), Signal(0), Signal(0)
+        inst = comb(q, x, y)
+        self.assertEqual(inst.inputs, set(['x', 'y']))
+        self.assertEqual(set(map(id, inst.senslist)), set([id(x), id(y)]))
+        q, x = Signal(0), Signal(0)
+        inst = comb(q, x, 3)
+        self.assertEqual(inst.inputs, set(['x']))
+        self.assertEqual(inst.outputs, set(['q']))
+        self.assertEqual(inst.senslist, (x,))
+
+    def testAttrRefs(self):
+        for i in range(3):
+            bus = Bus(Signal(0), Signal(0))
+            inst = combBus(Signal(0), bus)
+            self.assertEqual(inst.inputs, set(['bus.a', 'bus.b']))
+            self.assertEqual(set(map(id, inst.senslist)),
+                             set([id(bus.a), id(bus.b)]))
+            self.assertEqual(sorted(inst.objlist), ['bus.a', 'bus.b'])
+
+    def testResolveRefs(self):
+        bus = Bus(Signal(0), Bus(Signal(0), Signal(0)))
+        inst = combBus(Signal(0), bus)
+        symdict = dict(bus=bus)
+        data = _Data()
+        data.symdict = dict(symdict)
+        _AttrRefTransformer(data).visit(_getSource(inst.func).parse())
+        self.assertEqual(_resolveRefs(symdict, inst), data.objlist)
+        self.assertEqual(symdict, data.symdict)
+
+    def testWaiter(self):
+        self.assertTrue(isinstance(waiter(Signal(0)).waiter, _SignalWaiter))
+        inst = waiter(delay(10))
+        self.assertEqual(type(inst.waiter), _Waiter)
+        self.assertTrue(isinstance(waiter(Signal(0)).waiter, _SignalWaiter))
+
+    def testRelease(self):
+        """ Sources are dropped with their code objects """
+        fd, path = tempfile.mkstemp(suffix=".py")
+        os.write(fd, b"def f():\n    pass\n")
+        os.close(fd)
+        try:
+            ns = {}
+            exec(compile(open(path).read(), path, "exec"), ns)
+            code = ns['f'].__code__
+            self.assertTrue(_getSource(code).text.startswith("def f"))
+            key = id(code)
+            self.assertTrue(key in _sources)
+            del ns, code
+            gc.collect()
+            self.assertFalse(key in _sources)
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,7 +33,8 @@ from unittest import TestCase
 import shutil
 import glob
 
-from myhdl import delay, Signal, Simulation, _simulator, instance
+from myhdl import delay, Signal, Simulation, _simulator, instance, intbv, \
+     always, start_trace, stop_trace, dump_trace, modbv
 from myhdl._traceSignals import traceSignals, TraceSignalsError, _error
 
 QUIET=1
@@ -56,6 +57,115 @@ def dummy():
     inst = gen(clk)
     return 1
 
+def deltas(x, y):
+    @instance
+    def logic():
+        for v in (1, 3, -3, 5):
+            yield delay(10)
+            x.next = v
+            yield x
+            x.next = v + 1
+            y.next = not y
+    return logic
+
+def zeroDelays(x, y):
+    @instance
+    def logic():
+        yield delay(0)
+        for v in (1, 3, -3, 5):
+            yield delay(10)
+            x.next = v
+            yield delay(0)
+            x.next = v + 1
+            yield delay(0)
+            y.next = not y
+    return logic
+
+def leaf(clk, q):
+    r = Signal(intbv(0)[4:])
+    @always(clk.posedge)
+    def logic():
+        r.next = (r + 1) % 16
+        q.next = r
+    return logic
+
+def node(clk, q):
+    a = Signal(intbv(0)[4:])
+    u = leaf(clk, a)
+    @always(clk.posedge)
+    def logic():
+        q.next = a
+    return u, logic
+
+def tree(clk, q, b):
+    m1 = node(clk, q)
+    m2 = node(clk, b)
+    return m1, m2
+
+def clocked(n, stop=None, start=None):
+    clk = Signal(bool(0))
+    q = Signal(intbv(0)[4:])
+    b = Signal(intbv(0)[4:])
+    dut = traceSignals(tree, clk, q, b)
+    @instance
+    def clkgen():
+        for i in range(n):
+            yield delay(5)
+            clk.next = not clk
+            if i == stop:
+                stop_trace()
+            if i == start:
+                start_trace()
+    Simulation(dut, clkgen).run(quiet=QUIET)
+    return clk, q, b
+
+def counter(clk, q, r, n):
+    @always(clk.posedge)
+    def logic():
+        q.next = q + 1
+        r.next = -r - 1 if r > -5 else 3
+        assert q < n
+    return logic
+
+def recorded(n, limit=100, dump=False, stop=None, start=None):
+    clk = Signal(bool(0))
+    q = Signal(modbv(0)[6:])
+    r = Signal(intbv(0, min=-8, max=8))
+    dut = traceSignals(counter, clk, q, r, limit)
+    @instance
+    def clkgen():
+        for i in range(n):
+            yield delay(5)
+            clk.next = not clk
+            if i == stop:
+                stop_trace()
+            if i == start:
+                start_trace()
+        if dump:
+            yield delay(1)
+            dump_trace()
+    Simulation(dut, clkgen).run(quiet=QUIET)
+
+def history(p):
+    """ Return the values of a vcd file, as a list of (time, value) tuples
+    for each signal name, without the time stamps that have no change """
+    with open(p) as f:
+        lines = f.read().split("\n")
+    names = dict((l.split()[3], l.split()[4]) for l in lines
+                 if l.startswith("$var"))
+    values = dict((n, []) for n in names.values())
+    t = 0
+    for l in lines[lines.index("$enddefinitions $end")+1:]:
+        if l.startswith("#"):
+            t = int(l[1:])
+        elif l and not l.startswith("$"):
+            if l[0] in "bs":
+                v, code = l[1:].split()
+            else:
+                v, code = l[0], l[1:]
+            values[names[code]].append((t, v))
+    return values
+
 def top():
     inst = traceSignals(fun)
     return inst
@@ -82,10 +192,14 @@ class TestTraceSigs(TestCase):
             os.remove(p)
 
     def tearDown(self):
+        traceSignals.scopes = traceSignals.signals = None
+        traceSignals.depth = traceSignals.window = None
+        traceSignals.ringsize = None
         paths = glob.glob("*.vcd") + glob.glob("*.vcd.*")
-        if _simulator._tracing:
-            _simulator._tf.close()
-            _simulator._tracing = 0
+        for context in (_simulator._context(), _simulator._pending()):
+            if context.tracing:
+                context.tf.close()
+                context.tracing = 0
         for p in paths:
             os.remove(p)
 
@@ -143,19 +257,182 @@ class TestTraceSigs(TestCase):
         p = "%s.vcd" % fun.__name__
         dut = traceSignals(fun)
         Simulation(dut).run(1000, quiet=QUIET)
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        _simulator._context().tf.close()
+        _simulator._context().tracing = 0
         size = path.getsize(p)
         pbak = p + '.' + str(path.getmtime(p))
         self.assertTrue(not path.exists(pbak))
         dut = traceSignals(fun)
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        _simulator._pending().tf.close()
+        _simulator._pending().tracing = 0
         self.assertTrue(path.exists(p))
         self.assertTrue(path.exists(pbak))
         self.assertTrue(path.getsize(pbak) == size)
         self.assertTrue(path.getsize(p) < size)
 
+    def checkChanges(self, func):
+        x = Signal(intbv(0, min=-8, max=8))
+        y = Signal(bool(0))
+        dut = traceSignals(func, x, y)
+        Simulation(dut).run(quiet=QUIET)
+        with open("%s.vcd" % func.__name__) as f:
+            lines = f.read().split("\n")
+        codes = dict((l.split()[4], l.split()[3]) for l in lines
+                     if l.startswith("$var"))
+        x, y = codes['x'], codes['y']
+        lines = lines[lines.index("$dumpvars")+1:]
+        self.assertEqual(sorted(lines[:2]), sorted(["b0000 " + x, "0" + y]))
+        self.assertEqual(lines[2:], ["$end",
+                                     "#10", "b0010 " + x, "1" + y,
+                                     "#20", "b0100 " + x, "0" + y,
+                                     "#30", "b1110 " + x, "1" + y,
+                                     "#40", "b0110 " + x, "0" + y, ""])
+
+    def testOneChangePerTimestep(self):
+        """ A signal is written once per timestep, with its final value """
+        self.checkChanges(deltas)
+
+    def testZeroDelay(self):
+        """ A delay(0) does not start a new timestep """
+        self.checkChanges(zeroDelays)
+
+    def vcd(self):
+        """ Return the scopes, with their signal names, and the changes """
+        with open("tree.vcd") as f:
+            lines = f.read().split("\n")
+        scopes = []
+        stack = []
+        for l in lines:
+            if l.startswith("$scope"):
+                stack.append(l.split()[2])
+                scopes.append([".".join(stack), []])
+            elif l.startswith("$upscope"):
+                stack.pop()
+            elif l.startswith("$var"):
+                scopes[-1][1].append(l.split()[4])
+        for path, names in scopes:
+            names.sort()
+        return scopes, lines[lines.index("$enddefinitions $end")+1:]
+
+    def testScopes(self):
+        traceSignals.scopes = ["tree.m2", "tree.m1.*"]
+        clocked(10)
+        scopes, changes = self.vcd()
+        self.assertEqual(scopes, [["tree", []],
+                                  ["tree.m2", ["a", "clk", "q"]],
+                                  ["tree.m1", []],
+                                  ["tree.m1.u", ["clk", "q", "r"]]])
+
+    def testSignals(self):
+        traceSignals.scopes = "tree.m1*"
+        traceSignals.signals = ["q", "r"]
+        clk, q, b = clocked(10)
+        scopes, changes = self.vcd()
+        self.assertEqual(scopes, [["tree", []],
+                                  ["tree.m1", ["q"]],
+                                  ["tree.m1.u", ["q", "r"]]])
+
+    def testUntracedSignals(self):
+        traceSignals.signals = "q"
+        clk = Signal(bool(0))
+        q = Signal(intbv(0)[4:])
+        b = Signal(intbv(0)[4:])
+        dut = traceSignals(tree, clk, q, b)
+        self.assertEqual(clk._tracing, 0)
+        self.assertEqual(q._tracing, 1)
+        self.assertEqual(b._tracing, 1)
+        _simulator._pending().tf.close()
+        _simulator._pending().tracing = 0
+
+    def testDepth(self):
+        traceSignals.depth = 2
+        clocked(10)
+        scopes, changes = self.vcd()
+        self.assertEqual([path for path, names in scopes],
+                         ["tree", "tree.m2", "tree.m1"])
+
+    def testStartStop(self):
+        traceSignals.scopes = "tree"
+        clocked(20, stop=6, start=12)
+        scopes, changes = self.vcd()
+        self.assertEqual(scopes, [["tree", ["b", "clk", "q"]]])
+        off = changes.index("$dumpoff")
+        self.assertEqual(changes[off-1], "#35")
+        self.assertEqual(changes[off+4:off+7], ["$end", "#65", "$dumpon"])
+        on = changes[off+7:off+10]
+        self.assertEqual(sorted(l[-1] for l in on), ['!', '"', '#'])
+        self.assertEqual(changes[off+10], "$end")
+        self.assertEqual(changes.count("$dumpoff"), 1)
+        self.assertTrue("#50" not in changes)
+
+    def testWindow(self):
+        traceSignals.window = (20, 40)
+        clocked(20)
+        scopes, changes = self.vcd()
+        times = [l for l in changes if l.startswith("#")]
+        self.assertEqual(times, ["#20", "#25", "#30", "#35", "#40"])
+        self.assertEqual(changes.index("$dumpoff"),
+                         changes.index("$dumpvars") + 9)
+        self.assertEqual(changes[changes.index("#20")+1], "$dumpon")
+        self.assertEqual(changes[-11:-9], ["#40", "$dumpoff"])
+
+    def testWindowArg(self):
+        traceSignals.window = (40, 20)
+        try:
+            clocked(20)
+        except TraceSignalsError as e:
+            self.assertEqual(e.kind, _error.Window)
+        else:
+            self.fail()
+
+    def testRingOnError(self):
+        """ The last timesteps are written when the simulation fails """
+        traceSignals.ringsize = 6
+        self.assertRaises(AssertionError, recorded, 100, limit=20)
+        values = history("counter.vcd")
+        self.assertEqual([t for t, v in values['clk']],
+                         [175, 180, 185, 190, 195, 200, 205])
+        self.assertEqual(values['q'], [(175, "010010"), (185, "010011"),
+                                       (195, "010100")])
+        self.assertEqual(values['r'], [(175, "0000"), (185, "1111"),
+                                       (195, "0000")])
+
+    def testRingWithoutError(self):
+        traceSignals.ringsize = 6
+        recorded(100)
+        self.assertTrue(not path.exists("counter.vcd"))
+
+    def testRingDump(self):
+        """ A dump of a large enough ring is the complete trace """
+        recorded(100)
+        ref = history("counter.vcd")
+        os.remove("counter.vcd")
+        traceSignals.ringsize = 1000
+        recorded(100, dump=True)
+        self.assertEqual(history("counter.vcd"), ref)
+
+    def testRingStartStop(self):
+        traceSignals.ringsize = 10
+        recorded(100, dump=True, stop=10, start=20)
+        with open("counter.vcd") as f:
+            lines = f.read().split("\n")
+        self.assertEqual(lines.count("$dumpoff"), 0)
+        traceSignals.ringsize = 12
+        recorded(24, dump=True, stop=10, start=20)
+        with open("counter.vcd") as f:
+            lines = f.read().split("\n")
+        off = lines.index("$dumpoff")
+        self.assertEqual(lines[off-1], "#55")
+        self.assertEqual(lines[off+5:off+7], ["#105", "$dumpon"])
+
+    def testRingSize(self):
+        traceSignals.ringsize = 0
+        try:
+            recorded(10)
+        except TraceSignalsError as e:
+            self.assertEqual(e.kind, _error.RingSize)
+        else:
+            self.fail()
 
 
 if __name__ == "__main__":
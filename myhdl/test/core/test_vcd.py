@@ -0,0 +1,205 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2014 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the vcd reader """
+from __future__ import absolute_import
+
+import os
+import unittest
+from unittest import TestCase
+
+from myhdl import delay, Signal, Simulation, instance, always, intbv, \
+     enum, traceSignals, VcdFile
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+QUIET=1
+
+t_State = enum('IDLE', 'RUN')
+
+def sub(clk, q):
+    @always(clk.posedge)
+    def logic():
+        q.next = (q + 3) % 64
+    return logic
+
+def bench(clk, q, s, log):
+    u = sub(clk, q)
+    @instance
+    def stimulus():
+        log.append((0, int(q), 0))
+        for i in range(50):
+            yield delay(5)
+            clk.next = not clk
+            s.next = t_State.RUN if i % 4 == 3 else t_State.IDLE
+            yield delay(0)
+            log.append((5 * (i + 1), int(q), int(clk)))
+    return u, stimulus
+
+# a vcd file in the style of an external simulator
+EXTERNAL = """\
+$date
+	Mon Jan  5 10:00:00 2015
+$end
+$version Icarus Verilog $end
+$timescale
+	1 ps
+$end
+$comment multi word
+  comment $end
+$scope module tb $end
+$var wire 1 ! clk $end
+$var reg 8 " data [7:0] $end
+$scope module dut $end
+$var wire 1 # bus [0] $end
+$var wire 1 $ bus [1] $end
+$var reg 8 " data [7:0] $end
+$var real 64 % level $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+x!
+bx "
+z#
+0$
+r0 %
+$end
+#10
+0! b101 "
+#20
+1!
+b1x "
+r1.5 %
+#25
+1#
+b110 "
+b111 "
+#30
+0!
+1$
+#40
+1!
+0$ b101 "
+"""
+
+
+class TestVcdFile(TestCase):
+
+    def setUp(self):
+        with open("external.vcd", "w") as f:
+            f.write(EXTERNAL)
+        self.vcd = VcdFile("external.vcd")
+
+    def tearDown(self):
+        for p in ("external.vcd", "bench.vcd"):
+            if os.path.exists(p):
+                os.remove(p)
+
+    def testHeader(self):
+        vcd = self.vcd
+        self.assertEqual(vcd.timescale, "1ps")
+        self.assertEqual(vcd.version, "Icarus Verilog")
+        self.assertEqual(sorted(vcd.signals), ["tb.clk", "tb.data",
+                                               "tb.dut.bus[0]",
+                                               "tb.dut.bus[1]",
+                                               "tb.dut.data",
+                                               "tb.dut.level"])
+        self.assertEqual(vcd.signals["tb.data"], dict(type="reg", width=8))
+
+    def testValueAt(self):
+        vcd = self.vcd
+        self.assertEqual(vcd.value_at("tb.clk", 0), "x")
+        self.assertEqual(vcd.value_at("tb.clk", 15), 0)
+        self.assertEqual(vcd.value_at("tb.data", 5), "xxxxxxxx")
+        self.assertEqual(vcd.value_at("tb.data", 10), 5)
+        self.assertEqual(vcd.value_at("tb.data", 20), "0000001x")
+        self.assertEqual(vcd.value_at("tb.data", 25), 7)
+        self.assertEqual(vcd.value_at("tb.dut.bus[0]", 24), "z")
+        self.assertEqual(vcd.value_at("tb.dut.level", 30), 1.5)
+
+    def testNames(self):
+        vcd = self.vcd
+        self.assertEqual(vcd.value_at("dut.data", 10), 5)
+        self.assertEqual(vcd.value_at("level", 10), 0.0)
+        # aliases of the same signal are not ambiguous
+        self.assertEqual(vcd.value_at("data", 10), 5)
+        self.assertRaises(KeyError, vcd.value_at, "ata", 10)
+        self.assertRaises(KeyError, vcd.value_at, "tb.dut.bus", 10)
+
+    def testChangesBetween(self):
+        vcd = self.vcd
+        self.assertEqual(vcd.changes_between("tb.data"),
+                         [(0, "xxxxxxxx"), (10, 5), (20, "0000001x"),
+                          (25, 7), (40, 5)])
+        self.assertEqual(vcd.changes_between("tb.data", 10, 40),
+                         [(10, 5), (20, "0000001x"), (25, 7)])
+        self.assertEqual(vcd.changes_between("tb.clk", 11, 19), [])
+
+    def testEdges(self):
+        vcd = self.vcd
+        self.assertEqual(vcd.edges("tb.clk"), [20, 40])
+        self.assertEqual(vcd.edges("tb.clk", kind='negedge'), [10, 30])
+        self.assertEqual(vcd.edges("tb.clk", 20, 40, kind='both'), [20, 30])
+        self.assertEqual(vcd.edges("bus[1]", kind='both'), [30, 40])
+        self.assertRaises(ValueError, vcd.edges, "tb.data")
+        self.assertRaises(ValueError, vcd.edges, "tb.clk", kind='rising')
+
+    def testFormat(self):
+        with open("external.vcd", "w") as f:
+            f.write(EXTERNAL.replace('b111 "', 'b111 &'))
+        self.assertRaises(ValueError, VcdFile, "external.vcd")
+
+    def testTraceSignals(self):
+        """ The values of a MyHDL trace are those of the simulation """
+        clk = Signal(bool(0))
+        q = Signal(intbv(0)[6:])
+        s = Signal(t_State.IDLE)
+        log = []
+        dut = traceSignals(bench, clk, q, s, log)
+        Simulation(dut).run(quiet=QUIET)
+        vcd = VcdFile("bench.vcd")
+        for t, qv, clkv in log:
+            self.assertEqual(vcd.value_at("bench.u.q", t), qv)
+            self.assertEqual(vcd.value_at("bench.clk", t), clkv)
+        self.assertEqual(vcd.edges("bench.clk"), list(range(5, 250, 10)))
+        self.assertEqual(vcd.value_at("bench.s", 20), "RUN")
+        self.assertEqual(vcd.value_at("bench.s", 25), "IDLE")
+
+    @unittest.skipIf(np is None, "NumPy not available")
+    def testNumPy(self):
+        vcd = self.vcd
+        times, values = vcd.to_numpy("tb.data")
+        self.assertEqual(times.tolist(), [0, 10, 20, 25, 40])
+        self.assertEqual(values.dtype, np.int64)
+        self.assertEqual(values.mask.tolist(),
+                         [True, False, True, False, False])
+        self.assertEqual(values.compressed().tolist(), [5, 7, 5])
+        times, values = vcd.to_numpy("tb.dut.level")
+        self.assertEqual(values.dtype, np.float64)
+        self.assertEqual(values.tolist(), [0.0, 1.5])
+        samples = vcd.sample("tb.data", [5, 10, 15, 30, 100])
+        self.assertEqual(samples.tolist(), [None, 5, 5, 7, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,43 @@ def test_SliceSignal():
     Simulation(bench_SliceSignal()).run()
 
 
+def bench_SliceSignalEvents():
+
+    s = Signal(intbv(0)[8:])
+    bits = [s(i) for i in range(8)]
+    low, high = s(4, 0), s(8, 4)
+    events = dict((id(b), 0) for b in bits + [low, high])
+
+    def watch(b):
+        @instance
+        def logic():
+            while 1:
+                yield b
+                events[id(b)] += 1
+        return logic
+
+    watchers = [watch(b) for b in bits + [low, high]]
+
+    @instance
+    def check():
+        for v in (1, 3, 0x13, 0x93, 0x93, 0x90):
+            s.next = v
+            yield delay(10)
+            assert s[4:] == low
+            assert s[8:4] == high
+            for i in range(8):
+                assert s[i] == bits[i]
+        assert [events[id(b)] for b in bits] == [2, 2, 0, 0, 1, 0, 0, 1]
+        assert events[id(low)] == 3
+        assert events[id(high)] == 2
+
+    return watchers, check
+
+
+def test_SliceSignalEvents():
+    Simulation(bench_SliceSignalEvents()).run()
+
+
 def bench_ConcatSignal():
     
     a = Signal(intbv(0)[5:])
@@ -60,6 +97,28 @@ def test_ConcatSignal():
 
 
 
+def bench_ConcatSignalSigned():
+
+    a = Signal(intbv(0, min=-8, max=8))
+    b = Signal(intbv(0)[4:])
+    s = ConcatSignal(a, b)
+
+    @instance
+    def check():
+        for i in range(-8, 8):
+            for j in range(16):
+                a.next = i
+                b.next = j
+                yield delay(10)
+                assert s == ((i & 0xf) << 4) + j
+
+    return check
+
+
+def test_ConcatSignalSigned():
+    Simulation(bench_ConcatSignalSigned()).run()
+
+
 def bench_TristateSignal():
     s = TristateSignal(intbv(0)[8:])
     a = s.driver()